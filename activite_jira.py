@@ -0,0 +1,354 @@
+import csv
+import json
+import logging
+import os
+from datetime import datetime, time, timedelta
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from fuseau_horaire import PARIS
+
+logger = logging.getLogger(__name__)
+
+# taille des blocs lus dans les exports JSON (caractères)
+TAILLE_BLOC_JSON: int = 1 << 20
+# format des dates des colonnes "Log Work" et "Comment" de l'export CSV
+FORMAT_DATE_CSV = "%d/%b/%y %I:%M %p"
+# champs d'un auteur de l'API REST qui l'identifient
+CHAMPS_AUTEUR = ("accountId", "name", "key", "emailAddress", "displayName")
+
+
+class LecteurJson:
+    """
+    Lecture en flux d'un export JSON de Jira, sans charger le fichier
+
+    Les issues sont produites une à une, qu'il s'agisse d'une page de l'API
+    REST ({"issues": [...], ...}), d'un tableau d'issues ou de pages, ou de
+    plusieurs pages à la suite (une par ligne).
+    """
+
+    def __init__(self, fichier: TextIO, taille_bloc: int = TAILLE_BLOC_JSON):
+        self._fichier = fichier
+        self._taille_bloc = taille_bloc
+        self._decodeur = json.JSONDecoder()
+        self._texte = ""
+        self._position = 0
+        self._fin_fichier = False
+
+    def _lire_bloc(self, taille: int = 0) -> bool:
+        """Ajoute un bloc du fichier au texte en cours, False en fin de fichier"""
+        bloc = self._fichier.read(max(taille, self._taille_bloc))
+        if not bloc:
+            self._fin_fichier = True
+            return False
+        # le texte déjà décodé est abandonné pour borner la mémoire
+        self._texte = self._texte[self._position :] + bloc
+        self._position = 0
+        return True
+
+    def _caractere(self) -> str:
+        """Prochain caractère significatif (espaces sautés), "" en fin de fichier"""
+        while True:
+            while (
+                self._position < len(self._texte)
+                and self._texte[self._position] in " \t\r\n"
+            ):
+                self._position += 1
+            if self._position < len(self._texte):
+                return self._texte[self._position]
+            if not self._lire_bloc():
+                return ""
+
+    def _attendre(self, attendu: str) -> None:
+        caractere = self._caractere()
+        if caractere != attendu:
+            raise ValueError(
+                f"JSON invalide: '{attendu}' attendu, '{caractere}' trouvé"
+            )
+        self._position += 1
+
+    def _valeur(self):
+        """Décode la prochaine valeur JSON complète, en lisant la suite si besoin"""
+        self._caractere()
+        while True:
+            try:
+                valeur, fin = self._decodeur.raw_decode(self._texte, self._position)
+                # un nombre en fin de texte peut continuer dans le bloc suivant
+                if fin < len(self._texte) or self._fin_fichier:
+                    self._position = fin
+                    return valeur
+            except json.JSONDecodeError:
+                if self._fin_fichier:
+                    raise
+            # une valeur plus grande qu'un bloc double la lecture suivante
+            self._lire_bloc(len(self._texte) - self._position)
+
+    def _elements(self) -> Iterator:
+        """Produit les éléments du tableau qui commence à la position courante"""
+        self._attendre("[")
+        while True:
+            caractere = self._caractere()
+            if caractere == "]":
+                self._position += 1
+                return
+            if caractere == ",":
+                self._position += 1
+                continue
+            yield self._valeur()
+
+    def _objet(self) -> Iterator[dict]:
+        """
+        Produit les issues de l'objet qui commence à la position courante :
+        celles de sa clé "issues" au fil de l'eau, ou l'objet lui-même
+        """
+        self._attendre("{")
+        autres = {}
+        page = False
+        while True:
+            caractere = self._caractere()
+            if caractere == "}":
+                self._position += 1
+                break
+            if caractere == ",":
+                self._position += 1
+                continue
+            cle = self._valeur()
+            self._attendre(":")
+            if cle == "issues" and self._caractere() == "[":
+                page = True
+                yield from self._elements()
+            else:
+                autres[cle] = self._valeur()
+        if not page:
+            yield autres
+
+    def issues(self) -> Iterator[dict]:
+        """Produit toutes les issues du fichier"""
+        while True:
+            caractere = self._caractere()
+            if caractere == "":
+                return
+            if caractere == "{":
+                yield from self._objet()
+            elif caractere == "[":
+                for element in self._elements():
+                    if isinstance(element, dict) and "issues" in element:
+                        yield from element["issues"]
+                    else:
+                        yield element
+            else:
+                raise ValueError(f"JSON invalide: '{caractere}' inattendu")
+
+
+def _identites(auteur: Optional[dict]) -> Tuple[str, ...]:
+    """Identifiants, login, email et nom affiché d'un auteur de l'API REST"""
+    auteur = auteur or {}
+    return tuple(auteur[champ] for champ in CHAMPS_AUTEUR if auteur.get(champ))
+
+
+def _auteur_retenu(identites: Tuple[str, ...], auteurs: List[str]) -> bool:
+    """Indique si l'auteur Jira fait partie des auteurs suivis (tous si vide)"""
+    return not auteurs or any(identite in identites for identite in auteurs)
+
+
+def _date_json(texte: str) -> datetime:
+    """Date Jira "2023-03-01T09:00:00.000+0100" en heure de Paris"""
+    return datetime.fromisoformat(texte).astimezone(PARIS)
+
+
+def _evenement(
+    type_evenement: str,
+    debut: datetime,
+    fin: datetime,
+    sujet: str,
+    auteurs: Tuple[str, ...],
+) -> dict:
+    """Événement Jira au format des réunions, avec son type et son auteur"""
+    return {
+        "type": type_evenement,
+        "start_time": debut,
+        "end_time": fin,
+        "subject": sujet,
+        "auteurs": auteurs,
+    }
+
+
+def _worklogs(
+    debut: datetime, fin: datetime, sujet: str, auteurs: Tuple[str, ...]
+) -> Iterator[dict]:
+    """
+    Événements d'un worklog, découpé à minuit : un par jour, le rapport
+    rangeant chaque événement dans une seule journée (fin de journée à
+    23:59:59.999999)
+    """
+    while debut.date() < fin.date():
+        fin_jour = datetime.combine(debut.date(), time.max, tzinfo=debut.tzinfo)
+        yield _evenement("worklog", debut, fin_jour, sujet, auteurs)
+        debut = datetime.combine(
+            debut.date() + timedelta(days=1), time(0), tzinfo=debut.tzinfo
+        )
+        if debut == fin:  # worklog finissant à minuit pile
+            return
+    yield _evenement("worklog", debut, fin, sujet, auteurs)
+
+
+def evenements_issue(
+    issue: dict,
+    auteurs: List[str],
+    duree_commentaire: timedelta,
+    duree_transition: timedelta,
+) -> Iterator[dict]:
+    """Worklogs, commentaires et transitions de statut d'une issue (API REST)"""
+    champs = issue.get("fields") or {}
+    libelle = f"{issue.get('key', '')} {champs.get('summary') or ''}"
+
+    for worklog in (champs.get("worklog") or {}).get("worklogs", []):
+        identites = _identites(worklog.get("author"))
+        if _auteur_retenu(identites, auteurs):
+            debut = _date_json(worklog["started"])
+            fin = debut + timedelta(seconds=worklog.get("timeSpentSeconds", 0))
+            yield from _worklogs(debut, fin, libelle, identites)
+
+    for commentaire in (champs.get("comment") or {}).get("comments", []):
+        identites = _identites(commentaire.get("author"))
+        if _auteur_retenu(identites, auteurs):
+            fin = _date_json(commentaire["created"])
+            yield _evenement(
+                "commentaire", fin - duree_commentaire, fin, libelle, identites
+            )
+
+    for historique in (issue.get("changelog") or {}).get("histories", []):
+        identites = _identites(historique.get("author"))
+        if not _auteur_retenu(identites, auteurs):
+            continue
+        for element in historique.get("items", []):
+            if element.get("field") == "status":
+                fin = _date_json(historique["created"])
+                yield _evenement(
+                    "transition",
+                    fin - duree_transition,
+                    fin,
+                    f"{issue.get('key', '')} {element.get('fromString')}"
+                    f" → {element.get('toString')}",
+                    identites,
+                )
+
+
+def iter_activite_json(
+    chemin: str,
+    auteurs: List[str],
+    duree_commentaire: timedelta,
+    duree_transition: timedelta,
+) -> Iterator[dict]:
+    """Événements d'un export JSON de l'API REST (search avec expand=changelog)"""
+    with open(chemin, encoding="utf-8") as fichier:
+        for issue in LecteurJson(fichier).issues():
+            try:
+                yield from evenements_issue(
+                    issue, auteurs, duree_commentaire, duree_transition
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("%s: issue %s ignorée: %s", chemin, issue.get("key"), e)
+
+
+def iter_activite_csv(
+    chemin: str, auteurs: List[str], duree_commentaire: timedelta
+) -> Iterator[dict]:
+    """
+    Événements des colonnes répétées "Log Work"
+    ("commentaire;début;auteur;secondes") et "Comment" ("date;auteur;texte")
+    d'un export CSV, lu ligne à ligne
+    """
+    with open(chemin, newline="", encoding="utf-8") as fichier:
+        lecteur = csv.reader(fichier)
+        entetes = next(lecteur, [])
+        position = {nom: i for i, nom in reversed(list(enumerate(entetes)))}
+        worklogs = [i for i, nom in enumerate(entetes) if nom == "Log Work"]
+        commentaires = [i for i, nom in enumerate(entetes) if nom == "Comment"]
+        for ligne in lecteur:
+            libelle = " ".join(
+                ligne[position[nom]]
+                for nom in ("Issue key", "Summary")
+                if nom in position and position[nom] < len(ligne)
+            )
+            for i in worklogs:
+                if i >= len(ligne) or not ligne[i]:
+                    continue
+                try:
+                    _, debut, auteur, secondes = ligne[i].rsplit(";", 3)
+                    if auteurs and auteur not in auteurs:
+                        continue
+                    debut = datetime.strptime(debut, FORMAT_DATE_CSV).replace(
+                        tzinfo=PARIS
+                    )
+                    fin = debut + timedelta(seconds=int(secondes))
+                    yield from _worklogs(debut, fin, libelle, (auteur,))
+                except ValueError as e:
+                    logger.warning(
+                        "%s: worklog illisible '%s': %s", chemin, ligne[i], e
+                    )
+            for i in commentaires:
+                if i >= len(ligne) or not ligne[i]:
+                    continue
+                try:
+                    date_commentaire, auteur, _ = ligne[i].split(";", 2)
+                    if auteurs and auteur not in auteurs:
+                        continue
+                    fin = datetime.strptime(date_commentaire, FORMAT_DATE_CSV).replace(
+                        tzinfo=PARIS
+                    )
+                    yield _evenement(
+                        "commentaire", fin - duree_commentaire, fin, libelle, (auteur,)
+                    )
+                except ValueError as e:
+                    logger.warning(
+                        "%s: commentaire illisible '%s': %s", chemin, ligne[i], e
+                    )
+
+
+def lire_activite_jira(
+    chemins: List[str],
+    debut: datetime,
+    fin: datetime,
+    auteurs: List[str],
+    duree_commentaire: timedelta,
+    duree_transition: timedelta,
+) -> List[dict]:
+    """
+    Lit les worklogs, commentaires et transitions de statut des exports Jira
+
+    Les fichiers .json (API REST) et .csv (colonnes "Log Work" et
+    "Comment") sont lus en flux ; seuls les événements de la période sont
+    conservés.
+
+    Args:
+        chemins: Exports Jira à lire
+        debut: Début de la période (timezone-aware)
+        fin: Fin de la période (timezone-aware)
+        auteurs: Identifiants, noms ou emails des auteurs suivis (tous si vide)
+        duree_commentaire: Temps compté avant chaque commentaire
+        duree_transition: Temps compté avant chaque changement de statut
+
+    Returns:
+        List[dict]: événements {"type", "start_time", "end_time", "subject",
+        "auteurs"} en heure de Paris, "auteurs" étant les identités de l'auteur
+    """
+    evenements = []
+    for chemin in chemins:
+        extension = os.path.splitext(chemin)[1].lower()
+        try:
+            if extension in (".json", ".jsonl"):
+                source = iter_activite_json(
+                    chemin, auteurs, duree_commentaire, duree_transition
+                )
+            elif extension == ".csv":
+                source = iter_activite_csv(chemin, auteurs, duree_commentaire)
+            else:
+                raise ValueError("format non supporté, utilisez .json ou .csv")
+            evenements.extend(
+                evenement
+                for evenement in source
+                if debut <= evenement["end_time"] <= fin
+            )
+        except (OSError, ValueError) as e:
+            logger.error("Export Jira %s illisible: %s", chemin, e)
+    return evenements
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Mesure les performances du rapport d'activité sur des données synthétiques"""
+
+import argparse
+import hashlib
+import random
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import constants
+import extract_activity as ea
+import git_stat as git
+from fuseau_horaire import PARIS, utc_naif, utc_vers_paris, utc_vers_paris_serie
+
+# coût simulé du décodage pypff d'un message (itérations de sha256)
+COUT_DECODAGE: int = 200
+
+
+# =========================================================
+class MessageSynthetique:
+    """Message imitant pypff.message, avec un coût de décodage simulé"""
+
+    def __init__(self, identifier: int, sent_time: datetime):
+        self.identifier = identifier
+        self._sent_time = sent_time
+
+    @property
+    def client_submit_time(self) -> datetime:
+        empreinte = str(self.identifier).encode()
+        for _ in range(COUT_DECODAGE):
+            empreinte = hashlib.sha256(empreinte).digest()
+        return self._sent_time
+
+    delivery_time = None
+
+    @property
+    def subject(self) -> str:
+        return f"Sujet {self.identifier}"
+
+    @property
+    def sender_name(self) -> str:
+        return "Moi"
+
+
+class DossierSynthetique:
+    """Dossier imitant pypff.folder"""
+
+    def __init__(self, name: str, messages: list, sub_folders: list):
+        self.name = name
+        self.identifier = hash(name)
+        self._messages = messages
+        self._sub_folders = sub_folders
+
+    @property
+    def number_of_sub_messages(self) -> int:
+        return len(self._messages)
+
+    @property
+    def number_of_sub_folders(self) -> int:
+        return len(self._sub_folders)
+
+    def get_sub_message(self, i: int) -> MessageSynthetique:
+        return self._messages[i]
+
+    def get_sub_folder(self, i: int) -> "DossierSynthetique":
+        return self._sub_folders[i]
+
+
+class FichierSynthetique:
+    """Fichier imitant pypff.file, chemin de la forme 'synthetique:<nb mails>'"""
+
+    def __init__(self, pst_file: str):
+        nb_mails = int(pst_file.split(":")[1])
+        debut = constants.START_DATE.replace(tzinfo=None)
+        pas = (constants.END_DATE.replace(tzinfo=None) - debut) / nb_mails
+        messages = [
+            MessageSynthetique(i, debut + i * pas) for i in range(nb_mails)
+        ]
+        sent = DossierSynthetique("Sent Items", messages, [])
+        self._root = DossierSynthetique(
+            "root", [], [DossierSynthetique("Top of Personal Folders", [], [sent])]
+        )
+
+    def get_root_folder(self) -> DossierSynthetique:
+        return self._root
+
+    def close(self) -> None:
+        pass
+
+
+def ouvrir_synthetique(pst_file: str) -> FichierSynthetique:
+    """Remplace ea.ouvrir_pff pour les processus de travail"""
+    return FichierSynthetique(pst_file)
+
+
+# =========================================================
+def bench_extraction(nb_mails: int, workers_max: int) -> None:
+    """Extraction des mails envoyés en fonction du nombre de processus"""
+    pst_file = f"synthetique:{nb_mails}"
+    print(f"=== EXTRACTION DE {nb_mails} MAILS ===")
+    reference = None
+    for workers in range(1, workers_max + 1):
+        debut = time.perf_counter()
+        if workers == 1:
+            file = ouvrir_synthetique(pst_file)
+            records = list(
+                ea.extract_folder_messages(file.get_root_folder(), constants.SENT_FOLDERS)
+            )
+        else:
+            records, _ = ea.extract_folder_messages_parallel(
+                pst_file, constants.SENT_FOLDERS, workers, ouvrir_synthetique
+            )
+        duree = time.perf_counter() - debut
+        reference = reference or duree
+        print(
+            f"{workers:>2} processus: {duree:7.2f} s"
+            f"  x{reference / duree:4.1f}  ({len(records)} mails)"
+        )
+
+
+# =========================================================
+def generer_evenements(nb_jours: int, par_jour: int = 6) -> tuple:
+    """
+    Génère mails, réunions, issues, commits et événements Jira sur nb_jours
+    à partir de START_DATE, avec les cas limites (mails de nuit, réunions sur
+    la journée entière ou finissant à minuit, worklogs passant minuit,
+    caractères de contrôle)
+    """
+    alea = random.Random(42)
+    debut = constants.START_DATE.replace(tzinfo=None)
+    mails, reunions, issues, commits, jira = [], [], [], [], []
+    for jour in range(nb_jours):
+        base = debut + timedelta(days=jour)
+        for i in range(alea.randint(0, par_jour)):
+            heure = base + timedelta(minutes=alea.randint(0, 24 * 60 - 1))
+            envoi = heure.replace(second=alea.randint(0, 59), tzinfo=PARIS)
+            mails.append(
+                {
+                    "type": "mail",
+                    "subject": f"Mail {jour}-{i}",
+                    "sender": "Moi",
+                    "date Redaction": envoi
+                    - timedelta(minutes=constants.DUREE_REDACTION_MAIL_MINUTES),
+                    "date Envoi": envoi,
+                }
+            )
+            commits.append(
+                git.CommitInfo(
+                    sha1_complet=f"{jour:08x}{i:032x}",
+                    auteur="Moi",
+                    email="moi@exemple.fr",
+                    date_heure=(heure + timedelta(minutes=7)).replace(tzinfo=PARIS),
+                    message=f"fix|{i}\x07 bug",
+                    depot="depot",
+                    fichiers=1,
+                    insertions=(jour * 37 + i * 11) % 400,
+                )
+            )
+        if alea.random() < 0.5:
+            heure = base + timedelta(hours=alea.randint(0, 23))
+            duree = alea.choice([timedelta(0), timedelta(hours=1), None])
+            fin = (base + timedelta(days=1)) if duree is None else heure + duree
+            reunions.append(
+                {
+                    "start_time": heure.replace(tzinfo=PARIS),
+                    "end_time": fin.replace(tzinfo=PARIS),
+                    "subject": f"Réunion {jour}",
+                }
+            )
+        if alea.random() < 0.3:
+            heure = base + timedelta(minutes=alea.randint(0, 24 * 60 - 1))
+            issues.append(
+                {
+                    "Created": heure.strftime("%d/%b/%y %I:%M %p"),
+                    "date Creation": heure.replace(tzinfo=PARIS),
+                    "Issue key": f"PRJ-{jour}",
+                    "Summary": "Résumé",
+                }
+            )
+        for type_evenement in alea.sample(["worklog", "commentaire", "transition"], 2):
+            depart = base + timedelta(minutes=alea.randint(0, 24 * 60 - 1))
+            duree = timedelta(minutes=alea.randint(5, 240))
+            jira.append(
+                {
+                    "type": type_evenement,
+                    "start_time": depart.replace(tzinfo=PARIS),
+                    "end_time": (depart + duree).replace(tzinfo=PARIS),
+                    "subject": f"PRJ-{jour} Résumé",
+                }
+            )
+    return mails, reunions, issues, commits, jira
+
+
+# =========================================================
+def bench_agregation(nb_jours: int) -> None:
+    """Agrégation par jour : moteur python contre moteur pandas (par colonnes)"""
+    evenements = generer_evenements(nb_jours)
+    print(
+        f"=== AGRÉGATION SUR {nb_jours} JOURS "
+        f"({sum(len(source) for source in evenements)} événements) ==="
+    )
+    ea.build_daily_report([], [], [], [], [])  # chargement initial de holidays
+    resultats = {}
+    for nom, moteur in [
+        ("python", ea.build_daily_report),
+        ("pandas", ea.build_daily_report_pandas),
+    ]:
+        random.seed(0)
+        debut = time.perf_counter()
+        resultats[nom] = moteur(*evenements)
+        print(f"{nom:>8}: {time.perf_counter() - debut:7.2f} s")
+    identiques = resultats["python"].equals(resultats["pandas"])
+    print(f"résultats identiques: {identiques}")
+
+
+# =========================================================
+def bench_fuseaux(nb_dates: int) -> None:
+    """
+    Filtrage sur la période et conversion UTC -> Paris des dates d'envoi :
+    ZoneInfo construit à chaque message (ancien code), fuseaux partagés,
+    comparaison en UTC puis conversion en une fois
+    """
+    alea = random.Random(42)
+    debut = utc_naif(constants.START_DATE) - timedelta(days=365)
+    etendue = int((utc_naif(constants.END_DATE) - debut).total_seconds()) + 365 * 86400
+    dates = [debut + timedelta(seconds=alea.randrange(etendue)) for _ in range(nb_dates)]
+    print(f"=== FUSEAUX HORAIRES SUR {nb_dates} DATES ===")
+
+    def inline() -> list:
+        retenues = []
+        for date_envoi in dates:
+            date_envoi = date_envoi.replace(tzinfo=ZoneInfo("UTC")).astimezone(
+                ZoneInfo("Europe/Paris")
+            )
+            if constants.START_DATE <= date_envoi <= constants.END_DATE:
+                retenues.append(date_envoi)
+        return retenues
+
+    def partages() -> list:
+        retenues = []
+        for date_envoi in dates:
+            date_envoi = utc_vers_paris(date_envoi)
+            if constants.START_DATE <= date_envoi <= constants.END_DATE:
+                retenues.append(date_envoi)
+        return retenues
+
+    def en_une_fois() -> list:
+        debut_utc = utc_naif(constants.START_DATE)
+        fin_utc = utc_naif(constants.END_DATE)
+        return utc_vers_paris_serie(
+            [date_envoi for date_envoi in dates if debut_utc <= date_envoi <= fin_utc]
+        )
+
+    reference = None
+    resultats = {}
+    for nom, methode in [
+        ("ZoneInfo par date", inline),
+        ("fuseaux partagés", partages),
+        ("UTC puis en une fois", en_une_fois),
+    ]:
+        debut_mesure = time.perf_counter()
+        resultats[nom] = methode()
+        duree = time.perf_counter() - debut_mesure
+        reference = reference or duree
+        print(f"{nom:>22}: {duree:7.3f} s  x{reference / duree:4.1f}")
+    identiques = all(
+        resultat == resultats["ZoneInfo par date"] for resultat in resultats.values()
+    )
+    print(f"résultats identiques: {identiques}")
+
+
+# -----------------------------
+# EXÉCUTION
+# -----------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "bench", choices=["extraction", "agregation", "fuseaux"], nargs="*", default=[]
+    )
+    parser.add_argument("--mails", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--jours", type=int, default=4 * 365)
+    parser.add_argument("--dates", type=int, default=200000)
+    args = parser.parse_args()
+
+    if not args.bench or "extraction" in args.bench:
+        bench_extraction(args.mails, args.workers)
+    if not args.bench or "agregation" in args.bench:
+        bench_agregation(args.jours)
+    if not args.bench or "fuseaux" in args.bench:
+        bench_fuseaux(args.dates)
@@ -0,0 +1,281 @@
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+from datetime import datetime
+
+from fuseau_horaire import PARIS
+from git_stat import CommitInfo
+
+# à incrémenter à chaque changement des tables : le cache est alors reconstruit
+VERSION_SCHEMA: int = 7
+# nom du cache dans la table schemas, partagée avec les autres caches du fichier
+NOM_SCHEMA: str = "commits"
+
+
+class CacheCommits:
+    """
+    Cache SQLite de l'historique des commits de chaque repository
+
+    Les commits sont indexés par chemin du repository et SHA1 complet. Les
+    derniers sommets de branche vus sont conservés pour ne demander à git que
+    les nouveaux commits (git log <branches> --not <sommets en cache>).
+    Seuls les commits des auteurs suivis sont en cache : le filtre utilisé
+    est conservé avec les sommets, et un autre filtre relit l'historique.
+    La date à partir de laquelle l'historique a été lu (depuis) l'est aussi :
+    le cache sert pour toute date égale ou postérieure, la période étant
+    filtrée à la lecture, et une date antérieure relit l'historique.
+    Les statistiques de chaque repository sont conservées pour le SHA1 de
+    HEAD avec lequel elles ont été calculées.
+    """
+
+    def __init__(self, chemin_cache: str):
+        """
+        Ouvre (ou crée) la base de cache
+
+        Args:
+            chemin_cache (str): Chemin vers le fichier SQLite
+        """
+        self.chemin_cache = chemin_cache
+        # plusieurs dépôts peuvent être synchronisés en parallèle
+        self._connexion = sqlite3.connect(chemin_cache, timeout=60)
+        self._creer_tables()
+
+    def _creer_tables(self) -> None:
+        """
+        Crée les tables du cache, en repartant de zéro si son schéma a changé
+
+        La version est conservée par cache dans la table schemas (et non dans
+        PRAGMA user_version, commun à tout le fichier) : le cache des mails
+        peut partager le fichier. La vérification et la reconstruction se
+        font dans une seule transaction, pour les connexions simultanées.
+        """
+        connexion = self._connexion
+        connexion.execute("BEGIN IMMEDIATE")
+        connexion.execute(
+            "CREATE TABLE IF NOT EXISTS schemas"
+            " (nom TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+        )
+        ligne = connexion.execute(
+            "SELECT version FROM schemas WHERE nom = ?", (NOM_SCHEMA,)
+        ).fetchone()
+        if ligne is None or ligne[0] != VERSION_SCHEMA:
+            for table in ("depots", "commits", "statistiques"):
+                connexion.execute(f"DROP TABLE IF EXISTS {table}")
+            connexion.execute(
+                "INSERT OR REPLACE INTO schemas VALUES (?, ?)",
+                (NOM_SCHEMA, VERSION_SCHEMA),
+            )
+        connexion.execute(
+            """
+            CREATE TABLE IF NOT EXISTS depots (
+                chemin TEXT PRIMARY KEY,
+                tips TEXT NOT NULL,
+                filtre TEXT NOT NULL DEFAULT '',
+                depuis REAL
+            )
+            """
+        )
+        connexion.execute(
+            """
+            CREATE TABLE IF NOT EXISTS commits (
+                chemin TEXT NOT NULL,
+                sha1_complet TEXT NOT NULL,
+                auteur TEXT NOT NULL,
+                email TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                message TEXT NOT NULL,
+                fichiers INTEGER,
+                insertions INTEGER NOT NULL DEFAULT 0,
+                suppressions INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (chemin, sha1_complet)
+            )
+            """
+        )
+        connexion.execute(
+            "CREATE INDEX IF NOT EXISTS commits_date ON commits (chemin, timestamp)"
+        )
+        connexion.execute(
+            """
+            CREATE TABLE IF NOT EXISTS statistiques (
+                chemin TEXT PRIMARY KEY,
+                head TEXT NOT NULL,
+                total_commits INTEGER NOT NULL,
+                nombre_auteurs INTEGER NOT NULL
+            )
+            """
+        )
+        connexion.commit()
+
+    def get_tips(
+        self, chemin_depot: str, filtre: str = "", depuis: Optional[datetime] = None
+    ) -> Optional[List[str]]:
+        """
+        Retourne les derniers sommets de branche enregistrés pour le
+        repository, None si le cache a été rempli avec un autre filtre
+        (auteurs, mailmap) ou ne remonte pas jusqu'à depuis (None : tout
+        l'historique)
+        """
+        ligne = self._connexion.execute(
+            "SELECT tips, filtre, depuis FROM depots WHERE chemin = ?",
+            (chemin_depot,),
+        ).fetchone()
+        if not ligne or ligne[1] != filtre:
+            return None
+        if ligne[2] is not None and (depuis is None or ligne[2] > depuis.timestamp()):
+            return None
+        return ligne[0].split()
+
+    def get_depuis(self, chemin_depot: str) -> Optional[datetime]:
+        """
+        Date à partir de laquelle l'historique du repository est en cache,
+        None pour tout l'historique (ou un repository absent du cache)
+        """
+        ligne = self._connexion.execute(
+            "SELECT depuis FROM depots WHERE chemin = ?", (chemin_depot,)
+        ).fetchone()
+        if not ligne or ligne[0] is None:
+            return None
+        return datetime.fromtimestamp(ligne[0], PARIS)
+
+    def vider(self, chemin_depot: str) -> None:
+        """Supprime les commits en cache du repository (avant un rescan complet)"""
+        self._connexion.execute("DELETE FROM commits WHERE chemin = ?", (chemin_depot,))
+
+    def ajouter(self, chemin_depot: str, commits: Iterable[CommitInfo]) -> int:
+        """
+        Ajoute des commits au cache
+
+        La base reste verrouillée en écriture jusqu'à marquer_a_jour : les
+        commits doivent être déjà lus (liste), pas produits au fil d'un git log.
+
+        Returns:
+            int: Nombre de commits ajoutés
+        """
+        curseur = self._connexion.executemany(
+            "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    chemin_depot,
+                    commit.sha1_complet,
+                    commit.auteur,
+                    commit.email,
+                    commit.timestamp,
+                    commit.message,
+                    commit.fichiers,
+                    commit.insertions,
+                    commit.suppressions,
+                )
+                for commit in commits
+            ),
+        )
+        return curseur.rowcount
+
+    def marquer_a_jour(
+        self,
+        chemin_depot: str,
+        tips: List[str],
+        filtre: str = "",
+        depuis: Optional[datetime] = None,
+    ) -> None:
+        """
+        Enregistre les sommets de branche synchronisés, le filtre et la date
+        depuis laquelle l'historique a été lu, et valide les écritures
+        """
+        self._connexion.execute(
+            "INSERT OR REPLACE INTO depots (chemin, tips, filtre, depuis)"
+            " VALUES (?, ?, ?, ?)",
+            (
+                chemin_depot,
+                " ".join(tips),
+                filtre,
+                depuis.timestamp() if depuis else None,
+            ),
+        )
+        self._connexion.commit()
+
+    def commits(
+        self, chemin_depot: str, debut: datetime, fin: datetime
+    ) -> List[CommitInfo]:
+        """
+        Retourne les commits en cache dont la date auteur est dans la période
+
+        Args:
+            chemin_depot (str): Chemin du repository
+            debut: Début de la période (timezone-aware)
+            fin: Fin de la période (timezone-aware)
+
+        Returns:
+            List[CommitInfo]: Commits du plus ancien au plus récent
+        """
+        depot = os.path.basename(chemin_depot)
+        curseur = self._connexion.execute(
+            "SELECT sha1_complet, auteur, email, timestamp, message,"
+            " fichiers, insertions, suppressions"
+            " FROM commits WHERE chemin = ? AND timestamp BETWEEN ? AND ?"
+            " ORDER BY timestamp",
+            (chemin_depot, debut.timestamp(), fin.timestamp()),
+        )
+        return [
+            CommitInfo(
+                sha1_complet=sha1_complet,
+                auteur=auteur,
+                email=email,
+                date_heure=datetime.fromtimestamp(timestamp, PARIS),
+                message=message,
+                depot=depot,
+                fichiers=fichiers,
+                insertions=insertions,
+                suppressions=suppressions,
+            )
+            for (
+                sha1_complet,
+                auteur,
+                email,
+                timestamp,
+                message,
+                fichiers,
+                insertions,
+                suppressions,
+            ) in curseur
+        ]
+
+    def get_statistiques(
+        self, chemin_depot: str, head: str
+    ) -> Optional[Dict[str, int]]:
+        """
+        Retourne les statistiques en cache du repository, None si elles ont
+        été calculées pour un autre HEAD
+        """
+        ligne = self._connexion.execute(
+            "SELECT total_commits, nombre_auteurs FROM statistiques"
+            " WHERE chemin = ? AND head = ?",
+            (chemin_depot, head),
+        ).fetchone()
+        if not ligne:
+            return None
+        return {"total_commits": ligne[0], "nombre_auteurs": ligne[1]}
+
+    def marquer_statistiques(
+        self, chemin_depot: str, head: str, statistiques: Dict[str, int]
+    ) -> None:
+        """Enregistre les statistiques du repository pour ce HEAD"""
+        self._connexion.execute(
+            "INSERT OR REPLACE INTO statistiques VALUES (?, ?, ?, ?)",
+            (
+                chemin_depot,
+                head,
+                statistiques["total_commits"],
+                statistiques["nombre_auteurs"],
+            ),
+        )
+        self._connexion.commit()
+
+    def close(self) -> None:
+        """Ferme la base de cache"""
+        self._connexion.close()
+
+    def __enter__(self) -> "CacheCommits":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,283 @@
+import os
+import sqlite3
+from typing import Iterator, Set, Tuple
+from datetime import datetime
+
+from fuseau_horaire import PARIS
+
+# à incrémenter à chaque changement des tables : le cache est alors reconstruit
+VERSION_SCHEMA: int = 2
+# nom du cache dans la table schemas, partagée avec les autres caches du fichier
+NOM_SCHEMA: str = "mails"
+# nombre de mails ou réunions ajoutés entre deux validations : la base n'est
+# pas verrouillée pendant toute la synchronisation d'un gros dossier
+TAILLE_LOT_ECRITURE: int = 1000
+
+
+class CacheMails:
+    """
+    Cache SQLite des mails envoyés et des réunions extraits d'un fichier OST/PST
+
+    Les mails et réunions sont indexés par chemin du fichier, identifiant du dossier et
+    identifiant du message. L'identité du fichier (taille, date de
+    modification) permet de ne pas rouvrir un OST inchangé. Les ajouts sont
+    validés par lots de TAILLE_LOT_ECRITURE : une synchronisation interrompue
+    reprend là où elle s'est arrêtée.
+    """
+
+    def __init__(self, chemin_cache: str):
+        """
+        Ouvre (ou crée) la base de cache
+
+        Args:
+            chemin_cache (str): Chemin vers le fichier SQLite
+        """
+        self.chemin_cache = chemin_cache
+        # le fichier peut être partagé avec le cache des commits, écrit en parallèle
+        self._connexion = sqlite3.connect(chemin_cache, timeout=60)
+        self._en_attente = 0
+        self._creer_tables()
+
+    def _creer_tables(self) -> None:
+        """
+        Crée les tables du cache, en repartant de zéro si son schéma a changé
+
+        La version est conservée par cache dans la table schemas (et non dans
+        PRAGMA user_version, commun à tout le fichier) : le cache des commits
+        peut partager le fichier.
+        """
+        connexion = self._connexion
+        connexion.execute("BEGIN IMMEDIATE")
+        connexion.execute(
+            "CREATE TABLE IF NOT EXISTS schemas"
+            " (nom TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+        )
+        ligne = connexion.execute(
+            "SELECT version FROM schemas WHERE nom = ?", (NOM_SCHEMA,)
+        ).fetchone()
+        if ligne is None or ligne[0] != VERSION_SCHEMA:
+            for table in ("fichiers", "mails", "reunions"):
+                connexion.execute(f"DROP TABLE IF EXISTS {table}")
+            connexion.execute(
+                "INSERT OR REPLACE INTO schemas VALUES (?, ?)",
+                (NOM_SCHEMA, VERSION_SCHEMA),
+            )
+        connexion.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fichiers (
+                chemin TEXT PRIMARY KEY,
+                taille INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                calendrier INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        connexion.execute(
+            """
+            CREATE TABLE IF NOT EXISTS mails (
+                chemin TEXT NOT NULL,
+                dossier_id INTEGER NOT NULL,
+                message_id INTEGER NOT NULL,
+                date_envoi REAL NOT NULL,
+                sujet TEXT NOT NULL,
+                expediteur TEXT NOT NULL,
+                PRIMARY KEY (chemin, dossier_id, message_id)
+            )
+            """
+        )
+        connexion.execute(
+            "CREATE INDEX IF NOT EXISTS mails_date ON mails (chemin, date_envoi)"
+        )
+        connexion.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reunions (
+                chemin TEXT NOT NULL,
+                dossier_id INTEGER NOT NULL,
+                message_id INTEGER NOT NULL,
+                debut REAL NOT NULL,
+                fin REAL NOT NULL,
+                sujet TEXT NOT NULL,
+                PRIMARY KEY (chemin, dossier_id, message_id)
+            )
+            """
+        )
+        connexion.execute(
+            "CREATE INDEX IF NOT EXISTS reunions_date ON reunions (chemin, debut)"
+        )
+        connexion.commit()
+
+    @staticmethod
+    def _identite(chemin_ost: str) -> Tuple[int, float]:
+        """Retourne la taille et la date de modification du fichier"""
+        infos = os.stat(chemin_ost)
+        return infos.st_size, infos.st_mtime
+
+    def est_a_jour(self, chemin_ost: str, avec_calendrier: bool = False) -> bool:
+        """
+        Indique si le cache correspond au fichier tel qu'il est sur disque
+
+        Args:
+            chemin_ost (str): Chemin vers le fichier OST/PST
+            avec_calendrier (bool): Les réunions sont aussi demandées
+
+        Returns:
+            bool: True si taille et date de modification sont inchangées et,
+            si avec_calendrier, si le calendrier a été lu à la dernière
+            synchronisation
+        """
+        ligne = self._connexion.execute(
+            "SELECT taille, mtime, calendrier FROM fichiers WHERE chemin = ?",
+            (chemin_ost,),
+        ).fetchone()
+        if ligne is None or tuple(ligne[:2]) != self._identite(chemin_ost):
+            return False
+        return bool(ligne[2]) or not avec_calendrier
+
+    def marquer_a_jour(self, chemin_ost: str, avec_calendrier: bool = False) -> None:
+        """
+        Enregistre l'identité courante du fichier, et si le calendrier a été
+        synchronisé, puis valide les écritures
+        """
+        taille, mtime = self._identite(chemin_ost)
+        self._connexion.execute(
+            "INSERT OR REPLACE INTO fichiers (chemin, taille, mtime, calendrier)"
+            " VALUES (?, ?, ?, ?)",
+            (chemin_ost, taille, mtime, int(avec_calendrier)),
+        )
+        self._connexion.commit()
+        self._en_attente = 0
+
+    def identifiants(
+        self, chemin_ost: str, dossier_id: int, reunions: bool = False
+    ) -> Set[int]:
+        """
+        Retourne les identifiants des messages (ou des réunions si
+        reunions=True) déjà en cache pour un dossier
+        """
+        table = "reunions" if reunions else "mails"
+        curseur = self._connexion.execute(
+            f"SELECT message_id FROM {table} WHERE chemin = ? AND dossier_id = ?",
+            (chemin_ost, dossier_id),
+        )
+        return {ligne[0] for ligne in curseur}
+
+    def ajouter(
+        self,
+        chemin_ost: str,
+        dossier_id: int,
+        message_id: int,
+        date_envoi: datetime,
+        sujet: str,
+        expediteur: str,
+    ) -> None:
+        """Ajoute un mail au cache (date_envoi doit être timezone-aware)"""
+        self._connexion.execute(
+            "INSERT OR REPLACE INTO mails VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                chemin_ost,
+                dossier_id,
+                message_id,
+                date_envoi.timestamp(),
+                sujet,
+                expediteur,
+            ),
+        )
+        self._valider_par_lot()
+
+    def ajouter_reunion(
+        self,
+        chemin_ost: str,
+        dossier_id: int,
+        message_id: int,
+        debut: datetime,
+        fin: datetime,
+        sujet: str,
+    ) -> None:
+        """Ajoute une réunion au cache (debut et fin doivent être timezone-aware)"""
+        self._connexion.execute(
+            "INSERT OR REPLACE INTO reunions VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                chemin_ost,
+                dossier_id,
+                message_id,
+                debut.timestamp(),
+                fin.timestamp(),
+                sujet,
+            ),
+        )
+        self._valider_par_lot()
+
+    def _valider_par_lot(self) -> None:
+        """Valide les écritures tous les TAILLE_LOT_ECRITURE ajouts"""
+        self._en_attente += 1
+        if self._en_attente >= TAILLE_LOT_ECRITURE:
+            self._connexion.commit()
+            self._en_attente = 0
+
+    def supprimer(
+        self,
+        chemin_ost: str,
+        dossier_id: int,
+        message_ids: Set[int],
+        reunions: bool = False,
+    ) -> None:
+        """Retire du cache les messages (ou réunions) qui ne sont plus dans le dossier"""
+        table = "reunions" if reunions else "mails"
+        self._connexion.executemany(
+            f"DELETE FROM {table}"
+            " WHERE chemin = ? AND dossier_id = ? AND message_id = ?",
+            [(chemin_ost, dossier_id, message_id) for message_id in message_ids],
+        )
+
+    def mails(
+        self, chemin_ost: str, debut: datetime, fin: datetime
+    ) -> Iterator[Tuple[datetime, str, str]]:
+        """
+        Retourne les mails en cache envoyés dans la période
+
+        Args:
+            chemin_ost (str): Chemin vers le fichier OST/PST
+            debut: Début de la période (timezone-aware)
+            fin: Fin de la période (timezone-aware)
+
+        Returns:
+            Iterator: tuples (date d'envoi en heure de Paris, sujet, expéditeur)
+        """
+        curseur = self._connexion.execute(
+            "SELECT date_envoi, sujet, expediteur FROM mails"
+            " WHERE chemin = ? AND date_envoi BETWEEN ? AND ? ORDER BY date_envoi",
+            (chemin_ost, debut.timestamp(), fin.timestamp()),
+        )
+        for date_envoi, sujet, expediteur in curseur:
+            yield datetime.fromtimestamp(date_envoi, PARIS), sujet, expediteur
+
+    def reunions(
+        self, chemin_ost: str, debut: datetime, fin: datetime
+    ) -> Iterator[Tuple[datetime, datetime, str]]:
+        """
+        Retourne les réunions en cache qui commencent dans la période
+
+        Returns:
+            Iterator: tuples (début, fin en heure de Paris, sujet)
+        """
+        curseur = self._connexion.execute(
+            "SELECT debut, fin, sujet FROM reunions"
+            " WHERE chemin = ? AND debut BETWEEN ? AND ? ORDER BY debut",
+            (chemin_ost, debut.timestamp(), fin.timestamp()),
+        )
+        for debut_reunion, fin_reunion, sujet in curseur:
+            yield (
+                datetime.fromtimestamp(debut_reunion, PARIS),
+                datetime.fromtimestamp(fin_reunion, PARIS),
+                sujet,
+            )
+
+    def close(self) -> None:
+        """Ferme la base de cache"""
+        self._connexion.close()
+
+    def __enter__(self) -> "CacheMails":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,186 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Iterator, List
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import icalendar
+from dateutil.rrule import rruleset, rrulestr
+
+from fuseau_horaire import PARIS, UTC
+
+logger = logging.getLogger(__name__)
+
+# fréquences dont le départ peut être avancé d'un nombre entier de périodes
+PERIODES_REGLE = {"DAILY": timedelta(days=1), "WEEKLY": timedelta(weeks=1)}
+
+
+def _liste(valeur) -> list:
+    """Une propriété icalendar répétée est une liste, sinon une valeur seule"""
+    if valeur is None:
+        return []
+    return valeur if isinstance(valeur, list) else [valeur]
+
+
+def fuseau(dt: datetime) -> tzinfo:
+    """
+    ZoneInfo équivalent au fuseau d'une date icalendar (pytz), Paris si le
+    fuseau est inconnu (ex: TZID Windows "Romance Standard Time")
+    """
+    nom = getattr(dt.tzinfo, "zone", None) or getattr(dt.tzinfo, "key", None)
+    if nom is None:
+        return dt.tzinfo
+    try:
+        return ZoneInfo(nom)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.debug("Fuseau %s inconnu, heure de Paris utilisée", nom)
+        return PARIS
+
+
+def normaliser(valeur: date) -> datetime:
+    """
+    Convertit une date icalendar en datetime timezone-aware (ZoneInfo)
+
+    Une date seule (journée entière) et une heure flottante (sans fuseau)
+    sont en heure de Paris.
+    """
+    if not isinstance(valeur, datetime):
+        return datetime.combine(valeur, time(0), tzinfo=PARIS)
+    if valeur.tzinfo is None:
+        return valeur.replace(tzinfo=PARIS)
+    # l'heure murale est conservée, seul l'objet fuseau change
+    return valeur.replace(tzinfo=fuseau(valeur))
+
+
+def duree(evenement: icalendar.Event, depart: datetime) -> timedelta:
+    """Durée de chaque occurrence de l'événement"""
+    if "DTEND" in evenement:
+        return normaliser(evenement.decoded("DTEND")) - depart
+    if "DURATION" in evenement:
+        return evenement.decoded("DURATION")
+    if not isinstance(evenement.decoded("DTSTART"), datetime):
+        return timedelta(days=1)
+    return timedelta(0)
+
+
+def _depart_avance(
+    regle: icalendar.vRecur, depart: datetime, debut: datetime
+) -> datetime:
+    """
+    Avance le départ d'une règle simple (DAILY/WEEKLY sans COUNT ni
+    BYSETPOS) d'un nombre entier de périodes, juste avant debut : les
+    occurrences d'une réunion quotidienne depuis des années ne sont pas
+    toutes recalculées.
+    """
+    frequence = regle.get("FREQ", [""])[0]
+    if (
+        frequence not in PERIODES_REGLE
+        or "COUNT" in regle
+        or "BYSETPOS" in regle
+        or depart >= debut
+    ):
+        return depart
+    periode = PERIODES_REGLE[frequence] * int(regle.get("INTERVAL", [1])[0])
+    # une période de marge pour les changements d'heure
+    nb_periodes = max(0, (debut - depart) // periode - 1)
+    return depart + nb_periodes * periode
+
+
+def _texte_regle(regle: icalendar.vRecur) -> str:
+    """RRULE en texte, UNTIL converti en UTC comme l'exige dateutil"""
+    if "UNTIL" in regle:
+        regle = icalendar.vRecur(regle)
+        regle["UNTIL"] = [normaliser(regle["UNTIL"][0]).astimezone(UTC)]
+    return regle.to_ical().decode()
+
+
+def occurrences(
+    evenement: icalendar.Event, debut: datetime, fin: datetime
+) -> Iterator[datetime]:
+    """
+    Produit le début de chaque occurrence de l'événement dans [debut, fin]
+
+    Les RRULE sont développées à la demande à partir de debut (dateutil
+    xafter) et l'itération s'arrête à fin. EXDATE et RDATE sont appliquées.
+    """
+    depart = normaliser(evenement.decoded("DTSTART"))
+    regles = _liste(evenement.get("RRULE"))
+    if not regles and "RDATE" not in evenement:
+        if debut <= depart <= fin:
+            yield depart
+        return
+
+    ensemble = rruleset()
+    ensemble.rdate(depart)
+    for regle in regles:
+        ensemble.rrule(
+            rrulestr(_texte_regle(regle), dtstart=_depart_avance(regle, depart, debut))
+        )
+    for propriete in _liste(evenement.get("RDATE")):
+        for valeur in propriete.dts:
+            if isinstance(valeur.dt, date):  # les périodes sont ignorées
+                ensemble.rdate(normaliser(valeur.dt))
+    for propriete in _liste(evenement.get("EXDATE")):
+        for valeur in propriete.dts:
+            ensemble.exdate(normaliser(valeur.dt))
+
+    for occurrence in ensemble.xafter(debut, inc=True):
+        if occurrence > fin:
+            break
+        yield occurrence
+
+
+def lire_ics(chemin: str, debut: datetime, fin: datetime) -> List[dict]:
+    """
+    Lit un calendrier ICS et développe les réunions récurrentes dans la période
+
+    Une occurrence modifiée (RECURRENCE-ID) remplace l'occurrence d'origine,
+    les événements et occurrences annulés (STATUS:CANCELLED, EXDATE) sont
+    ignorés.
+
+    Args:
+        chemin (str): Chemin vers le fichier .ics
+        debut: Début de la période (timezone-aware)
+        fin: Fin de la période (timezone-aware)
+
+    Returns:
+        List[dict]: réunions {"start_time", "end_time", "subject"} en heure de
+        Paris, triées par début
+    """
+    with open(chemin, "rb") as fichier:
+        calendrier = icalendar.Calendar.from_ical(fichier.read())
+    evenements = calendrier.walk("VEVENT")
+
+    # occurrences remplacées ou annulées individuellement, par UID
+    modifiees: dict[str, set[datetime]] = defaultdict(set)
+    for evenement in evenements:
+        if "RECURRENCE-ID" in evenement:
+            modifiees[str(evenement.get("UID"))].add(
+                normaliser(evenement.decoded("RECURRENCE-ID"))
+            )
+
+    reunions = []
+    for evenement in evenements:
+        try:
+            if str(evenement.get("STATUS", "")).upper() == "CANCELLED":
+                continue
+            exceptions = set()
+            if "RECURRENCE-ID" not in evenement:
+                exceptions = modifiees.get(str(evenement.get("UID")), set())
+            depart = normaliser(evenement.decoded("DTSTART"))
+            duree_reunion = duree(evenement, depart)
+            sujet = str(evenement.get("SUMMARY", ""))
+            for occurrence in occurrences(evenement, debut, fin):
+                if occurrence in exceptions:
+                    continue
+                reunions.append(
+                    {
+                        "start_time": occurrence.astimezone(PARIS),
+                        "end_time": (occurrence + duree_reunion).astimezone(PARIS),
+                        "subject": sujet,
+                    }
+                )
+        except Exception as e:
+            logger.warning("Événement %s ignoré: %s", evenement.get("UID"), e)
+    reunions.sort(key=lambda reunion: reunion["start_time"])
+    return reunions
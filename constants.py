@@ -1,10 +1,13 @@
 
 from datetime import datetime, time
-from zoneinfo import ZoneInfo
+from typing import Optional
+
+from fuseau_horaire import PARIS
 
 # === LISTE DE DÉTECTION DES DOSSIERS outlook ===
 # (Outlook en français ou anglais)
 SENT_FOLDERS = ["Sent Items", "Éléments envoyés", "Envoyés"]
+CALENDAR_FOLDERS = ["Calendar", "Calendrier"]
 
 
 # -----------------------------
@@ -16,9 +19,22 @@ OST_FILE: str = (
 CSV_FILE: str = (
     "/media/dlerat/Expansion/SSI-portable/Outlook/calendrier2.CSV"  # CSV exporté des réunions Outlook
 )
+# Calendrier ICS exporté : les réunions récurrentes y sont développées sur la
+# période. S'il est renseigné, il remplace le calendrier de l'OST et CSV_FILE
+ICS_FILE: Optional[str] = None
+# Réunions lues dans les dossiers Calendrier de l'OST (sinon dans CSV_FILE).
+# Les séries récurrentes n'y sont pas développées : seule la première
+# occurrence est lue, et une série commencée avant START_DATE est ignorée
+CALENDRIER_OST: bool = False
 JIRA_CSV_FILE: str = (
     "/media/dlerat/Expansion/SSI-portable/Outlook/jira.csv"  # export jira des issues dont je suis le créateur
 )
+# Exports Jira des worklogs, commentaires et transitions : JSON de l'API REST
+# (search avec fields=summary,worklog,comment et expand=changelog) ou CSV avec
+# les colonnes "Log Work" et "Comment"
+JIRA_ACTIVITE_FILES: list[str] = []
+# Auteurs Jira suivis (accountId, login, email ou nom affiché), tous si vide
+JIRA_AUTEURS: list[str] = []
 
 REPO_PATHS: list[str] = [
     "/home/dlerat/git/debian-security-analyzer",
@@ -27,11 +43,30 @@ REPO_PATHS: list[str] = [
     "/home/dlerat/git/RubiThreatModel",
     "/home/dlerat/git/RubiThreatModel",
 ]
+GIT_MAX_WORKERS: int = 8  # Nombre de dépôts git interrogés simultanément
+# Branches analysées : ["HEAD"], ["--all"] ou motifs ["--branches=feature/*", "main"]
+GIT_BRANCHES: list[str] = ["HEAD"]
+# Noms ou emails des auteurs dont les commits sont retenus (tous si vide),
+# comparés sans casse aux identités après le mailmap (nom ou email entier) :
+# git ne renvoie que ceux-là
+GIT_AUTEURS: list[str] = []
+# Fichier mailmap regroupant les identités d'un même auteur (None : .mailmap des dépôts)
+GIT_MAILMAP: Optional[str] = None
+# Taille des diffs (git log --shortstat, ou git diff-tree après une lecture
+# directe des objets) pour estimer la durée de chaque commit : demande git même
+# avec le backend "objets" ; sinon DUREE_COMMIT_MINUTES pour tous
+GIT_DIFFSTAT: bool = True
+# Lecture de l'historique : "objets" lit directement la base d'objets (repli sur la
+# commande git), "git" lance toujours git
+GIT_BACKEND: str = "objets"
 OUTPUT_FILE: str = "rapport_activite.xlsx"  # Chemin vers fichier Excel de sortie
+CACHE_FILE: Optional[str] = (
+    "cache_activite.sqlite"  # Cache des mails et commits extraits (None pour désactiver)
+)
 
 # === PÉRIODE D'ANALYSE ===
-START_DATE: datetime = datetime(2022, 1, 1, tzinfo=ZoneInfo("Europe/Paris"))
-END_DATE: datetime = datetime(2025, 12, 31, tzinfo=ZoneInfo("Europe/Paris"))
+START_DATE: datetime = datetime(2022, 1, 1, tzinfo=PARIS)
+END_DATE: datetime = datetime(2025, 12, 31, tzinfo=PARIS)
 
 #
 HEURE_DEBUT_JOURNEE: time = time(9, 0)
@@ -42,9 +77,29 @@ TPS_PAUSE2_MINUTE: int = 120
 
 DUREE_REDACTION_MAIL_MINUTES: int = 15
 DUREE_CREATION_ISSUE_MINUTES: int = 30
-DUREE_COMMIT_MINUTES: int = 120
+DUREE_COMMIT_MINUTES: int = 120  # durée d'un commit, maximum si GIT_DIFFSTAT
+# avec GIT_DIFFSTAT : DUREE_COMMIT_MIN_MINUTES + MINUTES_PAR_LIGNE_COMMIT par
+# ligne modifiée, sans remonter avant le commit précédent du même auteur ni
+# descendre sous DUREE_COMMIT_MIN_MINUTES
+DUREE_COMMIT_MIN_MINUTES: int = 10
+MINUTES_PAR_LIGNE_COMMIT: float = 0.5
+DUREE_COMMENTAIRE_JIRA_MINUTES: int = 10
+DUREE_TRANSITION_JIRA_MINUTES: int = 5
 
 SEUIL_MAIL = time(6, 00)
 SEUIL_MEETING = time(7, 45)
 SEUIL_ISSUE = time(6, 00)
 SEUIL_COMMIT = time(6, 00)
+SEUIL_JIRA = time(6, 00)
+
+# Arrête la lecture d'un dossier outlook dès que END_DATE est dépassée,
+# tant que ses messages ont été rencontrés dans l'ordre chronologique.
+# Seuls les messages déjà lus sont vérifiés : un message plus ancien rangé
+# après l'arrêt est perdu. À n'activer que si les dossiers sont triés par date
+ARRET_DOSSIER_TRIE: bool = False
+
+# Nombre de messages par tâche lors de l'extraction en parallèle (--workers)
+TAILLE_PLAGE_MESSAGES: int = 2000
+
+# Nombre de lignes lues à la fois dans les exports CSV volumineux (Jira)
+TAILLE_BLOC_CSV: int = 50000
@@ -0,0 +1,119 @@
+import importlib.util
+import os
+from typing import Dict
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment
+from openpyxl.utils import get_column_letter
+
+# colonnes à plusieurs lignes, affichées avec retour à la ligne
+COLONNES_MULTILIGNES = ["Résumé"]
+LARGEUR_MAX_COLONNE: int = 80
+FORMATS_SORTIE = (".xlsx", ".csv", ".parquet")
+# moteurs essayés par DataFrame.to_parquet (engine="auto")
+MOTEURS_PARQUET = ("pyarrow", "fastparquet")
+
+
+def verifier_sortie(chemin: str) -> None:
+    """
+    Vérifie que le rapport pourra être écrit dans chemin (extension supportée,
+    moteur parquet installé), avant de lire les sources
+
+    Raises:
+        ValueError: Format non supporté ou aucun moteur parquet installé
+    """
+    extension = os.path.splitext(chemin)[1].lower()
+    if extension not in FORMATS_SORTIE:
+        raise ValueError(
+            f"Format de sortie non supporté: {chemin}. Utilisez .xlsx, .csv ou .parquet"
+        )
+    if extension == ".parquet" and not any(
+        importlib.util.find_spec(moteur) for moteur in MOTEURS_PARQUET
+    ):
+        raise ValueError(
+            f"{chemin}: l'écriture .parquet nécessite pyarrow (pip install pyarrow)"
+        )
+
+
+def largeur_colonne(colonne: pd.Series, titre: str) -> int:
+    """Largeur d'une colonne Excel : la plus longue ligne de ses valeurs"""
+    lignes = colonne.astype(str).str.split("\n").explode()
+    longueur = max(len(titre), int(lignes.str.len().max()) if len(lignes) else 0)
+    return min(longueur + 2, LARGEUR_MAX_COLONNE)
+
+
+def ecrire_excel(feuilles: Dict[str, pd.DataFrame], chemin: str) -> None:
+    """
+    Écrit des DataFrame dans un classeur Excel en mode écriture seule (streaming)
+
+    Les largeurs de colonne et le style des colonnes multilignes sont calculés
+    une fois par colonne, les lignes sont ensuite écrites au fil de l'eau.
+    openpyxl utilise lxml s'il est installé, ce qui accélère nettement l'écriture.
+
+    Args:
+        feuilles: DataFrame à écrire, par nom de feuille
+        chemin: Chemin du fichier .xlsx
+    """
+    classeur = Workbook(write_only=True)
+    for nom, df in feuilles.items():
+        feuille = classeur.create_sheet(title=nom)
+        colonnes_a_la_ligne = []
+        for position, titre in enumerate(df.columns):
+            lettre = get_column_letter(position + 1)
+            feuille.column_dimensions[lettre].width = largeur_colonne(df[titre], titre)
+            if titre in COLONNES_MULTILIGNES:
+                colonnes_a_la_ligne.append(position)
+
+        alignement = Alignment(wrap_text=True, vertical="top")
+        feuille.append(list(df.columns))
+        for ligne in df.itertuples(index=False, name=None):
+            # les cellules vides ne sont pas écrites
+            valeurs = [None if valeur == "" else valeur for valeur in ligne]
+            for position in colonnes_a_la_ligne:
+                cellule = WriteOnlyCell(feuille, valeurs[position])
+                cellule.alignment = alignement
+                valeurs[position] = cellule
+            feuille.append(valeurs)
+    classeur.save(chemin)
+
+
+def ecrire_rapport(
+    df: pd.DataFrame, chemin: str, autres: Dict[str, pd.DataFrame]
+) -> None:
+    """
+    Écrit le rapport au format déduit de l'extension du fichier
+
+    - .xlsx : une feuille "Activité" puis une feuille par entrée de autres
+    - .csv : un fichier par feuille (<nom>_<feuille>.csv pour autres)
+    - .parquet : idem, nécessite pyarrow ou fastparquet (voir verifier_sortie)
+
+    Args:
+        df: Rapport d'activité
+        chemin: Chemin du fichier de sortie
+        autres: Feuilles supplémentaires (ex: statistiques), par nom
+    """
+    racine, extension = os.path.splitext(chemin)
+    extension = extension.lower()
+    if extension == ".xlsx":
+        ecrire_excel({"Activité": df, **autres}, chemin)
+        return
+
+    fichiers = {chemin: df}
+    for nom, feuille in autres.items():
+        fichiers[f"{racine}_{nom}{extension}"] = feuille
+
+    for fichier, feuille in fichiers.items():
+        if extension == ".csv":
+            feuille.to_csv(fichier, index=False, encoding="utf-8-sig")
+        elif extension == ".parquet":
+            # une colonne parquet n'a qu'un type : les colonnes mixtes sont écrites en texte
+            mixtes = feuille.select_dtypes(include="object").columns
+            feuille.astype({colonne: str for colonne in mixtes}).to_parquet(
+                fichier, index=False
+            )
+        else:
+            raise ValueError(
+                f"Format de sortie non supporté: {chemin}. Utilisez .xlsx, .csv ou .parquet"
+            )
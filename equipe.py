@@ -0,0 +1,115 @@
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# colonne de l'export CSV Jira qui identifie le créateur d'une issue
+COLONNE_CREATEUR_JIRA = "Creator Id"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Utilisateur:
+    """Membre de l'équipe et ses identités dans chaque source"""
+
+    nom: str
+    emails: Tuple[str, ...] = ()  # noms d'expéditeur des mails (sender_name)
+    git: Tuple[str, ...] = ()  # noms ou emails d'auteur des commits
+    jira: Tuple[str, ...] = ()  # Creator Id, accountId, login ou nom Jira
+    calendrier: Optional[str] = None  # calendrier ICS personnel
+    proprietaire: bool = False  # titulaire de l'OST et du calendrier partagé
+
+
+def lire_equipe(chemin: str) -> List[Utilisateur]:
+    """
+    Lit la liste des utilisateurs d'un fichier JSON :
+
+    [{"nom": "dlerat", "emails": ["Damien Lerat"], "git": ["dlerat@exemple.fr"],
+      "jira": ["dlerat"], "calendrier": "dlerat.ics", "proprietaire": true}, ...]
+
+    Seul "nom" est obligatoire. Malgré leur nom, les "emails" sont les noms
+    d'expéditeur des mails tels que l'OST les enregistre (sender_name) : les
+    messages envoyés n'y ont pas d'adresse, une adresse n'y reconnaît donc
+    aucun mail. Ces noms servent aussi d'identités git (nom d'auteur après
+    mailmap) et Jira (nom affiché).
+    Les réunions du calendrier partagé (OST, export CSV, ICS_FILE) sont celles
+    de son titulaire : elles ne sont attribuées qu'aux utilisateurs marqués
+    "proprietaire".
+    """
+    with open(chemin, encoding="utf-8") as fichier:
+        entrees = json.load(fichier)
+    utilisateurs = []
+    for entree in entrees:
+        if not entree.get("nom"):
+            raise ValueError(f"{chemin}: utilisateur sans nom {entree}")
+        emails = tuple(entree.get("emails", []))
+        for adresse in (email for email in emails if "@" in email):
+            logger.warning(
+                '%s: "%s" ne reconnaît aucun mail ("emails" contient des noms'
+                ' d\'expéditeur) ; une adresse git va dans "git"',
+                entree["nom"],
+                adresse,
+            )
+        utilisateurs.append(
+            Utilisateur(
+                nom=entree["nom"],
+                emails=emails,
+                git=tuple(entree.get("git", [])) + emails,
+                jira=tuple(entree.get("jira", [])) + emails,
+                calendrier=entree.get("calendrier"),
+                proprietaire=bool(entree.get("proprietaire", False)),
+            )
+        )
+    return utilisateurs
+
+
+def normaliser_identite(identite: str) -> str:
+    """Identité comparée sans tenir compte de la casse ni des espaces autour"""
+    return identite.strip().casefold()
+
+
+class IndexActivite:
+    """
+    Index des enregistrements des sources partagées par identité d'auteur
+
+    Les sources sont lues une seule fois pour toute l'équipe : la sélection
+    des enregistrements d'un utilisateur est une recherche dans l'index,
+    dans l'ordre d'origine des enregistrements.
+    """
+
+    def __init__(self):
+        self._enregistrements: Dict[str, list] = {}
+        self._index: Dict[str, Dict[str, List[int]]] = {}
+
+    def indexer(
+        self,
+        source: str,
+        enregistrements: list,
+        identites: Callable[[object], Iterable[str]],
+    ) -> None:
+        """
+        Indexe une source
+
+        Args:
+            source: Nom de la source (ex: "commits")
+            enregistrements: Enregistrements de toute l'équipe
+            identites: Identités de l'auteur d'un enregistrement
+        """
+        index: Dict[str, List[int]] = defaultdict(list)
+        for position, enregistrement in enumerate(enregistrements):
+            for identite in identites(enregistrement):
+                if identite:
+                    index[normaliser_identite(identite)].append(position)
+        self._enregistrements[source] = enregistrements
+        self._index[source] = dict(index)
+
+    def selection(self, source: str, identites: Iterable[str]) -> list:
+        """Enregistrements de la source dont l'auteur a l'une des identités"""
+        index = self._index[source]
+        positions = set()
+        for identite in identites:
+            positions.update(index.get(normaliser_identite(identite), ()))
+        enregistrements = self._enregistrements[source]
+        return [enregistrements[position] for position in sorted(positions)]
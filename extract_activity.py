@@ -2,245 +2,1274 @@
 # -*- coding: utf-8 -*-
 """Créer l'excel de mon activité quotidienne"""
 
+import argparse
+import cProfile
 import locale
+import logging
+import multiprocessing
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import chain
 import csv
 import os
 import re
 from datetime import datetime, time, date, timedelta
-from zoneinfo import ZoneInfo
+from typing import Callable, Iterable, Iterator, Optional
 import random
 import holidays
 
 
 import pypff
+import numpy as np
 import pandas as pd
+from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
 import git_stat as git
 import constants
+from cache_ost import CacheMails
+from activite_jira import lire_activite_jira
+from cache_git import CacheCommits
+from calendrier_ics import lire_ics
+from ecriture_rapport import ecrire_rapport, verifier_sortie
+from equipe import COLONNE_CREATEUR_JIRA, IndexActivite, Utilisateur, lire_equipe
+from fuseau_horaire import UTC, paris, utc_naif, utc_vers_paris_serie
+from profilage import Profileur, mesurer_source
 
 # locale.setlocale(locale.LC_TIME, "fr_FR.UTF-8")  # si a paris
 # paris_tz = pytz.timezone('Europe/Paris')
-os.environ["TZ"] = "Europe/Paris"
+logger = logging.getLogger(__name__)
+FORMAT_JOURNAL = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+# les processus de travail sont démarrés par "spawn" : les pools sont créés
+# pendant que des threads lisent d'autres sources (git, CSV), et un fork
+# copierait les verrous de ces threads dans un état incohérent
+CONTEXTE_PROCESSUS = multiprocessing.get_context("spawn")
 
 
 # =========================================================
-def extract_folder_messages(
-    folder: pypff.folder, target_names: list[str] = None
-) -> list[pypff.message]:
-    """Récupère récursivement les messages selon le nom du dossier"""
-    messages: list[pypff.message] = []
+def _initialiser_travail(
+    niveau: int, initialiser: Optional[Callable], arguments: tuple
+) -> None:
+    """
+    Initialise un processus de travail : journalisation au niveau du
+    processus principal (non héritée avec spawn), puis initialiser(*arguments)
+    """
+    logging.basicConfig(level=niveau, format=FORMAT_JOURNAL)
+    if initialiser is not None:
+        initialiser(*arguments)
+
+
+# =========================================================
+def pool_processus(
+    max_workers: int, initialiser: Optional[Callable] = None, *arguments
+) -> ProcessPoolExecutor:
+    """
+    Pool de processus de travail (CONTEXTE_PROCESSUS), chacun initialisé par
+    initialiser(*arguments)
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=CONTEXTE_PROCESSUS,
+        initializer=_initialiser_travail,
+        initargs=(logging.getLogger().getEffectiveLevel(), initialiser, arguments),
+    )
+
+
+# =========================================================
+def progression(
+    iterable: Iterable,
+    description: str,
+    unite: str,
+    afficher: bool = True,
+    total: Optional[int] = None,
+) -> tqdm:
+    """
+    Barre de progression tqdm, masquée en mode silencieux (niveau de log
+    supérieur à INFO) ou si la sortie n'est pas un terminal
+    """
+    return tqdm(
+        iterable,
+        desc=description,
+        unit=unite,
+        total=total,
+        leave=False,
+        disable=True if not (afficher and logger.isEnabledFor(logging.INFO)) else None,
+    )
+
+
+# =========================================================
+def correspond(folder: pypff.folder, target_names: list[str]) -> bool:
+    """Indique si le nom du dossier contient l'un des noms ciblés"""
     name = (folder.name or "").lower()
+    return any(tn.lower() in name for tn in target_names)
+
 
+# =========================================================
+def iter_folders(
+    folder: pypff.folder, target_names: list[str] = None, chemin: tuple[int, ...] = ()
+) -> Iterator[tuple[tuple[int, ...], pypff.folder]]:
+    """
+    Parcourt récursivement l'arborescence et produit les dossiers ciblés,
+    avec leur chemin (indices des sous-dossiers depuis la racine)
+    """
     # Si un filtre de dossier est appliqué (ex: Sent Items ou Calendar)
-    if target_names and not any(tn.lower() in name for tn in target_names):
-        # Explorer quand même les sous-dossiers (certains PST ont "Top of Personal Folders" etc.)
-        for i in range(folder.number_of_sub_folders):
-            sub = folder.get_sub_folder(i)
-            messages.extend(extract_folder_messages(sub, target_names))
-        return messages
-
-    # Extraction des messages
-    for i in range(folder.number_of_sub_messages):
+    # on explore quand même les sous-dossiers (certains PST ont "Top of Personal Folders" etc.)
+    if not target_names or correspond(folder, target_names):
+        yield chemin, folder
+
+    # Exploration récursive
+    for i in range(folder.number_of_sub_folders):
+        yield from iter_folders(folder.get_sub_folder(i), target_names, chemin + (i,))
+
+
+# =========================================================
+def get_folder(root: pypff.folder, chemin: tuple[int, ...]) -> pypff.folder:
+    """Retrouve un dossier à partir de son chemin depuis la racine"""
+    folder = root
+    for i in chemin:
+        folder = folder.get_sub_folder(i)
+    return folder
+
+
+# =========================================================
+def extract_messages(
+    folder: pypff.folder,
+    debut: int = 0,
+    fin: Optional[int] = None,
+    afficher: bool = True,
+) -> Iterator[tuple[datetime, str, str]]:
+    """
+    Produit un tuple (date d'envoi, sujet, expéditeur) par message du dossier
+    (ou de la plage d'indices [debut, fin[) envoyé dans la période.
+
+    La date d'envoi reste en UTC naïf, comme pypff la fournit : la période est
+    comparée en UTC et la conversion en heure de Paris est faite en une fois à
+    la fin de l'extraction (utc_vers_paris_serie).
+    Les objets pypff.message ne sont pas conservés. Avec ARRET_DOSSIER_TRIE, si
+    les messages lus sont triés par date d'envoi, la lecture s'arrête dès que
+    END_DATE est dépassée.
+    afficher=False masque la barre de progression (processus de travail).
+    """
+    if fin is None:
+        fin = folder.number_of_sub_messages
+    precedent: Optional[datetime] = None
+    dossier_trie: bool = True
+    debut_utc = utc_naif(constants.START_DATE)
+    fin_utc = utc_naif(constants.END_DATE)
+    with progression(range(debut, fin), folder.name, "mail", afficher) as messages:
+        for i in messages:
+            try:
+                msg = folder.get_sub_message(i)
+                sent_time = msg.client_submit_time or msg.delivery_time
+                if not sent_time:
+                    continue
+
+                if precedent is not None and sent_time < precedent:
+                    dossier_trie = False
+                precedent = sent_time
+
+                if sent_time > fin_utc:
+                    if dossier_trie and constants.ARRET_DOSSIER_TRIE:
+                        break
+                    continue
+                if sent_time >= debut_utc:
+                    subject = msg.subject or ""
+                    sender = msg.sender_name or ""
+                    yield sent_time, subject, sender
+                    logger.debug(
+                        "Mail: sender: %s sent %s subject: %s",
+                        sender,
+                        sent_time,
+                        subject,
+                    )
+
+            except Exception as e:
+                logger.warning("exception message %s", e)
+                continue
+
+
+# =========================================================
+def extract_folder_messages(
+    folder: pypff.folder, target_names: list[str] = None
+) -> Iterator[tuple[datetime, str, str]]:
+    """
+    Parcourt récursivement les dossiers et produit, en une seule passe,
+    un tuple (date d'envoi UTC, sujet, expéditeur) par message de la période.
+    """
+    for _, dossier in iter_folders(folder, target_names):
+        yield from extract_messages(dossier)
+
+
+# identifiants des propriétés MAPI des rendez-vous (PidTagStartDate, PidTagEndDate)
+PR_START_DATE: int = 0x0060
+PR_END_DATE: int = 0x0061
+
+
+# =========================================================
+def dates_rendez_vous(
+    msg: pypff.message,
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Dates de début et de fin (UTC naïf) d'un élément du calendrier"""
+    debut = fin = None
+    for record_set in msg.record_sets:
+        for entry in record_set.entries:
+            if entry.entry_type == PR_START_DATE:
+                debut = entry.data_as_datetime
+            elif entry.entry_type == PR_END_DATE:
+                fin = entry.data_as_datetime
+    return debut, fin
+
+
+# =========================================================
+def extract_appointments(
+    folder: pypff.folder, afficher: bool = True
+) -> Iterator[tuple[datetime, datetime, str]]:
+    """
+    Produit un tuple (début, fin, sujet) par rendez-vous du dossier qui
+    commence dans la période, dates en UTC naïf comme pour extract_messages.
+
+    Une série récurrente est un seul élément : seule sa première occurrence
+    est produite, et une série commencée avant la période est ignorée
+    (pypff ne donne pas accès au motif de récurrence). D'où CALENDRIER_OST
+    désactivé par défaut : ICS_FILE développe les récurrences.
+    """
+    debut_utc = utc_naif(constants.START_DATE)
+    fin_utc = utc_naif(constants.END_DATE)
+    elements = progression(
+        range(folder.number_of_sub_messages), folder.name, "rdv", afficher
+    )
+    for i in elements:
         try:
             msg = folder.get_sub_message(i)
-            sent_time = msg.client_submit_time or msg.delivery_time
-            sent_time = sent_time.replace(tzinfo=ZoneInfo("UTC")).astimezone(
-                ZoneInfo("Europe/Paris")
-            )
-            if sent_time and constants.START_DATE <= sent_time <= constants.END_DATE:
-                messages.append(msg)
-                print(
-                    f"Mail: sender: {msg.sender_name} sent {sent_time} subject: {msg.subject}"
-                )
-
+            debut, fin = dates_rendez_vous(msg)
+            if debut is None or fin is None:
+                continue
+            if debut_utc <= debut <= fin_utc:
+                yield debut, fin, msg.subject or ""
         except Exception as e:
-            print(f"exception message {e}")
+            logger.warning("exception rendez-vous %s", e)
             continue
 
-    # Exploration récursive
-    for i in range(folder.number_of_sub_folders):
-        sub = folder.get_sub_folder(i)
-        messages.extend(extract_folder_messages(sub, target_names))
 
-    return messages
+# =========================================================
+def extract_ost(
+    folder: pypff.folder, sent_names: list[str], calendar_names: list[str]
+) -> tuple[list[tuple[datetime, str, str]], list[tuple[datetime, datetime, str]]]:
+    """
+    Parcourt une seule fois l'arborescence et extrait les mails envoyés et
+    les rendez-vous des dossiers calendrier.
+
+    Returns:
+        tuple: (mails, rendez-vous), dates en UTC naïf
+    """
+    mails, rendez_vous = [], []
+    for _, dossier in iter_folders(folder, sent_names + calendar_names):
+        if correspond(dossier, calendar_names):
+            rendez_vous.extend(extract_appointments(dossier))
+        else:
+            mails.extend(extract_messages(dossier))
+    return mails, rendez_vous
 
 
 # =========================================================
-def process_sent_items(pst_file: str) -> list[dict]:
-    """Extrait les mails envoyés"""
+def ouvrir_pff(pst_file: str) -> pypff.file:
+    """Ouvre un fichier OST/PST"""
     file: pypff.file = pypff.file()  # pylint: disable=no-member
     file.open(pst_file)
+    return file
 
-    root: pypff.folder = file.get_root_folder()
-    print("[*] Recherche des mails envoyés...")
-    sent_msgs = extract_folder_messages(root, target_names=constants.SENT_FOLDERS)
-    print(f"[+] {len(sent_msgs)} mails envoyés trouvés.")
-    file.close()
 
-    data: list[dict] = []
-    for msg in sent_msgs:
+# fichier OST/PST ouvert une seule fois par processus de travail, pour toutes
+# ses plages, et identifiants des messages déjà en cache par dossier
+_fichier_processus: Optional[pypff.file] = None
+_connus_processus: dict[int, frozenset[int]] = {}
+
+
+# =========================================================
+def _initialiser_processus(
+    pst_file: str,
+    ouvrir: Callable[[str], pypff.file],
+    connus: Optional[dict[int, frozenset[int]]] = None,
+) -> None:
+    """
+    Ouvre le fichier dans un processus de travail ; il reste ouvert jusqu'à
+    la fin du processus
+    """
+    global _fichier_processus, _connus_processus
+    _fichier_processus = ouvrir(pst_file)
+    _connus_processus = connus or {}
+
+
+# =========================================================
+def _plages(nb_messages: int) -> Iterator[tuple[int, int]]:
+    """Découpe les messages d'un dossier en plages de TAILLE_PLAGE_MESSAGES"""
+    for debut in range(0, nb_messages, constants.TAILLE_PLAGE_MESSAGES):
+        yield debut, min(debut + constants.TAILLE_PLAGE_MESSAGES, nb_messages)
+
+
+# =========================================================
+def _extraire_plage(
+    chemin: tuple[int, ...], debut: int, fin: int
+) -> list[tuple[datetime, str, str]]:
+    """Extrait une plage de messages d'un dossier dans un processus de travail"""
+    folder = get_folder(_fichier_processus.get_root_folder(), chemin)
+    return list(extract_messages(folder, debut, fin, afficher=False))
+
+
+# =========================================================
+def _decoder_plage(
+    chemin: tuple[int, ...], dossier_id: int, debut: int, fin: int
+) -> tuple[int, list[int], list[tuple[int, datetime, str, str]]]:
+    """
+    Décode, dans un processus de travail, les messages d'une plage qui ne
+    sont pas encore en cache
+
+    Returns:
+        tuple: (identifiant du dossier, identifiants des messages vus,
+                nouveaux messages (identifiant, date d'envoi UTC naïve, sujet,
+                expéditeur))
+    """
+    folder = get_folder(_fichier_processus.get_root_folder(), chemin)
+    connus = _connus_processus.get(dossier_id, frozenset())
+    vus, nouveaux = [], []
+    for i in range(debut, fin):
         try:
-            # les heures des mails sont en utc il faut les convertirs en heure de paris
-            sent_time: datetime = msg.client_submit_time or msg.delivery_time
-            sent_time = sent_time.replace(tzinfo=ZoneInfo("UTC")).astimezone(
-                ZoneInfo("Europe/Paris")
-            )
-            data.append(
-                {
-                    "type": "mail",
-                    "subject": msg.subject or "",
-                    "sender": msg.sender_name or "",
-                    "date Redaction": sent_time
-                    - timedelta(minutes=constants.DUREE_REDACTION_MAIL_MINUTES),
-                    "date Envoi": sent_time,
-                }
-            )
+            msg = folder.get_sub_message(i)
+            message_id = msg.identifier
+            vus.append(message_id)
+            if message_id in connus:
+                continue
+            sent_time = msg.client_submit_time or msg.delivery_time
+            if sent_time:
+                nouveaux.append(
+                    (message_id, sent_time, msg.subject or "", msg.sender_name or "")
+                )
         except Exception as e:
-            print(f"exception sent items {e}")
-            continue
-    return data
+            logger.warning("exception message %s", e)
+    return dossier_id, vus, nouveaux
 
 
 # =========================================================
-def parse_meetings(csv_file: str) -> list[dict]:
-    """Lit le fichier CSV exporté d Outlook."""
-    tmp_meetings = []
-    with open(csv_file, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                subject = row["Subject"]
-                start_date = datetime.strptime(row["Start Date"], "%m/%d/%Y").date()
-                end_date = datetime.strptime(row["End Date"], "%m/%d/%Y").date()
-                start_time = datetime.strptime(row["Start Time"], "%I:%M:%S %p").time()
-                end_time = datetime.strptime(row["End Time"], "%I:%M:%S %p").time()
-                start_dt = datetime.combine(start_date, start_time).replace(
-                    tzinfo=ZoneInfo("Europe/Paris")
+def extract_folder_messages_parallel(
+    pst_file: str,
+    target_names: list[str],
+    workers: int,
+    ouvrir: Callable[[str], pypff.file] = ouvrir_pff,
+    calendar_names: list[str] = None,
+) -> tuple[list[tuple[datetime, str, str]], list[tuple[datetime, datetime, str]]]:
+    """
+    Extrait les messages des dossiers ciblés avec plusieurs processus.
+
+    L'arborescence est d'abord listée, puis les messages de chaque dossier
+    sont découpés en plages de TAILLE_PLAGE_MESSAGES réparties entre les
+    processus ; chacun ouvre le fichier une seule fois. Les résultats sont fusionnés
+    par date d'envoi. Les rendez-vous des dossiers calendrier, peu nombreux,
+    sont lus pendant le listage.
+
+    Returns:
+        tuple: (mails, rendez-vous), dates en UTC naïf
+    """
+    file = ouvrir(pst_file)
+    try:
+        plages = []
+        rendez_vous = []
+        calendar_names = calendar_names or []
+        dossiers = iter_folders(file.get_root_folder(), target_names + calendar_names)
+        for chemin, dossier in dossiers:
+            if calendar_names and correspond(dossier, calendar_names):
+                rendez_vous.extend(extract_appointments(dossier))
+                continue
+            for debut, fin in _plages(dossier.number_of_sub_messages):
+                plages.append((chemin, debut, fin))
+    finally:
+        file.close()
+
+    with pool_processus(workers, _initialiser_processus, pst_file, ouvrir) as executor:
+        futures = [
+            executor.submit(_extraire_plage, chemin, debut, fin)
+            for chemin, debut, fin in plages
+        ]
+        resultats = [
+            future.result()
+            for future in progression(
+                as_completed(futures), "Sent Items", "plage", total=len(futures)
+            )
+        ]
+
+    mails = sorted(chain.from_iterable(resultats), key=lambda record: record[0])
+    return mails, rendez_vous
+
+
+# =========================================================
+def _synchroniser_mails_parallele(
+    pst_file: str,
+    cache: CacheMails,
+    dossiers: list[tuple[tuple[int, ...], int, int, set[int]]],
+    workers: int,
+    ouvrir: Callable[[str], pypff.file] = ouvrir_pff,
+) -> int:
+    """
+    Décode sur plusieurs processus les messages absents du cache des dossiers
+    (chemin, identifiant, nombre de messages, identifiants en cache) et met
+    le cache à jour dans le processus principal
+
+    Returns:
+        int: Nombre de messages décodés
+    """
+    connus = {dossier_id: frozenset(ids) for _, dossier_id, _, ids in dossiers}
+    vus: dict[int, set[int]] = defaultdict(set)
+    nb_decodes = 0
+    with pool_processus(
+        workers, _initialiser_processus, pst_file, ouvrir, connus
+    ) as executor:
+        futures = [
+            executor.submit(_decoder_plage, chemin, dossier_id, debut, fin)
+            for chemin, dossier_id, nb_messages, _ in dossiers
+            for debut, fin in _plages(nb_messages)
+        ]
+        for future in progression(
+            as_completed(futures), "Sent Items", "plage", total=len(futures)
+        ):
+            dossier_id, vus_plage, nouveaux = future.result()
+            vus[dossier_id].update(vus_plage)
+            for message_id, sent_time, subject, sender in nouveaux:
+                cache.ajouter(
+                    pst_file,
+                    dossier_id,
+                    message_id,
+                    sent_time.replace(tzinfo=UTC),
+                    subject,
+                    sender,
                 )
-                end_dt = datetime.combine(end_date, end_time).replace(
-                    tzinfo=ZoneInfo("Europe/Paris")
+            nb_decodes += len(nouveaux)
+    for _, dossier_id, _, ids in dossiers:
+        cache.supprimer(pst_file, dossier_id, ids - vus[dossier_id])
+    return nb_decodes
+
+
+# =========================================================
+def synchroniser_cache_mails(
+    folder: pypff.folder,
+    target_names: list[str],
+    pst_file: str,
+    cache: CacheMails,
+    calendar_names: list[str] = None,
+    workers: int = 1,
+    ouvrir: Callable[[str], pypff.file] = ouvrir_pff,
+) -> int:
+    """
+    Ajoute au cache les messages des dossiers ciblés (et les rendez-vous des
+    dossiers calendrier) qui n'y sont pas encore, quelle que soit leur date,
+    et retire ceux qui ont disparu du fichier.
+
+    workers > 1 répartit le décodage des mails sur plusieurs processus (voir
+    extract_folder_messages_parallel) ; les rendez-vous, peu nombreux, sont
+    lus dans le processus principal.
+
+    Returns:
+        int: Nombre de messages décodés
+    """
+    nb_decodes = 0
+    calendar_names = calendar_names or []
+    dossiers_paralleles = []
+    for chemin, dossier in iter_folders(folder, target_names + calendar_names):
+        dossier_id = dossier.identifier
+        calendrier = bool(calendar_names) and correspond(dossier, calendar_names)
+        connus = cache.identifiants(pst_file, dossier_id, reunions=calendrier)
+        if workers > 1 and not calendrier:
+            dossiers_paralleles.append(
+                (chemin, dossier_id, dossier.number_of_sub_messages, connus)
+            )
+            continue
+        vus: set[int] = set()
+        messages = progression(
+            range(dossier.number_of_sub_messages),
+            dossier.name,
+            "rdv" if calendrier else "mail",
+        )
+        for i in messages:
+            try:
+                msg = dossier.get_sub_message(i)
+                message_id = msg.identifier
+                vus.add(message_id)
+                if message_id in connus:
+                    continue
+                if calendrier:
+                    debut, fin = dates_rendez_vous(msg)
+                    if debut is None or fin is None:
+                        continue
+                    cache.ajouter_reunion(
+                        pst_file,
+                        dossier_id,
+                        message_id,
+                        debut.replace(tzinfo=UTC),
+                        fin.replace(tzinfo=UTC),
+                        msg.subject or "",
+                    )
+                    nb_decodes += 1
+                    continue
+                sent_time = msg.client_submit_time or msg.delivery_time
+                if not sent_time:
+                    continue
+                cache.ajouter(
+                    pst_file,
+                    dossier_id,
+                    message_id,
+                    sent_time.replace(tzinfo=UTC),
+                    msg.subject or "",
+                    msg.sender_name or "",
                 )
-                tmp_meetings.append(
-                    {"start_time": start_dt, "end_time": end_dt, "subject": subject}
+                nb_decodes += 1
+            except Exception as e:
+                logger.warning("exception message %s", e)
+                continue
+        cache.supprimer(pst_file, dossier_id, connus - vus, reunions=calendrier)
+    if dossiers_paralleles:
+        nb_decodes += _synchroniser_mails_parallele(
+            pst_file, cache, dossiers_paralleles, workers, ouvrir
+        )
+    return nb_decodes
+
+
+# =========================================================
+def process_ost(
+    pst_file: str,
+    cache_file: Optional[str] = None,
+    workers: int = 1,
+    avec_calendrier: bool = True,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Extrait les mails envoyés et, si avec_calendrier, les réunions du fichier OST
+    en un seul parcours
+
+    Si cache_file est fourni, les mails sont lus depuis le cache SQLite :
+    seuls les messages absents du cache sont décodés, et l'OST n'est pas
+    rouvert s'il n'a pas changé depuis la dernière exécution.
+    workers > 1 répartit l'extraction (ou, avec le cache, le décodage des
+    messages absents) sur plusieurs processus.
+
+    Returns:
+        tuple: (mails, réunions {"start_time", "end_time", "subject"})
+    """
+    calendar_names = constants.CALENDAR_FOLDERS if avec_calendrier else []
+    if cache_file:
+        with CacheMails(cache_file) as cache:
+            if cache.est_a_jour(pst_file, avec_calendrier):
+                logger.info("Cache des mails envoyés à jour")
+            else:
+                file = ouvrir_pff(pst_file)
+                try:
+                    logger.info(
+                        "Mise à jour du cache des mails envoyés (%d processus)...",
+                        workers,
+                    )
+                    nb_decodes = synchroniser_cache_mails(
+                        file.get_root_folder(),
+                        constants.SENT_FOLDERS,
+                        pst_file,
+                        cache,
+                        calendar_names,
+                        workers,
+                    )
+                finally:
+                    file.close()
+                cache.marquer_a_jour(pst_file, avec_calendrier)
+                logger.info("%d nouveaux éléments ajoutés au cache.", nb_decodes)
+            records = list(
+                cache.mails(pst_file, constants.START_DATE, constants.END_DATE)
+            )
+            rendez_vous = []
+            if avec_calendrier:
+                rendez_vous = list(
+                    cache.reunions(pst_file, constants.START_DATE, constants.END_DATE)
                 )
+    elif workers > 1:
+        logger.info("Recherche des mails envoyés (%d processus)...", workers)
+        records, rendez_vous = extract_folder_messages_parallel(
+            pst_file, constants.SENT_FOLDERS, workers, calendar_names=calendar_names
+        )
+    else:
+        file = ouvrir_pff(pst_file)
+        try:
+            logger.info("Recherche des mails envoyés...")
+            records, rendez_vous = extract_ost(
+                file.get_root_folder(), constants.SENT_FOLDERS, calendar_names
+            )
+        finally:
+            file.close()
+
+    if not cache_file:
+        # une seule conversion UTC -> Paris par colonne de dates extraites
+        dates_envoi = utc_vers_paris_serie([record[0] for record in records])
+        records = [
+            (date_envoi, subject, sender)
+            for date_envoi, (_, subject, sender) in zip(dates_envoi, records)
+        ]
+        debuts = utc_vers_paris_serie([record[0] for record in rendez_vous])
+        fins = utc_vers_paris_serie([record[1] for record in rendez_vous])
+        rendez_vous = [
+            (debut, fin, subject)
+            for debut, fin, (_, _, subject) in zip(debuts, fins, rendez_vous)
+        ]
 
-            except Exception as e:
-                print(f"Erreur parsing ligne: {e}")
-    return tmp_meetings
+    data: list[dict] = []
+    for sent_time, subject, sender in records:
+        data.append(
+            {
+                "type": "mail",
+                "subject": subject,
+                "sender": sender,
+                "date Redaction": sent_time
+                - timedelta(minutes=constants.DUREE_REDACTION_MAIL_MINUTES),
+                "date Envoi": sent_time,
+            }
+        )
+    meetings = [
+        {"start_time": debut, "end_time": fin, "subject": subject}
+        for debut, fin, subject in rendez_vous
+    ]
+    logger.debug("%d mails envoyés et %d réunions trouvés.", len(data), len(meetings))
+    return data, meetings
+
+
+# colonnes lues dans l'export CSV du calendrier Outlook
+COLONNES_CALENDRIER = ["Subject", "Start Date", "Start Time", "End Date", "End Time"]
+
+
+# heure "h:mm:ss AM/PM" des exports Outlook
+_HEURE_CSV = re.compile(r"(\d{1,2}):(\d{2}):(\d{2})\s*([AP]M)")
+
+
+# =========================================================
+def _heures_csv(heures: pd.Series) -> pd.Series:
+    """
+    Convertit des heures "h:mm:ss AM/PM" en durées depuis minuit (NaT si
+    illisible), sans dépendre de la locale comme strptime("%p").
+    Chaque valeur distincte n'est analysée qu'une fois.
+    """
+    secondes: dict[str, float] = {}
+    for texte in heures.unique():
+        correspondance = _HEURE_CSV.fullmatch(texte.strip().upper())
+        secondes[texte] = np.nan
+        if correspondance:
+            heure, minute, seconde = map(int, correspondance.groups()[:3])
+            if 1 <= heure <= 12 and minute < 60 and seconde < 60:
+                heure = heure % 12 + (12 if correspondance[4] == "PM" else 0)
+                secondes[texte] = heure * 3600 + minute * 60 + seconde
+    return pd.to_timedelta(heures.map(secondes), unit="s")
+
+
+# =========================================================
+def parse_meetings(csv_file: str) -> tuple[list[dict], pd.DataFrame]:
+    """
+    Lit le fichier CSV exporté d Outlook.
+
+    Seules les colonnes utiles sont lues, en texte, et les dates sont
+    converties en une fois pour tout le fichier.
+
+    Returns:
+        tuple: (réunions {"start_time", "end_time", "subject"},
+                lignes rejetées avec leur motif)
+    """
+    try:
+        calendrier = pd.read_csv(
+            csv_file,
+            usecols=COLONNES_CALENDRIER,
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8-sig",
+        )
+    except ValueError as e:  # colonne absente
+        logger.error("Calendrier %s illisible: %s", csv_file, e)
+        return [], pd.DataFrame(columns=["Ligne", *COLONNES_CALENDRIER, "Motif"])
+
+    debuts = pd.to_datetime(
+        calendrier["Start Date"], format="%m/%d/%Y", errors="coerce"
+    ) + _heures_csv(calendrier["Start Time"])
+    fins = pd.to_datetime(
+        calendrier["End Date"], format="%m/%d/%Y", errors="coerce"
+    ) + _heures_csv(calendrier["End Time"])
+
+    rejete = debuts.isna() | fins.isna()
+    rejets = calendrier[rejete].copy()
+    # numéro de ligne dans le fichier (l'en-tête est la ligne 1)
+    rejets.insert(0, "Ligne", rejets.index + 2)
+    rejets["Motif"] = np.where(
+        debuts[rejete].isna(), "début illisible", "fin illisible"
+    )
+    if len(rejets):
+        logger.warning(
+            "%d lignes du calendrier rejetées (voir la feuille Rejets réunions)",
+            len(rejets),
+        )
+
+    garde = ~rejete
+    meetings = [
+        {"start_time": paris(debut), "end_time": paris(fin), "subject": sujet}
+        for debut, fin, sujet in zip(
+            pd.DatetimeIndex(debuts[garde]).to_pydatetime(),
+            pd.DatetimeIndex(fins[garde]).to_pydatetime(),
+            calendrier.loc[garde, "Subject"],
+        )
+    ]
+    return meetings, rejets.reset_index(drop=True)
+
+
+# colonnes de l'export Jira utilisées par le rapport
+COLONNES_JIRA = ["Issue key", "Summary", "Created"]
+
+
+# =========================================================
+def iter_issues_jira(
+    chemin_fichier: str,
+    colonnes: list[str] = COLONNES_JIRA,
+    taille_bloc: int = constants.TAILLE_BLOC_CSV,
+) -> Iterator[dict]:
+    """
+    Lit un export CSV Jira par blocs de taille_bloc lignes et produit les
+    issues créées dans la période.
+
+    Seules les colonnes demandées (en plus de COLONNES_JIRA, toujours
+    lues) sont chargées ; une colonne répétée dans
+    l'export (ex: Labels) est la concaténation de ses valeurs non vides,
+    séparées par des virgules. "Created" est converti par bloc en
+    "date Creation" (heure de Paris).
+    """
+    with open(chemin_fichier, newline="", encoding="utf-8") as fichier:
+        entetes = next(csv.reader(fichier), [])
+    colonnes = list(dict.fromkeys(COLONNES_JIRA + colonnes))
+    positions: dict[str, list[int]] = {colonne: [] for colonne in colonnes}
+    for position, entete in enumerate(entetes):
+        if entete in positions:
+            positions[entete].append(position)
+    absentes = [colonne for colonne, indices in positions.items() if not indices]
+    if absentes:
+        logger.warning("%s: colonnes absentes %s", chemin_fichier, absentes)
+
+    debut_periode = constants.START_DATE.replace(tzinfo=None)
+    fin_periode = constants.END_DATE.replace(tzinfo=None)
+    blocs = pd.read_csv(
+        chemin_fichier,
+        header=None,
+        skiprows=1,
+        usecols=sorted(chain.from_iterable(positions.values())),
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8",
+        chunksize=taille_bloc,
+    )
+    for bloc in blocs:
+        issues = pd.DataFrame(index=bloc.index)
+        for colonne, indices in positions.items():
+            if not indices:
+                issues[colonne] = ""
+                continue
+            valeurs = bloc[indices[0]]
+            for position in indices[1:]:
+                valeurs = valeurs.str.cat(bloc[position], sep=",")
+            if len(indices) > 1:
+                valeurs = valeurs.str.replace(r",{2,}", ",", regex=True).str.strip(",")
+            issues[colonne] = valeurs
+
+        creations = pd.to_datetime(
+            issues["Created"], format="%d/%b/%y %I:%M %p", errors="coerce"
+        )
+        illisibles = issues[creations.isna()]
+        for cle, creation in zip(illisibles["Issue key"], illisibles["Created"]):
+            logger.warning("%s: date de création illisible '%s'", cle, creation)
+        garde = (creations >= debut_periode) & (creations <= fin_periode)
+        dates_creation = pd.DatetimeIndex(creations[garde]).to_pydatetime()
+        lignes = zip(*(issues.loc[garde, colonne] for colonne in colonnes))
+        for valeurs, date_creation in zip(lignes, dates_creation):
+            issue = dict(zip(colonnes, valeurs))
+            issue["date Creation"] = paris(date_creation)
+            yield issue
 
 
 # =========================================================
-def lire_fichier_csv_jira(chemin_fichier: str) -> list[dict]:
+def lire_fichier_csv_jira(
+    chemin_fichier: str, colonnes: list[str] = COLONNES_JIRA
+) -> list[dict]:
     """
-    Lit un fichier CSV et retourne une liste de dictionnaires.
+    Lit un export CSV Jira et retourne les issues créées dans la période.
 
     Args:
         chemin_fichier (str): Le chemin vers le fichier CSV
+        colonnes: Colonnes de l'export à conserver
 
     Returns:
-        list: Liste de dictionnaires contenant les données du CSV
+        list: Issues {colonne: valeur, "date Creation": datetime}
     """
     try:
-        with open(chemin_fichier, "r", encoding="utf-8") as fichier:
-            lecteur = csv.DictReader(fichier, delimiter=",")
-
-            # Liste pour stocker tous les enregistrements
-            donnees = []
-
-            for ligne in lecteur:
-                # Créer un dictionnaire avec toutes les colonnes
-                enregistrement = {
-                    "Issue key": ligne.get("Issue key", ""),
-                    "Issue id": ligne.get("Issue id", ""),
-                    "Summary": ligne.get("Summary", ""),
-                    "Creator": ligne.get("Creator", ""),
-                    "Creator Id": ligne.get("Creator Id", ""),
-                    "Reporter": ligne.get("Reporter", ""),
-                    "Reporter Id": ligne.get("Reporter Id", ""),
-                    "Created": ligne.get("Created", ""),
-                    "Assignee": ligne.get("Reporter", ""),
-                    "Assignee Id": ligne.get("Reporter Id", ""),
-                    "Status": ligne.get("Status", ""),
-                    "Original estimate": ligne.get("Original estimate", ""),
-                    "Priority": ligne.get("Priority", ""),
-                    "Custom field (Business Priority)": ligne.get(
-                        "Custom field (Business Priority)", ""
-                    ),
-                    "Custom field (Postpone comment)": ligne.get(
-                        "Custom field (Postpone comment)", ""
-                    ),
-                    "Updated": ligne.get("Updated", ""),
-                    "Custom field (last closed date)": ligne.get(
-                        "Custom field (last closed date)", ""
-                    ),
-                    "Time Spent": ligne.get("Time Spent", ""),
-                    "Labels": ligne.get(
-                        "Labels", ""
-                    ),  # Note: il y a plusieurs colonnes Labels
-                    "Custom field (Safety Priority)": ligne.get(
-                        "Custom field (Safety Priority)", ""
-                    ),
-                    "Team Id": ligne.get(
-                        "Team Id", ""
-                    ),  # Note: il y a plusieurs colonnes Labels
-                    "Team Name": ligne.get(
-                        "Team Name", ""
-                    ),  # Note: il y a plusieurs colonnes Labels
-                    "Custom field (Product version)": ligne.get(
-                        "Custom field (Product version)", ""
-                    ),
-                    "Custom field (To be fixed in product version)": ligne.get(
-                        "Custom field (To be fixed in product version)", ""
-                    ),
-                }
-                donnees.append(enregistrement)
-            return donnees
+        return list(iter_issues_jira(chemin_fichier, colonnes))
+    except pd.errors.EmptyDataError:  # en-tête seul
+        return []
     except FileNotFoundError:
-        print(f"Erreur: Le fichier '{chemin_fichier}' n'a pas été trouvé.")
+        logger.error("Le fichier '%s' n'a pas été trouvé.", chemin_fichier)
         return []
     except Exception as e:
-        print(f"Erreur lors de la lecture du fichier: {e}")
+        logger.error("Erreur lors de la lecture du fichier: %s", e)
         return []
 
 
 # =========================================================
-def get_git_stats(repo_path: str) -> list[git.CommitInfo]:
-    """Récupère les statistiques Git"""
-    git_stats = git.GitCommitAnalyzer(repo_path)
-    stats = git_stats.get_statistiques()
-    commits = git_stats.get_commits_par_date(constants.START_DATE, constants.END_DATE)
-    return commits
+def synchroniser_cache_commits(
+    git_stats: git.GitCommitAnalyzer,
+    chemin_depot: str,
+    cache: CacheCommits,
+    branches: git.Branches = "HEAD",
+    auteur: Optional[str] = None,
+    depuis: Optional[datetime] = None,
+) -> int:
+    """
+    Ajoute au cache les commits arrivés depuis les derniers sommets de branche
+    vus. Si l'un d'eux n'est plus accessible (force-push, rebase, branche
+    supprimée) ou si le filtre auteur, le contenu des mailmaps ou diffstat a
+    changé, tout l'historique est relu. Avec depuis, seuls les commits de
+    cette date ou plus récents sont lus et conservés : le parcours s'arrête
+    avant l'historique ancien. Le cache lu depuis une date antérieure ou égale
+    reste valable (les nouveaux commits sont lus depuis cette même date, la
+    période est filtrée par CacheCommits.commits) ; une date antérieure à
+    celle du cache relit l'historique. Les commits sont lus avant d'écrire
+    dans le cache : le verrou d'écriture de SQLite n'est pas gardé pendant que
+    git tourne.
+
+    Returns:
+        int: Nombre de commits lus
+    """
+
+    def filtre() -> str:
+        return "\n".join(
+            [
+                auteur or "",
+                git_stats.empreinte_mailmap(),
+                "diffstat" if git_stats.diffstat else "",
+            ]
+        ).strip()
+
+    tips = git_stats.get_tips(branches)
+    tips_cache = cache.get_tips(chemin_depot, filtre(), depuis)
+    if tips_cache is not None:
+        depuis = cache.get_depuis(chemin_depot)
+    if tips_cache == tips:
+        return 0
+    if tips_cache and not git_stats.sont_accessibles(tips_cache, branches):
+        logger.warning("%s: historique réécrit, relecture complète", chemin_depot)
+        tips_cache = None
+    commits = list(git_stats.iter_commits_depuis(tips_cache, branches, auteur, depuis))
+    if not tips_cache:
+        cache.vider(chemin_depot)
+    cache.ajouter(chemin_depot, commits)
+    # diffstat est désactivé si git n'a pas pu mesurer les diffs
+    cache.marquer_a_jour(chemin_depot, tips, filtre(), depuis)
+    return len(commits)
+
+
+# =========================================================
+def get_git_stats(
+    repo_path: str,
+    cache_file: Optional[str] = constants.CACHE_FILE,
+    branches: git.Branches = constants.GIT_BRANCHES,
+    auteurs: list[str] = constants.GIT_AUTEURS,
+) -> list[git.CommitInfo]:
+    """
+    Récupère les commits de la période sur les branches demandées
+
+    Seuls les commits des auteurs demandés (tous si vide) sortent de git :
+    leurs identités forment une seule expression --author par dépôt.
+    Avec cache_file, seuls les commits postérieurs aux derniers sommets de
+    branche vus, et pas plus anciens que START_DATE, sont demandés à git ; la
+    période est ensuite une requête sur le cache.
+    """
+    git_stats = git.GitCommitAnalyzer(
+        repo_path, constants.GIT_MAILMAP, constants.GIT_DIFFSTAT, constants.GIT_BACKEND
+    )
+    auteur = git.regex_auteurs(auteurs)
+    if not cache_file:
+        return git_stats.get_commits_par_date(
+            constants.START_DATE, constants.END_DATE, auteur, branche=branches
+        )
+
+    chemin_depot = os.path.realpath(repo_path)
+    with CacheCommits(cache_file) as cache:
+        synchroniser_cache_commits(
+            git_stats, chemin_depot, cache, branches, auteur, constants.START_DATE
+        )
+        return cache.commits(chemin_depot, constants.START_DATE, constants.END_DATE)
 
 
 # =========================================================
-def get_all_commits(repo_paths: list[str]) -> list[dict]:
-    """Récupère tous les commits de tous les dépôts"""
-    all_commits = []
+def dedupliquer_depots(repo_paths: list[str]) -> list[str]:
+    """Supprime les dépôts en double (même répertoire .git une fois résolu)"""
+    depots: dict[str, str] = {}
     for repo_path in repo_paths:
-        commits = get_git_stats(repo_path)
-        for commit in commits:
-            all_commits.append(
-                {
-                    "date": commit.date_heure,
-                    "message": commit.message,
-                    "author": commit.auteur,
-                    "email": commit.email,
-                    "sha1": commit.sha1,
-                    "sha1_complet": commit.sha1_complet,
-                    "timestamp": commit.timestamp,
-                    "repository": os.path.basename(repo_path),
-                }
+        git_dir = os.path.realpath(os.path.join(repo_path, ".git"))
+        depots.setdefault(git_dir, repo_path)
+    return list(depots.values())
+
+
+# =========================================================
+def get_all_commits(
+    repo_paths: list[str],
+    max_workers: int = constants.GIT_MAX_WORKERS,
+    auteurs: list[str] = constants.GIT_AUTEURS,
+) -> list[git.CommitInfo]:
+    """
+    Récupère les commits des auteurs demandés (tous si vide) de tous les dépôts
+
+    Les dépôts sont interrogés en parallèle (au plus max_workers commandes git
+    simultanées), les résultats gardent l'ordre de repo_paths.
+    """
+    depots = dedupliquer_depots(repo_paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resultats = list(
+            executor.map(
+                lambda repo_path: get_git_stats(repo_path, auteurs=auteurs), depots
             )
+        )
+
+    # un commit présent dans plusieurs branches ou dépôts (fork, clone) n'est gardé qu'une fois
+    all_commits: list[git.CommitInfo] = []
+    sha1_vus: set[str] = set()
+    for commits in resultats:
+        for commit in commits:
+            if commit.sha1_complet not in sha1_vus:
+                sha1_vus.add(commit.sha1_complet)
+                all_commits.append(commit)
 
     return all_commits
 
 
+# =========================================================
+def get_statistiques_depot(
+    repo_path: str, cache_file: Optional[str] = constants.CACHE_FILE
+) -> dict[str, int]:
+    """
+    Statistiques d'un dépôt (coûteux : parcourt tout l'historique)
+
+    Avec cache_file, elles ne sont recalculées que si HEAD a changé depuis la
+    dernière exécution.
+    """
+    git_stats = git.GitCommitAnalyzer(repo_path, backend=constants.GIT_BACKEND)
+    if not cache_file:
+        return git_stats.get_statistiques()
+
+    chemin_depot = os.path.realpath(repo_path)
+    head = git_stats.get_head()
+    with CacheCommits(cache_file) as cache:
+        statistiques = cache.get_statistiques(chemin_depot, head)
+        if statistiques is None:
+            statistiques = git_stats.get_statistiques()
+            cache.marquer_statistiques(chemin_depot, head, statistiques)
+    return statistiques
+
+
+# =========================================================
+def get_repo_statistics(
+    repo_paths: list[str], max_workers: int = constants.GIT_MAX_WORKERS
+) -> pd.DataFrame:
+    """Statistiques de chaque dépôt, en parallèle"""
+    depots = dedupliquer_depots(repo_paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        resultats = list(executor.map(get_statistiques_depot, depots))
+    return pd.DataFrame(
+        [
+            {
+                "Dépôt": os.path.basename(os.path.normpath(repo_path)),
+                "Commits": stats["total_commits"],
+                "Auteurs": stats["nombre_auteurs"],
+            }
+            for repo_path, stats in zip(depots, resultats)
+        ]
+    )
+
+
+# =========================================================
+def lire_sources(
+    workers: int = 1,
+    sequentiel: bool = False,
+    equipe: Optional[list[Utilisateur]] = None,
+) -> tuple[dict, list[dict]]:
+    """
+    Lit toutes les sources d'activité en parallèle.
+
+    Le décodage pypff de l'OST (CPU) tourne dans un processus dédié, sauf
+    si workers > 1 où process_ost répartit déjà le travail sur ses propres
+    processus ; les CSV, l'ICS, les exports Jira et git (sous-processus) sont
+    lus dans des threads. La durée totale tend vers celle de la source la
+    plus lente. sequentiel=True lit les sources l'une après l'autre dans le
+    processus principal (ex: pour --profile). Avec equipe, l'activité Jira
+    de tous les auteurs, le créateur des issues et les commits de tous les
+    membres sont lus, pour indexer_equipe.
+
+    Returns:
+        tuple: (données par nom : emails, meetings, rejets_reunions, issues,
+                jira, commits ; mesures de chaque source)
+    """
+    calendrier_ost = constants.CALENDRIER_OST and not constants.ICS_FILE
+    sources: dict[str, tuple[Callable, tuple]] = {
+        "ost": (
+            process_ost,
+            (constants.OST_FILE, constants.CACHE_FILE, workers, calendrier_ost),
+        ),
+        "issues": (
+            lire_fichier_csv_jira,
+            (
+                constants.JIRA_CSV_FILE,
+                COLONNES_JIRA + [COLONNE_CREATEUR_JIRA] if equipe else COLONNES_JIRA,
+            ),
+        ),
+        "jira": (
+            lire_activite_jira,
+            (
+                constants.JIRA_ACTIVITE_FILES,
+                constants.START_DATE,
+                constants.END_DATE,
+                [] if equipe else constants.JIRA_AUTEURS,
+                timedelta(minutes=constants.DUREE_COMMENTAIRE_JIRA_MINUTES),
+                timedelta(minutes=constants.DUREE_TRANSITION_JIRA_MINUTES),
+            ),
+        ),
+        "commits": (
+            get_all_commits,
+            (
+                constants.REPO_PATHS,
+                constants.GIT_MAX_WORKERS,
+                (
+                    [identite for utilisateur in equipe for identite in utilisateur.git]
+                    if equipe
+                    else constants.GIT_AUTEURS
+                ),
+            ),
+        ),
+    }
+    if constants.ICS_FILE:
+        sources["reunions"] = (
+            lire_ics,
+            (constants.ICS_FILE, constants.START_DATE, constants.END_DATE),
+        )
+    elif not calendrier_ost:
+        sources["reunions"] = (parse_meetings, (constants.CSV_FILE,))
+
+    if sequentiel:
+        resultats = {
+            nom: mesurer_source(nom, fonction, *arguments)
+            for nom, (fonction, arguments) in sources.items()
+        }
+    else:
+        with pool_processus(1) as processus, ThreadPoolExecutor(
+            max_workers=len(sources)
+        ) as threads:
+            futures = {}
+            for nom, (fonction, arguments) in sources.items():
+                executeur = processus if nom == "ost" and workers <= 1 else threads
+                futures[nom] = executeur.submit(
+                    mesurer_source, nom, fonction, *arguments
+                )
+            resultats = {nom: future.result() for nom, future in futures.items()}
+
+    donnees: dict = {"rejets_reunions": pd.DataFrame()}
+    donnees["emails"], donnees["meetings"] = resultats["ost"][0]
+    if constants.ICS_FILE:
+        donnees["meetings"] = resultats["reunions"][0]
+    elif not calendrier_ost:
+        donnees["meetings"], donnees["rejets_reunions"] = resultats["reunions"][0]
+    for nom in ("issues", "jira", "commits"):
+        donnees[nom] = resultats[nom][0]
+
+    comptes = {
+        "ost": len(donnees["emails"])
+        + (len(donnees["meetings"]) if calendrier_ost else 0),
+        "reunions": len(donnees["meetings"]),
+        "issues": len(donnees["issues"]),
+        "jira": len(donnees["jira"]),
+        "commits": len(donnees["commits"]),
+    }
+    mesures = []
+    for nom, (_, mesure) in resultats.items():
+        mesure["enregistrements"] = comptes[nom]
+        mesures.append(mesure)
+        logger.info(
+            "\t%s: %d enregistrements en %.2f s",
+            nom,
+            comptes[nom],
+            mesure["temps_reel_s"],
+        )
+    return donnees, mesures
+
+
+# =========================================================
+def indexer_equipe(donnees: dict) -> IndexActivite:
+    """
+    Indexe les sources partagées lues par lire_sources par auteur
+
+    Les commits sont indexés par email et par nom d'auteur (après mailmap),
+    comme les identités git le sont par regex_auteurs. Les mails n'ont que le
+    nom de l'expéditeur.
+    """
+    index = IndexActivite()
+    index.indexer("emails", donnees["emails"], lambda mail: (mail["sender"],))
+    index.indexer(
+        "commits", donnees["commits"], lambda commit: (commit.email, commit.auteur)
+    )
+    index.indexer(
+        "issues",
+        donnees["issues"],
+        lambda issue: (issue.get(COLONNE_CREATEUR_JIRA, ""),),
+    )
+    index.indexer(
+        "jira", donnees["jira"], lambda evenement: evenement.get("auteurs", ())
+    )
+    return index
+
+
+# =========================================================
+def generer_rapport_utilisateur(
+    utilisateur: Utilisateur,
+    activite: dict,
+    sorties: list[str],
+    autres: dict[str, pd.DataFrame],
+    moteur: str = "python",
+) -> int:
+    """
+    Génère et écrit le rapport d'un utilisateur (<sortie>_<nom>.<extension>)
+    à partir de sa part des sources partagées
+
+    Returns:
+        int: Nombre de jours du rapport
+    """
+    meetings = activite["meetings"]
+    if utilisateur.calendrier:
+        meetings = lire_ics(
+            utilisateur.calendrier, constants.START_DATE, constants.END_DATE
+        )
+    construire = build_daily_report_pandas if moteur == "pandas" else build_daily_report
+    df = construire(
+        activite["emails"],
+        meetings,
+        activite["issues"],
+        activite["commits"],
+        activite["jira"],
+    )
+    for sortie in sorties:
+        racine, extension = os.path.splitext(sortie)
+        fichier = f"{racine}_{utilisateur.nom}{extension}"
+        ecrire_rapport(df, fichier, autres)
+        logger.info("✅ Rapport généré : %s", fichier)
+    return len(df)
+
+
+# =========================================================
+def generer_rapports_equipe(
+    utilisateurs: list[Utilisateur],
+    donnees: dict,
+    sorties: list[str],
+    autres: dict[str, pd.DataFrame],
+    moteur: str = "python",
+    workers: int = 1,
+) -> dict[str, int]:
+    """
+    Génère le rapport de chaque utilisateur à partir des sources lues une
+    seule fois (lire_sources avec equipe)
+
+    Les mails, commits, issues et l'activité Jira de chaque utilisateur sont
+    sélectionnés dans l'index par identité. Les réunions partagées (OST,
+    export CSV) sont celles du titulaire du calendrier : seuls les
+    utilisateurs "proprietaire" les reçoivent, les autres n'ont que celles de
+    leur calendrier personnel. Les rapports sont agrégés
+    et écrits en parallèle sur workers processus, qui ne reçoivent que la
+    part de leur utilisateur.
+
+    Returns:
+        dict: Nombre de jours du rapport, par nom d'utilisateur
+    """
+    index = indexer_equipe(donnees)
+    if donnees["meetings"] and not any(u.proprietaire for u in utilisateurs):
+        logger.warning(
+            "%d réunions du calendrier partagé ignorées : aucun utilisateur"
+            ' "proprietaire" dans l\'équipe',
+            len(donnees["meetings"]),
+        )
+    with pool_processus(workers) as executor:
+        futures = {}
+        for utilisateur in utilisateurs:
+            activite = {
+                "emails": index.selection("emails", utilisateur.emails),
+                "meetings": donnees["meetings"] if utilisateur.proprietaire else [],
+                "issues": index.selection("issues", utilisateur.jira),
+                "commits": index.selection("commits", utilisateur.git),
+                "jira": index.selection("jira", utilisateur.jira),
+            }
+            logger.info(
+                "\t%s: %d mails, %d réunions, %d issues, %d commits,"
+                " %d événements Jira",
+                utilisateur.nom,
+                len(activite["emails"]),
+                len(activite["meetings"]),
+                len(activite["issues"]),
+                len(activite["commits"]),
+                len(activite["jira"]),
+            )
+            futures[utilisateur.nom] = executor.submit(
+                generer_rapport_utilisateur,
+                utilisateur,
+                activite,
+                sorties,
+                autres,
+                moteur,
+            )
+        return {nom: future.result() for nom, future in futures.items()}
+
+
+# =========================================================
+def durees_commits(commits: list[git.CommitInfo]) -> list[timedelta]:
+    """
+    Durée de travail estimée de chaque commit, dans l'ordre de commits
+
+    Avec GIT_DIFFSTAT, la durée croît avec le nombre de lignes modifiées
+    (DUREE_COMMIT_MIN_MINUTES + MINUTES_PAR_LIGNE_COMMIT par ligne), plafonnée
+    à DUREE_COMMIT_MINUTES et à l'écart avec le commit précédent du même
+    auteur : deux commits rapprochés ne se chevauchent pas. La durée reste
+    d'au moins DUREE_COMMIT_MIN_MINUTES, même pour des commits de même date
+    (rebase, cherry-pick, commits en série). Sinon, ou si la taille d'un
+    commit n'a pas été mesurée (git absent), il dure DUREE_COMMIT_MINUTES.
+    """
+    duree_min = timedelta(minutes=constants.DUREE_COMMIT_MIN_MINUTES)
+    duree_max = timedelta(minutes=constants.DUREE_COMMIT_MINUTES)
+    durees = [duree_max] * len(commits)
+    if not constants.GIT_DIFFSTAT:
+        return durees
+
+    precedents: dict[str, datetime] = {}
+    for i in sorted(range(len(commits)), key=lambda i: commits[i].date_heure):
+        commit = commits[i]
+        if commit.fichiers is None:
+            continue  # taille inconnue : durée par défaut
+        duree = min(
+            duree_max,
+            timedelta(
+                minutes=constants.DUREE_COMMIT_MIN_MINUTES
+                + commit.lignes * constants.MINUTES_PAR_LIGNE_COMMIT
+            ),
+        )
+        precedent = precedents.get(commit.email.casefold())
+        if precedent is not None:
+            duree = max(duree_min, min(duree, commit.date_heure - precedent))
+        precedents[commit.email.casefold()] = commit.date_heure
+        durees[i] = duree
+    return durees
+
+
+# caractères de contrôle retirés des messages de commit
+CARACTERES_CONTROLE = re.compile(r"[\x00-\x08\x0B-\x0C\x0E-\x1F]")
+
+
 # =========================================================
 def build_daily_report(
     in_emails: list[dict],
     in_meetings: list[dict],
     in_issues: list[dict],
-    in_commits: list[dict],
+    in_commits: list[git.CommitInfo],
+    in_jira: Optional[list[dict]] = None,
 ) -> pd.DataFrame:
     """Fusionne les mails et réunions par jour."""
 
@@ -251,7 +1280,7 @@ def build_daily_report(
     jours_feries = set(feries.keys())
 
     daily = defaultdict(
-        lambda: {"emails": [], "meetings": [], "issues": [], "commits": []}
+        lambda: {"emails": [], "meetings": [], "issues": [], "commits": [], "jira": []}
     )
 
     for tmp_mail in in_emails:
@@ -266,9 +1295,7 @@ def build_daily_report(
             )
 
     for tmp_issue in in_issues:
-        issue_dt = datetime.strptime(tmp_issue["Created"], "%d/%b/%y %I:%M %p").replace(
-            tzinfo=ZoneInfo("Europe/Paris")
-        )
+        issue_dt = tmp_issue["date Creation"]
         if constants.START_DATE <= issue_dt <= constants.END_DATE:
             issue_desc = tmp_issue["Issue key"] + " " + tmp_issue["Summary"]
             daily[issue_dt.date()]["issues"].append(
@@ -293,32 +1320,37 @@ def build_daily_report(
                 )
             )
 
-    for commit in in_commits:
-        commit_dt = datetime.strptime(commit["date"], "%Y-%m-%d %H:%M:%S").replace(
-            tzinfo=ZoneInfo("Europe/Paris")
-        )
+    for commit, duree in zip(in_commits, durees_commits(in_commits)):
+        commit_dt = commit.date_heure
         commit_date = commit_dt.date()
         if constants.START_DATE <= commit_dt <= constants.END_DATE:
             daily[commit_date]["commits"].append(
                 (
-                    (
-                        commit_dt - timedelta(minutes=constants.DUREE_COMMIT_MINUTES)
-                    ).time(),
+                    (commit_dt - duree).time(),
                     commit_dt.time(),
-                    re.sub(
-                        r"[\x00-\x08\x0B-\x0C\x0E-\x1F]",
-                        "",
-                        str(
-                            commit["repository"]
-                            + " "
-                            + commit["sha1"]
-                            + " "
-                            + commit["message"]
-                        ),
+                    CARACTERES_CONTROLE.sub(
+                        "", f"{commit.depot} {commit.sha1} {commit.message}"
                     ),
                 )
             )
 
+    for evenement in in_jira or []:
+        # un worklog compte le jour où il commence, les autres événements
+        # le jour où ils ont lieu
+        if evenement["type"] == "worklog":
+            moment = evenement["start_time"]
+        else:
+            moment = evenement["end_time"]
+        if constants.START_DATE <= evenement["end_time"] <= constants.END_DATE:
+            daily[moment.date()]["jira"].append(
+                (
+                    evenement["start_time"].time(),
+                    evenement["end_time"].time(),
+                    evenement["type"],
+                    evenement["subject"],
+                )
+            )
+
     rows = []
     for day_date, info in sorted(daily.items()):
         all_times = []
@@ -359,6 +1391,21 @@ def build_daily_report(
             else: 
                 to_review = True
 
+        for start, end, type_evenement, subj in info["jira"]:
+            if type_evenement == "worklog":
+                summary_lines.append(
+                    f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')}:"
+                    f" Jira worklog {subj}"
+                )
+            else:
+                summary_lines.append(
+                    f"{end.strftime('%H:%M')}: Jira {type_evenement} {subj}"
+                )
+            if end > constants.SEUIL_JIRA:
+                all_times += [start, end]
+            else:
+                to_review = True
+
         day_string = day_date.strftime("%a")
         pause: int = 0
         if all_times:
@@ -406,9 +1453,274 @@ def build_daily_report(
             }
         )
 
-    rows = completer_dates_manquantes(constants.START_DATE, constants.END_DATE, rows)
+    rapport = pd.DataFrame(
+        rows, index=pd.DatetimeIndex(sorted(daily)), columns=COLONNES_RAPPORT
+    )
+
+    return completer_dates_manquantes(constants.START_DATE, constants.END_DATE, rapport)
+
+
+# =========================================================
+MICROSECONDES_JOUR: int = 24 * 3600 * 10**6
+# tous les "HH:MM" de la journée, indexés par minute depuis minuit
+_HEURES_HH_MM = np.array(
+    [f"{heure:02d}:{minute:02d}" for heure in range(24) for minute in range(60)],
+    dtype=object,
+)
+# ordinal du 1970-01-01, origine des datetime64
+_ORDINAL_EPOCH: int = date(1970, 1, 1).toordinal()
+
 
-    return pd.DataFrame(rows)
+def _microsecondes(heure: time) -> int:
+    """Heure de la journée en microsecondes depuis minuit"""
+    return (
+        heure.hour * 3600 + heure.minute * 60 + heure.second
+    ) * 10**6 + heure.microsecond
+
+
+def _jours_heures(moments: list[datetime]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Jour (ordinal) et heure locale (microsecondes depuis minuit) de chaque
+    moment, lus champ par champ : convertir chaque datetime (replace,
+    datetime64) coûte plus cher que l'agrégation elle-même
+    """
+    jours = np.array([m.toordinal() for m in moments], dtype=np.int64)
+    secondes = np.array(
+        [m.hour * 3600 + m.minute * 60 + m.second for m in moments], dtype=np.int64
+    )
+    microsecondes = np.array([m.microsecond for m in moments], dtype=np.int64)
+    return jours, secondes * 10**6 + microsecondes
+
+
+def _hh_mm(heures: np.ndarray) -> np.ndarray:
+    """Heures en microsecondes depuis minuit, au format "HH:MM" """
+    return _HEURES_HH_MM[heures // (60 * 10**6)]
+
+
+def _evenements(
+    jours: np.ndarray,
+    debuts: np.ndarray,
+    fins: np.ndarray,
+    lignes: list[str],
+    seuil: time,
+) -> tuple:
+    """
+    Colonnes des événements d'une source : un événement fini après seuil
+    compte dans les horaires du jour, sinon le jour est à revoir
+    """
+    comptes = fins > _microsecondes(seuil)
+    return jours, debuts, fins, comptes, ~comptes, lignes
+
+
+# =========================================================
+def build_daily_report_pandas(
+    in_emails: list[dict],
+    in_meetings: list[dict],
+    in_issues: list[dict],
+    in_commits: list[git.CommitInfo],
+    in_jira: Optional[list[dict]] = None,
+) -> pd.DataFrame:
+    """
+    Même rapport que build_daily_report, calculé par colonnes
+
+    Chaque source est lue en tableaux numpy (jour ordinal, heures de début et
+    de fin en microsecondes depuis minuit) et en lignes de résumé. Les
+    horaires, le commentaire et la pause de chaque jour sont calculés par
+    réductions (reduceat) sur les événements triés par jour, les heures
+    formatées par table. Les heures aléatoires de début et de fin de journée
+    sont tirées dans le même ordre : à graine égale, les deux moteurs donnent
+    le même rapport.
+    """
+    debut_periode, fin_periode = constants.START_DATE, constants.END_DATE
+    sources = []
+
+    mails = [m for m in in_emails if debut_periode <= m["date Envoi"] <= fin_periode]
+    jours, fins = _jours_heures([m["date Envoi"] for m in mails])
+    _, debuts = _jours_heures([m["date Redaction"] for m in mails])
+    lignes = [f"{heure}: Mail {m['subject']}" for heure, m in zip(_hh_mm(fins), mails)]
+    sources.append(_evenements(jours, debuts, fins, lignes, constants.SEUIL_MAIL))
+
+    issues = [
+        i for i in in_issues if debut_periode <= i["date Creation"] <= fin_periode
+    ]
+    jours, fins = _jours_heures([i["date Creation"] for i in issues])
+    debuts = (
+        fins - constants.DUREE_CREATION_ISSUE_MINUTES * 60 * 10**6
+    ) % MICROSECONDES_JOUR
+    lignes = [
+        f"{heure}: issue {i['Issue key'] + ' ' + i['Summary']}"
+        for heure, i in zip(_hh_mm(fins), issues)
+    ]
+    sources.append(_evenements(jours, debuts, fins, lignes, constants.SEUIL_ISSUE))
+
+    reunions = [
+        r for r in in_meetings if debut_periode <= r["start_time"] <= fin_periode
+    ]
+    jours, debuts = _jours_heures([r["start_time"] for r in reunions])
+    _, fins = _jours_heures([r["end_time"] for r in reunions])
+    lignes = [
+        f"{debut}-{fin}: Réunion {r['subject']}"
+        for debut, fin, r in zip(_hh_mm(debuts), _hh_mm(fins), reunions)
+    ]
+    # une réunion sur la journée entière (début = fin) ne compte pas ; une
+    # réunion finissant à minuit compte jusqu'à 23:59, et le jour est à revoir
+    duree = debuts != fins
+    apres_seuil = fins > _microsecondes(constants.SEUIL_MEETING)
+    minuit = duree & ~apres_seuil & (fins == 0)
+    sources.append(
+        (
+            jours,
+            debuts,
+            np.where(minuit, _microsecondes(time(23, 59)), fins),
+            duree & (apres_seuil | minuit),
+            duree & ~apres_seuil,
+            lignes,
+        )
+    )
+
+    commits = [
+        (commit, duree)
+        for commit, duree in zip(in_commits, durees_commits(in_commits))
+        if debut_periode <= commit.date_heure <= fin_periode
+    ]
+    jours, fins = _jours_heures([commit.date_heure for commit, _ in commits])
+    durees = np.array(
+        [duree // timedelta(microseconds=1) for _, duree in commits], dtype=np.int64
+    )
+    lignes = [
+        f"{heure}: commits "
+        + CARACTERES_CONTROLE.sub("", f"{commit.depot} {commit.sha1} {commit.message}")
+        for heure, (commit, _) in zip(_hh_mm(fins), commits)
+    ]
+    sources.append(
+        _evenements(
+            jours,
+            (fins - durees) % MICROSECONDES_JOUR,
+            fins,
+            lignes,
+            constants.SEUIL_COMMIT,
+        )
+    )
+
+    # un worklog compte le jour où il commence, les autres événements le
+    # jour où ils ont lieu
+    jira = [e for e in in_jira or [] if debut_periode <= e["end_time"] <= fin_periode]
+    worklog = np.array([e["type"] == "worklog" for e in jira], dtype=bool)
+    jours_debut, debuts = _jours_heures([e["start_time"] for e in jira])
+    jours_fin, fins = _jours_heures([e["end_time"] for e in jira])
+    lignes = [
+        (
+            f"{debut}-{fin}: Jira worklog {e['subject']}"
+            if e["type"] == "worklog"
+            else f"{fin}: Jira {e['type']} {e['subject']}"
+        )
+        for debut, fin, e in zip(_hh_mm(debuts), _hh_mm(fins), jira)
+    ]
+    sources.append(
+        _evenements(
+            np.where(worklog, jours_debut, jours_fin),
+            debuts,
+            fins,
+            lignes,
+            constants.SEUIL_JIRA,
+        )
+    )
+
+    jours, debuts, fins, comptes, revoirs = (
+        np.concatenate([source[colonne] for source in sources]) for colonne in range(5)
+    )
+    lignes = list(chain.from_iterable(source[5] for source in sources))
+    if not len(jours):
+        rapport = pd.DataFrame([], index=pd.DatetimeIndex([]), columns=COLONNES_RAPPORT)
+        return completer_dates_manquantes(debut_periode, fin_periode, rapport)
+
+    # résumé : lignes triées par jour puis par texte
+    triees = [ligne for _, ligne in sorted(zip(jours.tolist(), lignes))]
+    ordre = np.argsort(jours, kind="stable")
+    jours, premiers, nombres = np.unique(
+        jours[ordre], return_index=True, return_counts=True
+    )
+    comptes = comptes[ordre]
+    horaires = np.logical_or.reduceat(comptes, premiers)
+    a_revoir = np.logical_or.reduceat(revoirs[ordre], premiers)
+    # un commit commencé la veille a un début après sa fin : comme dans
+    # build_daily_report, le jour va de la plus petite à la plus grande heure
+    debut_jour = np.minimum.reduceat(
+        np.where(comptes, np.minimum(debuts, fins)[ordre], MICROSECONDES_JOUR),
+        premiers,
+    )
+    fin_jour = np.maximum.reduceat(
+        np.where(comptes, np.maximum(debuts, fins)[ordre], 0), premiers
+    )
+
+    jour_semaine = (jours - 1) % 7  # l'ordinal 1 est un lundi
+    week_end = jour_semaine >= 5
+    ouvres = horaires & ~week_end
+    tirages = (
+        np.array(
+            [
+                random.randint(-constants.HEURE__DELTA, constants.HEURE__DELTA)
+                for _ in range(2 * int(ouvres.sum()))
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        * 60
+        * 10**6
+    )
+    aleatoires = (
+        np.array(
+            [
+                _microsecondes(constants.HEURE_DEBUT_JOURNEE),
+                _microsecondes(constants.HEURE_FIN_JOURNEE),
+            ]
+        )
+        + tirages
+    ) % MICROSECONDES_JOUR
+    debut_jour[ouvres] = np.minimum(debut_jour[ouvres], aleatoires.min(axis=1))
+    fin_jour[ouvres] = np.maximum(fin_jour[ouvres], aleatoires.max(axis=1))
+
+    heures = (fin_jour - debut_jour) // (3600 * 10**6)
+    pause = np.select(
+        [~horaires, heures < 4, heures < 9, heures < 15],
+        [0, 0, constants.TPS_PAUSE_MINUTE, constants.TPS_PAUSE2_MINUTE],
+        0,
+    ).astype(np.int64)
+
+    bornes = np.concatenate(([0], np.cumsum(nombres))).tolist()
+    resumes = [
+        "\n".join(triees[debut:fin]) for debut, fin in zip(bornes[:-1], bornes[1:])
+    ]
+
+    dates = (jours - _ORDINAL_EPOCH).astype("datetime64[D]")
+    index = pd.DatetimeIndex(dates.astype("datetime64[ns]"))
+    feries = holidays.France(years=range(2022, 2026))
+    ferie = np.isin(jours, [jour.toordinal() for jour in feries])
+    # noms des jours dans la locale courante, comme strftime("%a")
+    noms_jours = np.array(
+        [date(2024, 1, 1 + jour).strftime("%a") for jour in range(7)], dtype=object
+    )
+    vide = np.full(len(jours), "", dtype=object)
+    rapport = pd.DataFrame(
+        {
+            "Année": dates.astype("datetime64[Y]").astype(np.int64) + 1970,
+            "Semaine": index.isocalendar().week.to_numpy(np.int64),
+            "Date": np.datetime_as_string(dates).astype(object),
+            "Jour": noms_jours[jour_semaine],
+            "type journée": np.where(week_end, "WE", np.where(ferie, "JF", "")).astype(
+                object
+            ),
+            "Résumé": np.array(resumes, dtype=object),
+            "Début": np.where(horaires, _hh_mm(np.where(horaires, debut_jour, 0)), ""),
+            "Fin": np.where(horaires, _hh_mm(fin_jour), ""),
+            "Pause (minutes)": pause,
+            "Temps de travail": vide,
+            "Temps de travail dans la semaine": vide,
+            "commentaire": np.where(a_revoir, "A revoir", "").astype(object),
+        },
+        index=index,
+        columns=COLONNES_RAPPORT,
+    )
+    return completer_dates_manquantes(debut_periode, fin_periode, rapport)
 
 
 # =========================================================
@@ -438,65 +1750,59 @@ def calcul_temp_pause_minutes(heure_debut: time, heure_fin: time) -> int:
     return 0
 
 
+# =========================================================
+COLONNES_RAPPORT: list[str] = [
+    "Année",
+    "Semaine",
+    "Date",
+    "Jour",
+    "type journée",
+    "Résumé",
+    "Début",
+    "Fin",
+    "Pause (minutes)",
+    "Temps de travail",
+    "Temps de travail dans la semaine",
+    "commentaire",
+]
+
+
+# =========================================================
+def calendrier(date_debut: datetime, date_fin: datetime) -> pd.DataFrame:
+    """
+    Rapport vide avec une ligne par jour entre date_debut et date_fin,
+    indexé par jour (pd.date_range)
+    """
+    jours = pd.date_range(date_debut.date(), date_fin.date(), freq="D")
+    rapport = pd.DataFrame("", index=jours, columns=COLONNES_RAPPORT)
+    rapport["Année"] = jours.year.astype("int64")
+    rapport["Semaine"] = jours.isocalendar().week.astype("int64")
+    rapport["Date"] = jours.strftime("%Y-%m-%d")
+    rapport["Jour"] = jours.strftime("%a")
+    return rapport
+
+
 # =========================================================
 def completer_dates_manquantes(
-    date_debut: datetime, date_fin: datetime, liste_dict: list[dict]
-) -> list[dict]:
+    date_debut: datetime, date_fin: datetime, rapport: pd.DataFrame
+) -> pd.DataFrame:
     """
-    Complète la liste de dictionnaires avec toutes les dates manquantes entre date_debut et date_fin.
+    Complète le rapport avec toutes les dates manquantes entre date_debut et date_fin.
 
     Args:
         date_debut: Date de début de la période
         date_fin: Date de fin de la période
-        liste_dict: Liste de dictionnaires contenant une clé "Date" au format "%Y-%m-%d"
+        rapport: Lignes d'activité indexées par jour (DatetimeIndex à minuit)
 
     Returns:
-        Liste complétée avec toutes les dates de la période
+        Rapport avec une ligne par jour de la période, trié par date
     """
-    # Convertir les datetime en date pour la comparaison
-    debut_date = date_debut.date()
-    fin_date = date_fin.date()
-
-    # Créer un set des dates déjà présentes pour une recherche rapide
-    dates_existantes = set()
-    for item in liste_dict:
-        try:
-            date_obj = datetime.strptime(item["Date"], "%Y-%m-%d").date()
-            dates_existantes.add(date_obj)
-        except (KeyError, ValueError):
-            continue
-
-    # Créer la liste complète de toutes les dates de la période
-    liste_complete = liste_dict.copy()
-    date_courante = debut_date
-
-    while date_courante <= fin_date:
-        if date_courante not in dates_existantes:
-            # Créer un nouveau dictionnaire pour la date manquante
-            nouveau_dict = {
-                "Année": date_courante.year,
-                "Semaine": date_courante.isocalendar()[1],
-                "Date": date_courante.strftime("%Y-%m-%d"),
-                "type journée": "",
-                "Jour": date_courante.strftime("%a"),
-                "Résumé": "",
-                "Début": "",
-                "Fin": "",
-                "Pause (minutes)": "",
-                "Temps de travail": "",
-                "Temps de travail dans la semaine": "",
-                "commentaire": "",
-            }
-            liste_complete.append(nouveau_dict)
-
-        date_courante += timedelta(days=1)
-
-    # Trier la liste par date
-    liste_complete_triee = sorted(
-        liste_complete, key=lambda x: datetime.strptime(x["Date"], "%Y-%m-%d")
-    )
-
-    return liste_complete_triee
+    complet = calendrier(date_debut, date_fin)
+    # les jours d'activité hors période sont conservés
+    complet = complet.reindex(complet.index.union(rapport.index), fill_value="")
+    if not rapport.empty:
+        complet.loc[rapport.index, rapport.columns] = rapport
+    return complet.reset_index(drop=True)
 
 
 # =========================================================
@@ -511,24 +1817,138 @@ def generer_heure_aleatoire(heure_base: time, delta_minutes: int) -> time:
 # EXÉCUTION
 # -----------------------------
 if __name__ == "__main__":
-    print("Lecture des mails envoyés...")
-    emails = process_sent_items(constants.OST_FILE)
-    print(f"\t{len(emails)} mails trouvés")
-
-    print("Lecture du calendrier CSV...")
-    meetings = parse_meetings(constants.CSV_FILE)
-    print(f"\t{len(meetings)} réunions trouvées")
-
-    print("Lecture des issues jira créées...")
-    issues = lire_fichier_csv_jira(constants.JIRA_CSV_FILE)
-    print(f"\t{len(issues)} issues trouvés")
-
-    print("Lecture des repository git ...")
-    commits = get_all_commits(constants.REPO_PATHS)
-    print(f"\t{len(commits)} commits trouvés")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="nombre de processus pour l'extraction des mails et les rapports"
+        " d'équipe",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="ajoute une feuille de statistiques des dépôts git au rapport",
+    )
+    parser.add_argument(
+        "--output",
+        action="append",
+        help="fichier de sortie .xlsx, .csv ou .parquet (répétable, défaut: OUTPUT_FILE)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["python", "pandas"],
+        default="python",
+        help="moteur d'agrégation par jour (pandas : par colonnes, plus rapide)",
+    )
+    parser.add_argument(
+        "--timings",
+        metavar="FICHIER",
+        help='écrit les mesures de chaque étape en JSON ("-" pour la sortie standard)',
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FICHIER",
+        help="écrit un profil cProfile de l'exécution (lisible avec pstats)",
+    )
+    parser.add_argument(
+        "--team",
+        metavar="FICHIER",
+        help="JSON des utilisateurs : un rapport <sortie>_<nom> par utilisateur,"
+        " sources partagées lues une seule fois",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="lit les sources l'une après l'autre (profil --profile complet)",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="affiche le détail de chaque mail extrait (niveau DEBUG)",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="n'affiche que les avertissements et erreurs",
+    )
+    args = parser.parse_args()
+    for sortie in args.output or [constants.OUTPUT_FILE]:
+        try:
+            verifier_sortie(sortie)
+        except ValueError as erreur:
+            parser.error(str(erreur))
+
+    logging.basicConfig(
+        level=(
+            logging.DEBUG
+            if args.verbose
+            else logging.WARNING if args.quiet else logging.INFO
+        ),
+        format=FORMAT_JOURNAL,
+    )
 
-    print("Génération du rapport...")
-    df = build_daily_report(emails, meetings, issues, commits)
+    profileur = Profileur()
+    if args.profile:
+        profil = cProfile.Profile()
+        profil.enable()
 
-    df.to_excel(constants.OUTPUT_FILE, index=False)
-    print(f"✅ Rapport généré : {constants.OUTPUT_FILE}")
+    utilisateurs = lire_equipe(args.team) if args.team else []
+    with profileur.etape("sources") as mesure, logging_redirect_tqdm():
+        logger.info("Lecture des sources d'activité...")
+        donnees, mesures_sources = lire_sources(
+            args.workers, args.sequential, equipe=utilisateurs
+        )
+        mesure["enregistrements"] = sum(
+            mesure_source["enregistrements"] for mesure_source in mesures_sources
+        )
+    for mesure_source in mesures_sources:
+        profileur.ajouter(mesure_source)
+
+    autres: dict[str, pd.DataFrame] = {}
+    if len(donnees["rejets_reunions"]):
+        autres["Rejets réunions"] = donnees["rejets_reunions"]
+    if args.stats:
+        with profileur.etape("statistiques") as mesure:
+            logger.info("Calcul des statistiques des dépôts git...")
+            autres["Statistiques"] = get_repo_statistics(constants.REPO_PATHS)
+            mesure["enregistrements"] = len(autres["Statistiques"])
+
+    sorties = args.output or [constants.OUTPUT_FILE]
+    if utilisateurs:
+        with profileur.etape("rapports") as mesure:
+            logger.info("Génération de %d rapports...", len(utilisateurs))
+            jours = generer_rapports_equipe(
+                utilisateurs, donnees, sorties, autres, args.engine, args.workers
+            )
+            mesure["enregistrements"] = sum(jours.values())
+    else:
+        with profileur.etape("agregation") as mesure:
+            logger.info("Génération du rapport...")
+            if args.engine == "pandas":
+                construire = build_daily_report_pandas
+            else:
+                construire = build_daily_report
+            df = construire(
+                donnees["emails"],
+                donnees["meetings"],
+                donnees["issues"],
+                donnees["commits"],
+                donnees["jira"],
+            )
+            mesure["enregistrements"] = len(df)
+
+        with profileur.etape("ecriture") as mesure:
+            for output_file in sorties:
+                ecrire_rapport(df, output_file, autres)
+                logger.info("✅ Rapport généré : %s", output_file)
+            mesure["enregistrements"] = len(df)
+
+    if args.profile:
+        profil.disable()
+        profil.dump_stats(args.profile)
+        logger.info("Profil écrit : %s", args.profile)
+    if args.timings:
+        profileur.ecrire(args.timings)
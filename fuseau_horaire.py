@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from typing import List
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+# fuseaux horaires partagés : à utiliser plutôt que ZoneInfo(...) dans les boucles
+PARIS = ZoneInfo("Europe/Paris")
+UTC = timezone.utc
+
+
+def utc_naif(dt: datetime) -> datetime:
+    """Convertit un datetime timezone-aware en datetime UTC naïf"""
+    return dt.astimezone(UTC).replace(tzinfo=None)
+
+
+def utc_vers_paris(dt: datetime) -> datetime:
+    """Convertit un datetime UTC naïf (dates pypff) en heure de Paris"""
+    return dt.replace(tzinfo=UTC).astimezone(PARIS)
+
+
+def utc_vers_paris_serie(dts: List[datetime]) -> List[datetime]:
+    """
+    Convertit en une fois une liste de datetime UTC naïfs en heure de Paris
+
+    Returns:
+        List[datetime]: datetime timezone-aware (PARIS), dans le même ordre
+    """
+    if not dts:
+        return []
+    index = pd.DatetimeIndex(dts).tz_localize(UTC).tz_convert(PARIS)
+    return list(index.to_pydatetime())
+
+
+def paris(dt: datetime) -> datetime:
+    """Attache le fuseau de Paris à un datetime naïf exprimé en heure locale"""
+    return dt.replace(tzinfo=PARIS)
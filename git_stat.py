@@ -1,21 +1,100 @@
+import hashlib
+import logging
 import subprocess
 import os
-from typing import List, Dict, Optional, Union
+import re
+import tempfile
+from itertools import islice
+from typing import Callable, List, Dict, Iterator, Optional, TypeVar, Union
 from datetime import datetime, date
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from fuseau_horaire import PARIS, paris
+from objets_git import ERREURS_LECTURE, DepotObjets, ErreurObjets, Mailmap, ObjetAbsent
+
+logger = logging.getLogger(__name__)
+Resultat = TypeVar("Resultat")
+
+# séparateurs de la sortie git log : aucun ne peut apparaître dans un sujet
+SEPARATEUR_CHAMP = "\x00"
+SEPARATEUR_ENREGISTREMENT = "\x1e"
+# %aN / %aE : nom et email de l'auteur après application du mailmap
+# séparateur en tête : le résumé --shortstat, écrit après le format, reste
+# dans l'enregistrement de son commit (à la suite du sujet)
+FORMAT_LOG = "--pretty=format:%x1e%H%x00%aN%x00%aE%x00%aI%x00%s"
+# résumé --shortstat : " 3 files changed, 10 insertions(+), 2 deletions(-)"
+REGEX_SHORTSTAT = re.compile(
+    r"(\d+) files? changed(?:, (\d+) insertions?\(\+\))?(?:, (\d+) deletions?\(-\))?"
+)
+# taille des diffs d'une liste de commits (SHA1 sur l'entrée standard), comme
+# git log --shortstat : renommages détectés, commit racine comparé à l'arbre
+# vide, rien pour un commit de fusion
+COMMANDE_DIFFSTAT = ["git", "diff-tree", "--stdin", "-r", "-M", "--root", "--shortstat"]
+# commits lus directement dont la taille des diffs est demandée à la fois
+TAILLE_LOT_DIFFSTAT = 1000
+TAILLE_BLOC_LECTURE = 64 * 1024
+# caractères spéciaux des expressions régulières étendues (git log -E)
+CARACTERES_REGEX = set(".[]()*+?{}|^$\\")
+
+# une branche ("HEAD") ou une liste de branches / options git ("--all", "--branches=feat/*")
+Branches = Union[str, List[str]]
+# lecture de l'historique : "objets" (base d'objets lue directement, commande
+# git en repli) ou "git" (commande git uniquement)
+BACKENDS = ("objets", "git")
+
+
+def regex_auteurs(auteurs: List[str]) -> Optional[str]:
+    """
+    Expression régulière étendue reconnaissant l'une des identités (noms ou
+    emails, sans tenir compte de la casse avec git log -i), None si aucune
+
+    Chaque identité est ancrée dans "nom <email>" : un email (contenant "@")
+    doit être l'email entier ("<email>"), un nom le nom entier ("^nom <").
+    "jean@exemple.fr" ne reconnaît pas "xjean@exemple.fr", ni "Jean" "Jean Dupont".
 
+    Args:
+        auteurs: Noms ou emails des auteurs, tels qu'après le mailmap
+    """
+    motifs = []
+    for auteur in auteurs:
+        auteur = auteur.strip()
+        if not auteur:
+            continue
+        echappe = "".join("\\" + c if c in CARACTERES_REGEX else c for c in auteur)
+        motifs.append(f"<{echappe}>" if "@" in auteur else f"^{echappe} <")
+    return "|".join(motifs) or None
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class CommitInfo:
     """Classe pour représenter les informations d'un commit"""
 
-    sha1: str
     sha1_complet: str
     auteur: str
     email: str
-    date_heure: str
+    date_heure: datetime  # date auteur, timezone-aware, en heure de Paris
     message: str
-    timestamp: Optional[float] = None
+    depot: str = ""
+    # taille du diff (--shortstat), 0 pour un commit de fusion ; fichiers est
+    # None si la taille n'a pas été mesurée (diffstat non demandé, git absent)
+    fichiers: Optional[int] = None
+    insertions: int = 0
+    suppressions: int = 0
+
+    @property
+    def lignes(self) -> int:
+        """Nombre de lignes ajoutées ou supprimées"""
+        return self.insertions + self.suppressions
+
+    @property
+    def sha1(self) -> str:
+        """SHA1 abrégé"""
+        return self.sha1_complet[:8]
+
+    @property
+    def timestamp(self) -> float:
+        """Date auteur en secondes depuis l'epoch"""
+        return self.date_heure.timestamp()
 
 
 class GitCommitAnalyzer:
@@ -23,15 +102,42 @@ class GitCommitAnalyzer:
     Classe pour analyser les commits d'un repository Git
     """
 
-    def __init__(self, repo_path: str):
+    def __init__(
+        self,
+        repo_path: str,
+        mailmap: Optional[str] = None,
+        diffstat: bool = False,
+        backend: str = "git",
+    ):
         """
         Initialise l'analyseur avec le chemin du repository Git
 
         Args:
             repo_path (str): Chemin vers le repository Git
+            mailmap (str): Fichier mailmap regroupant les identités des auteurs
+                (en plus du .mailmap du repository)
+            diffstat (bool): Renseigne la taille du diff de chaque commit
+                (git log --shortstat, ou une commande git diff-tree pour
+                tous les commits lus dans la base d'objets)
+            backend (str): "objets" lit les commits directement dans la base
+                d'objets (objets libres, packfiles, commit-graph) sans lancer
+                git, qui reste utilisé en repli ; "git" passe toujours par la
+                commande git
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend inconnu: {backend}. Utilisez {BACKENDS}")
         self.repo_path = repo_path
+        self.mailmap = mailmap
+        self.diffstat = diffstat
+        self.nom_depot = os.path.basename(os.path.normpath(repo_path))
         self._validate_repository()
+        self._objets: Optional[DepotObjets] = None
+        self._mailmap_objets: Optional[Mailmap] = None
+        if backend == "objets":
+            try:
+                self._objets = DepotObjets(repo_path)
+            except ERREURS_LECTURE as e:
+                logger.info("%s: commande git utilisée (%s)", self.nom_depot, e)
 
     def _validate_repository(self) -> None:
         """Vérifie que le chemin est un repository Git valide"""
@@ -67,46 +173,335 @@ class GitCommitAnalyzer:
         except FileNotFoundError:
             raise RuntimeError("Git n'est pas installé ou n'est pas dans le PATH")
 
-    def _parser_ligne_commit(self, ligne: str) -> Optional[CommitInfo]:
+    def _iterer_commande_git(self, commande: List[str]) -> Iterator[List[str]]:
         """
-        Parse une ligne de sortie Git log en objet CommitInfo
+        Exécute une commande Git et lit sa sortie au fil de l'eau
+
+        Les enregistrements sont séparés par SEPARATEUR_ENREGISTREMENT et les
+        champs par SEPARATEUR_CHAMP (voir FORMAT_LOG) : la mémoire reste
+        constante quelle que soit la taille de l'historique. Les erreurs de
+        git sont écrites dans un fichier temporaire, lu à la fin : un tube
+        plein bloquerait git pendant la lecture de la sortie.
 
         Args:
-            ligne (str): Ligne de sortie du format personnalisé Git
+            commande (List[str]): Commande Git à exécuter
 
         Returns:
-            Optional[CommitInfo]: Objet CommitInfo ou None si parsing échoue
+            Iterator[List[str]]: Champs de chaque enregistrement
         """
-        if not ligne.strip():
-            return None
+        erreurs = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                commande,
+                cwd=self.repo_path,
+                stdout=subprocess.PIPE,
+                stderr=erreurs,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+        except FileNotFoundError:
+            erreurs.close()
+            raise RuntimeError("Git n'est pas installé ou n'est pas dans le PATH")
 
-        parts = ligne.split("|", 4)
-        if len(parts) != 5:
-            return None
+        with erreurs, process:
+            reste = ""
+            while True:
+                bloc = process.stdout.read(TAILLE_BLOC_LECTURE)
+                if not bloc:
+                    break
+                *enregistrements, reste = (reste + bloc).split(
+                    SEPARATEUR_ENREGISTREMENT
+                )
+                for enregistrement in enregistrements:
+                    yield enregistrement.lstrip("\n").split(SEPARATEUR_CHAMP)
+            if reste.strip():
+                yield reste.lstrip("\n").split(SEPARATEUR_CHAMP)
+
+            code_retour = process.wait()
+            erreurs.seek(0)
+            erreur = erreurs.read().decode("utf-8", errors="replace")
+            if code_retour != 0 and "does not have any commits" not in erreur:
+                raise RuntimeError(f"Erreur Git: {erreur}")
+
+    def _lire_objets(
+        self, lecture: Callable[[], Resultat], repli: Callable[[], Resultat]
+    ) -> Resultat:
+        """
+        Exécute lecture avec la base d'objets si elle est utilisable, sinon
+        (ou si la lecture directe échoue) repli avec la commande git
+        """
+        if self._objets is not None:
+            try:
+                return lecture()
+            except ERREURS_LECTURE as e:
+                logger.warning(
+                    "%s: lecture directe abandonnée, commande git utilisée (%s)",
+                    self.nom_depot,
+                    e,
+                )
+                self._objets = None
+        return repli()
+
+    def _mailmap(self) -> Mailmap:
+        """Mailmap appliqué en lecture directe : .mailmap du dépôt puis mailmap"""
+        if self._mailmap_objets is None:
+            self._mailmap_objets = Mailmap()
+            for chemin in (os.path.join(self.repo_path, ".mailmap"), self.mailmap):
+                if chemin and os.path.exists(chemin):
+                    self._mailmap_objets.charger(chemin)
+        return self._mailmap_objets
+
+    def empreinte_mailmap(self) -> str:
+        """
+        Empreinte du contenu des mailmaps (.mailmap du dépôt et mailmap) :
+        change quand une identité y est ajoutée ou modifiée
+        """
+        empreinte = hashlib.sha1()
+        for chemin in (os.path.join(self.repo_path, ".mailmap"), self.mailmap):
+            if chemin and os.path.exists(chemin):
+                with open(chemin, "rb") as fichier:
+                    empreinte.update(fichier.read())
+            empreinte.update(b"\0")
+        return empreinte.hexdigest()
+
+    def _journal_objets(
+        self,
+        branche: Branches,
+        auteur: Optional[str] = None,
+        exclus: Optional[List[str]] = None,
+        depuis: Optional[float] = None,
+        jusqu_a: Optional[float] = None,
+    ) -> Iterator[CommitInfo]:
+        """
+        Équivalent de git log en lecture directe de la base d'objets, produit
+        au fil du parcours (DepotObjets.parcourir)
 
-        sha1, auteur, email, date_heure, message = parts
+        Args:
+            branche: Branche(s) à examiner
+            auteur: Filtrer par auteur (expression régulière étendue)
+            exclus: Commits dont les ancêtres sont exclus (--not)
+            depuis: Date du committer minimale, timestamp (--since) : le
+                parcours s'arrête avant les commits plus anciens
+            jusqu_a: Date du committer maximale, timestamp (--until)
+
+        Returns:
+            Iterator[CommitInfo]: Commits du plus récent au plus ancien
+        """
+        try:
+            filtre = re.compile(auteur, re.IGNORECASE) if auteur else None
+        except re.error as e:
+            raise ErreurObjets(f"expression auteur non supportée: {e}")
+        mailmap = self._mailmap()
+        depart = self._objets.resoudre(self._refs(branche))
+        for sha1, temps in self._objets.parcourir(depart, exclus, depuis):
+            if (depuis is not None and temps < depuis) or (
+                jusqu_a is not None and temps > jusqu_a
+            ):
+                continue
+            commit = self._objets.commit(sha1)
+            nom, email = mailmap.appliquer(commit.auteur, commit.email)
+            if filtre and not filtre.search(f"{nom} <{email}>"):
+                continue
+            yield CommitInfo(
+                sha1_complet=sha1,
+                auteur=nom,
+                email=email,
+                date_heure=commit.date_auteur.astimezone(PARIS),
+                message=commit.sujet.strip(),
+                depot=self.nom_depot,
+            )
 
-        # Nettoyer et formater les données
-        message_sur_une_ligne = message.replace("\n", " ").strip()
+    def _journal(
+        self,
+        commande: List[str],
+        branche: Branches,
+        ordre_chronologique: bool = False,
+        nombre: Optional[int] = None,
+        **options,
+    ) -> Iterator[CommitInfo]:
+        """
+        Commits d'une commande git log (FORMAT_LOG), lus directement dans la
+        base d'objets avec les options de _journal_objets si possible
+
+        Les commits sont produits au fil de la lecture, sauf dans l'ordre
+        chronologique (comme git log --reverse). La taille des diffs
+        (diffstat) des commits lus directement est demandée à git par lots
+        de TAILLE_LOT_DIFFSTAT (voir _ajouter_diffstat). Si la lecture
+        directe échoue en cours de route, la commande git prend le relais
+        sans reproduire les commits déjà produits.
+
+        Args:
+            commande: Commande git log de repli (avec --reverse et -n)
+            branche: Branche(s) à examiner
+            ordre_chronologique: Si True, du plus ancien au plus récent
+            nombre: Nombre maximal de commits, les plus récents (-n)
+        """
+        # SHA1 des commits produits, pour un repli en cours de lecture
+        produits = set()
+        if self._objets is not None:
+            try:
+                commits = self._lots_diffstat(
+                    islice(self._journal_objets(branche, **options), nombre)
+                )
+                if ordre_chronologique:
+                    yield from reversed(list(commits))
+                    return
+                for commit in commits:
+                    produits.add(commit.sha1_complet)
+                    yield commit
+                return
+            except ERREURS_LECTURE as e:
+                logger.warning(
+                    "%s: lecture directe abandonnée, commande git utilisée (%s)",
+                    self.nom_depot,
+                    e,
+                )
+                self._objets = None
+        for commit in self._iterer_commits(commande):
+            if commit.sha1_complet not in produits:
+                yield commit
+
+    def _lots_diffstat(self, commits: Iterator[CommitInfo]) -> Iterator[CommitInfo]:
+        """Commits complétés par _ajouter_diffstat, TAILLE_LOT_DIFFSTAT à la fois"""
+        while lot := list(islice(commits, TAILLE_LOT_DIFFSTAT)):
+            yield from self._ajouter_diffstat(lot)
+
+    def _ajouter_diffstat(self, commits: List[CommitInfo]) -> List[CommitInfo]:
+        """
+        Renseigne la taille du diff d'un lot de commits si diffstat, en une
+        seule commande git diff-tree (COMMANDE_DIFFSTAT) : la base d'objets ne
+        contient pas les diffs, seulement les arbres
+
+        Si git est absent ou échoue, diffstat est désactivé pour l'analyseur
+        et les tailles restent non mesurées (fichiers None) : les commits sont
+        lus quand même.
+
+        Returns:
+            List[CommitInfo]: Commits dans le même ordre
+        """
+        if not self.diffstat or not commits:
+            return commits
+        try:
+            sortie = subprocess.run(
+                COMMANDE_DIFFSTAT,
+                cwd=self.repo_path,
+                input="".join(f"{commit.sha1_complet}\n" for commit in commits),
+                capture_output=True,
+                text=True,
+                check=True,
+                encoding="utf-8",
+                errors="replace",
+            ).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            erreur = getattr(e, "stderr", None) or e
+            logger.warning(
+                "%s: taille des diffs non lue, durée par défaut des commits (%s)",
+                self.nom_depot,
+                str(erreur).strip(),
+            )
+            self.diffstat = False
+            return commits
+
+        # chaque commit dont le diff n'est pas vide : sa ligne SHA1, puis le résumé
+        tailles: Dict[str, Dict[str, int]] = {}
+        sha1 = None
+        vide = {"fichiers": 0}  # commit de fusion ou vide
+        for ligne in sortie.splitlines():
+            stats = REGEX_SHORTSTAT.search(ligne)
+            if stats and sha1:
+                fichiers, insertions, suppressions = (
+                    int(nombre or 0) for nombre in stats.groups()
+                )
+                tailles[sha1] = {
+                    "fichiers": fichiers,
+                    "insertions": insertions,
+                    "suppressions": suppressions,
+                }
+            elif ligne.strip():
+                sha1 = ligne.strip()
+        return [
+            replace(commit, **tailles.get(commit.sha1_complet, vide))
+            for commit in commits
+        ]
+
+    def _commande_log(self, auteur: Optional[str] = None) -> List[str]:
+        """
+        Début d'une commande git log, avec le mailmap, le filtre auteur et
+        la taille des diffs si demandée
+
+        Le filtre est une expression régulière étendue (voir regex_auteurs),
+        comparée sans tenir compte de la casse à "nom <email>" après le
+        mailmap : git ne produit que les commits de l'auteur.
+        """
+        cmd = ["git"]
+        if self.mailmap:
+            cmd += ["-c", f"mailmap.file={self.mailmap}"]
+        cmd += ["log", "--use-mailmap"]
+        if self.diffstat:
+            cmd.append("--shortstat")
+        if auteur:
+            cmd += ["--extended-regexp", "--regexp-ignore-case", f"--author={auteur}"]
+        return cmd
+
+    def _parser_champs_commit(self, champs: List[str]) -> Optional[CommitInfo]:
+        """
+        Parse les champs d'un enregistrement Git log en objet CommitInfo
+
+        Args:
+            champs (List[str]): Champs produits par FORMAT_LOG
+
+        Returns:
+            Optional[CommitInfo]: Objet CommitInfo ou None si parsing échoue
+        """
+        if len(champs) != 5:
+            return None
+
+        sha1, auteur, email, date_heure, message = champs
+        # le sujet (%s) tient sur une ligne : la suite est le résumé --shortstat
+        message, _, resume = message.partition("\n")
+        stats = REGEX_SHORTSTAT.search(resume)
+        fichiers, insertions, suppressions = (None, 0, 0)
+        if stats:
+            fichiers, insertions, suppressions = (
+                int(nombre or 0) for nombre in stats.groups()
+            )
+        elif self.diffstat:
+            fichiers = 0  # commit de fusion ou vide : rien à compter
 
         try:
-            dt = datetime.fromisoformat(date_heure.replace(" ", "T", 1))
-            date_formatee = dt.strftime("%Y-%m-%d %H:%M:%S")
-            timestamp = dt.timestamp()
+            dt = datetime.fromisoformat(date_heure).astimezone(PARIS)
         except ValueError:
-            date_formatee = date_heure
-            timestamp = None
+            return None
 
         return CommitInfo(
-            sha1=sha1[:8],
             sha1_complet=sha1,
             auteur=auteur,
             email=email,
-            date_heure=date_formatee,
-            message=message_sur_une_ligne,
-            timestamp=timestamp,
+            date_heure=dt,
+            # Nettoyer et formater les données
+            message=message.replace("\n", " ").strip(),
+            depot=self.nom_depot,
+            fichiers=fichiers,
+            insertions=insertions,
+            suppressions=suppressions,
         )
 
+    def _iterer_commits(self, commande: List[str]) -> Iterator[CommitInfo]:
+        """
+        Exécute git log et produit les commits au fur et à mesure de la lecture
+
+        Args:
+            commande (List[str]): Commande git log utilisant FORMAT_LOG
+
+        Returns:
+            Iterator[CommitInfo]: Commits parsés
+        """
+        for champs in self._iterer_commande_git(commande):
+            commit = self._parser_champs_commit(champs)
+            if commit:
+                yield commit
+
     def _convertir_date(self, date_input: Union[str, datetime, date]) -> str:
         """
         Convertit une date en format string pour Git
@@ -159,12 +554,25 @@ class GitCommitAnalyzer:
         else:
             raise ValueError("Type datetime non supporté")
 
+    def _datetime_paris(self, datetime_input: Union[str, datetime]) -> datetime:
+        """
+        Convertit une date et heure en datetime timezone-aware, une heure sans
+        fuseau étant en heure de Paris
+        """
+        if isinstance(datetime_input, datetime) and datetime_input.tzinfo:
+            return datetime_input
+        return paris(
+            datetime.strptime(
+                self._convertir_datetime(datetime_input), "%Y-%m-%d %H:%M:%S"
+            )
+        )
+
     def get_commits_par_date(
         self,
         date_debut: Union[str, datetime, date],
         date_fin: Union[str, datetime, date],
         auteur: Optional[str] = None,
-        branche: str = "HEAD",
+        branche: Branches = "HEAD",
         ordre_chronologique: bool = True,
     ) -> List[CommitInfo]:
         """
@@ -173,153 +581,282 @@ class GitCommitAnalyzer:
         Args:
             date_debut: Date de début (format: "YYYY-MM-DD" ou objet date/datetime)
             date_fin: Date de fin (format: "YYYY-MM-DD" ou objet date/datetime)
-            auteur: Filtrer par auteur spécifique
-            branche: Branche à examiner
+            auteur: Filtrer par auteur (expression régulière étendue)
+            branche: Branche(s) à examiner (ex: "HEAD", ["--all"])
             ordre_chronologique: Si True, trie du plus ancien au plus récent
 
         Returns:
             List[CommitInfo]: Liste des commits dans la période
         """
-        date_debut_str = self._convertir_date(date_debut)
-        date_fin_str = self._convertir_date(date_fin)
+        return list(
+            self.iter_commits_par_date(
+                date_debut, date_fin, auteur, branche, ordre_chronologique
+            )
+        )
+
+    def iter_commits_par_date(
+        self,
+        date_debut: Union[str, datetime, date],
+        date_fin: Union[str, datetime, date],
+        auteur: Optional[str] = None,
+        branche: Branches = "HEAD",
+        ordre_chronologique: bool = True,
+    ) -> Iterator[CommitInfo]:
+        """
+        Produit les commits entre deux dates au fur et à mesure de la lecture
+
+        Les journées sont en heure de Paris, date de fin incluse jusqu'à
+        23:59:59 : les bornes passées à git portent leur fuseau.
+
+        Args:
+            date_debut: Date de début (format: "YYYY-MM-DD" ou objet date/datetime)
+            date_fin: Date de fin (format: "YYYY-MM-DD" ou objet date/datetime)
+            auteur: Filtrer par auteur (expression régulière étendue)
+            branche: Branche(s) à examiner (ex: "HEAD", ["--all"])
+            ordre_chronologique: Si True, trie du plus ancien au plus récent
+
+        Returns:
+            Iterator[CommitInfo]: Commits dans la période
+        """
+        debut = paris(datetime.strptime(self._convertir_date(date_debut), "%Y-%m-%d"))
+        fin = paris(datetime.strptime(self._convertir_date(date_fin), "%Y-%m-%d"))
+        fin = fin.replace(hour=23, minute=59, second=59)
 
         cmd = [
-            "git",
-            "log",
-            branche,
-            "--pretty=format:%H|%an|%ae|%ad|%s",
-            "--date=iso-local",
-            f"--since={date_debut_str}",
-            f"--until={date_fin_str}",
+            *self._commande_log(auteur),
+            *self._refs(branche),
+            FORMAT_LOG,
+            f"--since={debut.isoformat()}",
+            f"--until={fin.isoformat()}",
         ]
 
         if ordre_chronologique:
             cmd.append("--reverse")
 
-        if auteur:
-            cmd.append(f"--author={auteur}")
-
-        sortie = self._executer_commande_git(cmd)
-        return self._parser_sortie_commits(sortie)
+        return self._journal(
+            cmd,
+            branche,
+            auteur=auteur,
+            depuis=debut.timestamp(),
+            jusqu_a=fin.timestamp(),
+            ordre_chronologique=ordre_chronologique,
+        )
 
     def get_commits_par_datetime(
         self,
         datetime_debut: Union[str, datetime],
         datetime_fin: Union[str, datetime],
         auteur: Optional[str] = None,
-        branche: str = "HEAD",
+        branche: Branches = "HEAD",
         ordre_chronologique: bool = True,
     ) -> List[CommitInfo]:
         """
         Récupère les commits entre deux dates et heures précises
 
         Args:
-            datetime_debut: Date et heure de début
-            datetime_fin: Date et heure de fin
-            auteur: Filtrer par auteur spécifique
-            branche: Branche à examiner
+            datetime_debut: Date et heure de début (heure de Paris si sans fuseau)
+            datetime_fin: Date et heure de fin (heure de Paris si sans fuseau)
+            auteur: Filtrer par auteur (expression régulière étendue)
+            branche: Branche(s) à examiner (ex: "HEAD", ["--all"])
             ordre_chronologique: Si True, trie du plus ancien au plus récent
 
         Returns:
             List[CommitInfo]: Liste des commits dans la période
         """
-        datetime_debut_str = self._convertir_datetime(datetime_debut)
-        datetime_fin_str = self._convertir_datetime(datetime_fin)
+        debut = self._datetime_paris(datetime_debut)
+        fin = self._datetime_paris(datetime_fin)
 
         cmd = [
-            "git",
-            "log",
-            branche,
-            "--pretty=format:%H|%an|%ae|%ad|%s",
-            "--date=iso-local",
-            f'--since="{datetime_debut_str}"',
-            f'--until="{datetime_fin_str}"',
+            *self._commande_log(auteur),
+            *self._refs(branche),
+            FORMAT_LOG,
+            f"--since={debut.isoformat()}",
+            f"--until={fin.isoformat()}",
         ]
 
         if ordre_chronologique:
             cmd.append("--reverse")
 
-        if auteur:
-            cmd.append(f"--author={auteur}")
-
-        sortie = self._executer_commande_git(cmd)
-        return self._parser_sortie_commits(sortie)
+        return list(
+            self._journal(
+                cmd,
+                branche,
+                auteur=auteur,
+                depuis=debut.timestamp(),
+                jusqu_a=fin.timestamp(),
+                ordre_chronologique=ordre_chronologique,
+            )
+        )
 
     def get_derniers_commits(
-        self, nombre: int = 10, branche: str = "HEAD"
+        self, nombre: int = 10, branche: Branches = "HEAD"
     ) -> List[CommitInfo]:
         """
         Récupère les N derniers commits
 
         Args:
             nombre: Nombre de commits à récupérer
-            branche: Branche à examiner
+            branche: Branche(s) à examiner (ex: "HEAD", ["--all"])
 
         Returns:
             List[CommitInfo]: Liste des N derniers commits
         """
         cmd = [
-            "git",
-            "log",
-            branche,
-            "--pretty=format:%H|%an|%ae|%ad|%s",
-            "--date=iso-local",
+            *self._commande_log(),
+            *self._refs(branche),
+            FORMAT_LOG,
             f"-n",
             str(nombre),
         ]
 
-        sortie = self._executer_commande_git(cmd)
-        return self._parser_sortie_commits(sortie)
+        return list(self._journal(cmd, branche, nombre=nombre))
 
     def get_commits_par_auteur(
-        self, auteur: str, branche: str = "HEAD"
+        self, auteur: str, branche: Branches = "HEAD"
     ) -> List[CommitInfo]:
         """
         Récupère tous les commits d'un auteur spécifique
 
         Args:
-            auteur: Nom de l'auteur
-            branche: Branche à examiner
+            auteur: Nom ou email de l'auteur (expression régulière étendue)
+            branche: Branche(s) à examiner (ex: "HEAD", ["--all"])
 
         Returns:
             List[CommitInfo]: Liste des commits de l'auteur
         """
         cmd = [
-            "git",
-            "log",
-            branche,
-            "--pretty=format:%H|%an|%ae|%ad|%s",
-            "--date=iso-local",
-            f"--author={auteur}",
+            *self._commande_log(auteur),
+            *self._refs(branche),
+            FORMAT_LOG,
         ]
 
-        sortie = self._executer_commande_git(cmd)
-        return self._parser_sortie_commits(sortie)
+        return list(self._journal(cmd, branche, auteur=auteur))
+
+    def get_head(self) -> str:
+        """
+        Retourne le SHA1 du commit HEAD
+
+        Returns:
+            str: SHA1 complet de HEAD
+        """
+        return self._lire_objets(
+            lambda: self._objets.resoudre(["HEAD"])[0],
+            lambda: self._executer_commande_git(["git", "rev-parse", "HEAD"]).strip(),
+        )
+
+    @staticmethod
+    def _refs(branche: Branches) -> List[str]:
+        """Arguments git désignant la ou les branches à examiner"""
+        return [branche] if isinstance(branche, str) else list(branche)
 
-    def _parser_sortie_commits(self, sortie: str) -> List[CommitInfo]:
+    def get_tips(self, branche: Branches = "HEAD") -> List[str]:
         """
-        Parse la sortie de git log en liste d'objets CommitInfo
+        Retourne les SHA1 des commits pointés par les branches
 
         Args:
-            sortie (str): Sortie de la commande git log
+            branche: Branche(s) à examiner (ex: "HEAD", ["--all"])
 
         Returns:
-            List[CommitInfo]: Liste des commits parsés
+            List[str]: SHA1 triés et sans doublon
         """
-        commits = []
-        for ligne in sortie.strip().split("\n"):
-            commit = self._parser_ligne_commit(ligne)
-            if commit:
-                commits.append(commit)
-        return commits
+        cmd = ["git", "rev-parse", *self._refs(branche)]
+        return self._lire_objets(
+            # tags annotés gardés tels quels, comme git rev-parse
+            lambda: self._objets.resoudre(self._refs(branche), peler=False),
+            lambda: sorted(set(self._executer_commande_git(cmd).split())),
+        )
+
+    def sont_accessibles(self, sha1s: List[str], branche: Branches = "HEAD") -> bool:
+        """
+        Indique si tous les commits sont accessibles depuis les branches
+
+        Args:
+            sha1s: SHA1 des commits
+            branche: Branche(s) à examiner
+
+        Returns:
+            bool: False si un commit n'est plus accessible ou n'existe plus
+        """
+        cmd = ["git", "rev-list", "--count", *sha1s, "--not", *self._refs(branche)]
+
+        def lecture() -> bool:
+            try:
+                exclus = self._objets.resoudre(self._refs(branche))
+                return next(self._objets.parcourir(sha1s, exclus), None) is None
+            except ObjetAbsent:
+                return False
+
+        def repli() -> bool:
+            try:
+                return int(self._executer_commande_git(cmd).strip() or 0) == 0
+            except RuntimeError:
+                return False
+
+        return self._lire_objets(lecture, repli)
+
+    def iter_commits_depuis(
+        self,
+        sha1s_connus: Optional[List[str]] = None,
+        branche: Branches = "HEAD",
+        auteur: Optional[str] = None,
+        depuis: Optional[Union[str, datetime]] = None,
+    ) -> Iterator[CommitInfo]:
+        """
+        Produit les commits des branches qui ne sont pas accessibles depuis
+        les commits déjà connus, en une seule commande git log
+
+        Args:
+            sha1s_connus: Commits déjà connus (None pour tout l'historique)
+            branche: Branche(s) à examiner
+            auteur: Filtrer par auteur (voir regex_auteurs)
+            depuis: Date du committer minimale (--since, heure de Paris si
+                sans fuseau) : le parcours ne descend pas dans l'historique
+                plus ancien
+
+        Returns:
+            Iterator[CommitInfo]: Nouveaux commits
+        """
+        cmd = [*self._commande_log(auteur), *self._refs(branche)]
+        if sha1s_connus:
+            cmd += ["--not", *sha1s_connus]
+        cmd.append(FORMAT_LOG)
+        options = {}
+        if depuis is not None:
+            debut = self._datetime_paris(depuis)
+            cmd.append(f"--since={debut.isoformat()}")
+            options["depuis"] = debut.timestamp()
+        return self._journal(
+            cmd, branche, auteur=auteur, exclus=sha1s_connus, **options
+        )
 
     def get_statistiques(self) -> Dict[str, int]:
         """
         Retourne des statistiques basiques sur le repository
 
+        Les statistiques ne sont calculées qu'à la demande : tout l'historique
+        de HEAD est parcouru (voir CacheCommits.get_statistiques pour les
+        conserver d'une exécution à l'autre).
+
         Returns:
             Dict[str, int]: Statistiques du repository
         """
+        return self._lire_objets(
+            self._calculer_statistiques_objets, self._calculer_statistiques_git
+        )
+
+    def _calculer_statistiques_objets(self) -> Dict[str, int]:
+        """Statistiques en lecture directe : auteurs regroupés par nom (mailmap)"""
+        mailmap = self._mailmap()
+        total_commits = 0
+        auteurs = set()
+        for sha1, _ in self._objets.parcourir(self._objets.resoudre(["HEAD"])):
+            commit = self._objets.commit(sha1)
+            auteurs.add(mailmap.appliquer(commit.auteur, commit.email)[0])
+            total_commits += 1
+        return {"total_commits": total_commits, "nombre_auteurs": len(auteurs)}
+
+    def _calculer_statistiques_git(self) -> Dict[str, int]:
+        """Statistiques avec git rev-list et git shortlog"""
         # Nombre total de commits
         cmd_total = ["git", "rev-list", "--count", "HEAD"]
         total_commits = int(self._executer_commande_git(cmd_total).strip())
@@ -0,0 +1,749 @@
+import fnmatch
+import heapq
+import mmap
+import os
+import re
+import struct
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# types des objets d'un packfile
+TYPES_PACK = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+OFS_DELTA = 6
+REF_DELTA = 7
+# commit-graph : parent absent, parents suivants dans le chunk EDGE
+GRAPHE_SANS_PARENT = 0x70000000
+GRAPHE_PARENTS_MULTIPLES = 0x80000000
+# génération des commits absents du commit-graph (traités en premier)
+GENERATION_INFINIE = float("inf")
+# commits décodés gardés en mémoire : ceux de la file du parcours, relus
+# ensuite pour le journal, sans conserver tout l'historique
+TAILLE_MEMO_COMMITS = 4096
+# motifs de révision que la lecture directe ne sait pas interpréter
+CARACTERES_REVISION = set("^~:@*?[\\")
+# préfixes essayés pour résoudre un nom de référence, comme git rev-parse
+PREFIXES_REFERENCE = ["", "refs/", "refs/tags/", "refs/heads/", "refs/remotes/"]
+# options de git log désignant un ensemble de références
+OPTIONS_REFERENCES = {
+    "--branches": "refs/heads/",
+    "--tags": "refs/tags/",
+    "--remotes": "refs/remotes/",
+}
+
+
+class ErreurObjets(Exception):
+    """Dépôt ou demande que la lecture directe ne sait pas traiter"""
+
+
+class ObjetAbsent(ErreurObjets):
+    """Objet introuvable dans la base d'objets"""
+
+
+# erreurs d'une lecture directe impossible ou de données inattendues : la
+# commande git prend le relais
+ERREURS_LECTURE = (
+    ErreurObjets,
+    OSError,
+    ValueError,
+    IndexError,
+    struct.error,
+    zlib.error,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Commit:
+    """Champs d'un objet commit utiles au journal"""
+
+    sha1: str
+    parents: Tuple[str, ...]
+    auteur: str
+    email: str
+    date_auteur: datetime  # timezone-aware, fuseau de l'auteur
+    temps_commit: int  # date du committer, secondes depuis l'epoch
+    sujet: str
+
+
+def _fuseau(decalage: bytes) -> timezone:
+    """Fuseau d'une date git ("+0100")"""
+    signe = -1 if decalage.startswith(b"-") else 1
+    heures, minutes = int(decalage[1:3]), int(decalage[3:5])
+    return timezone(signe * timedelta(hours=heures, minutes=minutes))
+
+
+def _identite(ligne: bytes) -> Tuple[bytes, bytes, int, bytes]:
+    """Nom, email, date et fuseau d'une ligne author / committer"""
+    nom, _, reste = ligne.partition(b" <")
+    email, _, date_fuseau = reste.rpartition(b"> ")
+    temps, _, decalage = date_fuseau.partition(b" ")
+    return nom, email, int(temps), decalage or b"+0000"
+
+
+def _sujet(message: str) -> str:
+    """Sujet d'un message de commit (%s) : premier paragraphe sur une ligne"""
+    lignes = []
+    for ligne in message.lstrip("\n").split("\n"):
+        if not ligne.strip():
+            break
+        lignes.append(ligne.rstrip())
+    return " ".join(lignes)
+
+
+def parser_commit(sha1: str, contenu: bytes, superficiel: Set[str]) -> Commit:
+    """
+    Décode un objet commit
+
+    Args:
+        sha1: SHA1 du commit
+        contenu: Contenu de l'objet (sans l'en-tête "commit <taille>")
+        superficiel: Commits d'un clone superficiel, dont les parents sont absents
+    """
+    entetes, _, message = contenu.partition(b"\n\n")
+    parents: List[str] = []
+    auteur = committer = None
+    encodage = "utf-8"
+    for ligne in entetes.split(b"\n"):
+        if ligne.startswith(b"parent "):
+            parents.append(ligne[7:].decode("ascii"))
+        elif ligne.startswith(b"author "):
+            auteur = _identite(ligne[7:])
+        elif ligne.startswith(b"committer "):
+            committer = _identite(ligne[10:])
+        elif ligne.startswith(b"encoding "):
+            encodage = ligne[9:].decode("ascii", "replace")
+    if auteur is None or committer is None:
+        raise ErreurObjets(f"commit {sha1} sans auteur ou committer")
+    try:
+        texte = message.decode(encodage, "replace")
+    except LookupError:
+        texte = message.decode("utf-8", "replace")
+    nom, email, temps, decalage = auteur
+    return Commit(
+        sha1=sha1,
+        parents=() if sha1 in superficiel else tuple(parents),
+        auteur=nom.decode("utf-8", "replace"),
+        email=email.decode("utf-8", "replace"),
+        date_auteur=datetime.fromtimestamp(temps, _fuseau(decalage)),
+        temps_commit=committer[2],
+        sujet=_sujet(texte),
+    )
+
+
+def _lire_taille(donnees: bytes, position: int) -> Tuple[int, int]:
+    """Entier variable (7 bits par octet, poids faible en tête) d'un delta"""
+    valeur = decalage = 0
+    while True:
+        octet = donnees[position]
+        position += 1
+        valeur |= (octet & 0x7F) << decalage
+        decalage += 7
+        if not octet & 0x80:
+            return valeur, position
+
+
+def appliquer_delta(base: bytes, delta: bytes) -> bytes:
+    """Reconstruit un objet à partir de sa base et d'un delta de packfile"""
+    taille_base, position = _lire_taille(delta, 0)
+    taille_cible, position = _lire_taille(delta, position)
+    if taille_base != len(base):
+        raise ErreurObjets("delta appliqué à une base de taille inattendue")
+    cible = bytearray()
+    while position < len(delta):
+        instruction = delta[position]
+        position += 1
+        if instruction & 0x80:  # copie d'une plage de la base
+            debut = taille = 0
+            for bit in range(4):
+                if instruction & (1 << bit):
+                    debut |= delta[position] << (8 * bit)
+                    position += 1
+            for bit in range(3):
+                if instruction & (0x10 << bit):
+                    taille |= delta[position] << (8 * bit)
+                    position += 1
+            cible += base[debut : debut + (taille or 0x10000)]
+        elif instruction:  # insertion des octets suivants
+            cible += delta[position : position + instruction]
+            position += instruction
+        else:
+            raise ErreurObjets("instruction de delta invalide")
+    if len(cible) != taille_cible:
+        raise ErreurObjets("delta de taille inattendue")
+    return bytes(cible)
+
+
+class Pack:
+    """Packfile et son index (version 2), ouverts en mmap"""
+
+    def __init__(self, chemin_pack: str):
+        chemin_index = chemin_pack[:-5] + ".idx"
+        with open(chemin_index, "rb") as fichier:
+            self._index = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(chemin_pack, "rb") as fichier:
+            self._pack = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._index[:8] != b"\xfftOc\x00\x00\x00\x02":
+            raise ErreurObjets(f"{chemin_index}: index de pack non supporté")
+        self._fanout = struct.unpack_from(">256I", self._index, 8)
+        self.nombre = self._fanout[255]
+        self._noms = 8 + 256 * 4
+        self._decalages = self._noms + self.nombre * (20 + 4)
+        self._grands_decalages = self._decalages + self.nombre * 4
+
+    def position(self, sha1: bytes) -> Optional[int]:
+        """Position de l'objet dans le pack, None s'il n'y est pas"""
+        bas = self._fanout[sha1[0] - 1] if sha1[0] else 0
+        haut = self._fanout[sha1[0]]
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            debut = self._noms + milieu * 20
+            nom = self._index[debut : debut + 20]
+            if nom < sha1:
+                bas = milieu + 1
+            elif nom > sha1:
+                haut = milieu
+            else:
+                (decalage,) = struct.unpack_from(
+                    ">I", self._index, self._decalages + milieu * 4
+                )
+                if decalage & 0x80000000:
+                    (decalage,) = struct.unpack_from(
+                        ">Q",
+                        self._index,
+                        self._grands_decalages + (decalage & 0x7FFFFFFF) * 8,
+                    )
+                return decalage
+        return None
+
+    def _decompresser(self, position: int, taille: int) -> bytes:
+        """Décompresse les données zlib qui commencent à position"""
+        decompresseur = zlib.decompressobj()
+        morceaux = []
+        bloc = max(taille, 1024)
+        while not decompresseur.eof:
+            donnees = self._pack[position : position + bloc]
+            if not donnees:
+                raise ErreurObjets("pack tronqué")
+            morceaux.append(decompresseur.decompress(donnees))
+            position += len(donnees)
+        return b"".join(morceaux)
+
+    def objet(self, position: int, lire: "DepotObjets") -> Tuple[str, bytes]:
+        """
+        Type et contenu de l'objet à cette position, deltas résolus (la base
+        d'un REF_DELTA peut être dans un autre pack : elle est lue par lire)
+        """
+        debut_objet = position
+        octet = self._pack[position]
+        position += 1
+        type_objet = (octet >> 4) & 7
+        taille = octet & 0x0F
+        decalage = 4
+        while octet & 0x80:
+            octet = self._pack[position]
+            position += 1
+            taille |= (octet & 0x7F) << decalage
+            decalage += 7
+
+        if type_objet in TYPES_PACK:
+            return TYPES_PACK[type_objet], self._decompresser(position, taille)
+        if type_objet == OFS_DELTA:
+            octet = self._pack[position]
+            position += 1
+            recul = octet & 0x7F
+            while octet & 0x80:
+                octet = self._pack[position]
+                position += 1
+                recul = ((recul + 1) << 7) | (octet & 0x7F)
+            type_base, base = lire.objet_pack(self, debut_objet - recul)
+            return type_base, appliquer_delta(
+                base, self._decompresser(position, taille)
+            )
+        if type_objet == REF_DELTA:
+            sha1_base = self._pack[position : position + 20].hex()
+            type_base, base = lire.objet(sha1_base)
+            delta = self._decompresser(position + 20, taille)
+            return type_base, appliquer_delta(base, delta)
+        raise ErreurObjets(f"type d'objet de pack inconnu: {type_objet}")
+
+
+class GrapheCommits:
+    """
+    Fichier commit-graph (ou chaîne de fichiers) : parents, date et
+    génération de chaque commit sans décompresser son objet
+    """
+
+    def __init__(self, chemins: List[str]):
+        self._couches = []
+        self.nombre = 0
+        self.generation_v2 = True
+        for chemin in chemins:
+            with open(chemin, "rb") as fichier:
+                donnees = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+            if donnees[:4] != b"CGPH" or donnees[4] != 1 or donnees[5] != 1:
+                raise ErreurObjets(f"{chemin}: commit-graph non supporté")
+            chunks = {}
+            for i in range(donnees[6] + 1):
+                identifiant, position = struct.unpack_from(">4sQ", donnees, 8 + 12 * i)
+                chunks[identifiant] = position
+            if not all(chunk in chunks for chunk in (b"OIDF", b"OIDL", b"CDAT")):
+                raise ErreurObjets(f"{chemin}: chunk commit-graph manquant")
+            fanout = struct.unpack_from(">256I", donnees, chunks[b"OIDF"])
+            self.generation_v2 = self.generation_v2 and b"GDA2" in chunks
+            self._couches.append((donnees, chunks, fanout, self.nombre))
+            self.nombre += fanout[255]
+
+    def position(self, sha1: bytes) -> Optional[int]:
+        """Position globale du commit dans le graphe, None s'il n'y est pas"""
+        for donnees, chunks, fanout, base in self._couches:
+            bas = fanout[sha1[0] - 1] if sha1[0] else 0
+            haut = fanout[sha1[0]]
+            while bas < haut:
+                milieu = (bas + haut) // 2
+                debut = chunks[b"OIDL"] + milieu * 20
+                nom = donnees[debut : debut + 20]
+                if nom < sha1:
+                    bas = milieu + 1
+                elif nom > sha1:
+                    haut = milieu
+                else:
+                    return base + milieu
+        return None
+
+    def _couche(self, position: int):
+        for couche in self._couches:
+            if position < couche[3] + couche[2][255]:
+                return couche, position - couche[3]
+        raise ErreurObjets("position hors du commit-graph")
+
+    def sha1(self, position: int) -> str:
+        (donnees, chunks, _, _), locale = self._couche(position)
+        debut = chunks[b"OIDL"] + locale * 20
+        return donnees[debut : debut + 20].hex()
+
+    def noeud(self, position: int) -> Tuple[List[int], int, float]:
+        """Positions des parents, date du committer et génération du commit"""
+        (donnees, chunks, _, _), locale = self._couche(position)
+        parent1, parent2, haut, bas = struct.unpack_from(
+            ">III I", donnees, chunks[b"CDAT"] + locale * 36 + 20
+        )
+        temps = ((haut & 0x3) << 32) | bas
+        parents = []
+        if parent1 != GRAPHE_SANS_PARENT:
+            parents.append(parent1)
+        if parent2 & GRAPHE_PARENTS_MULTIPLES:
+            i = parent2 & ~GRAPHE_PARENTS_MULTIPLES
+            while True:
+                (arete,) = struct.unpack_from(">I", donnees, chunks[b"EDGE"] + 4 * i)
+                parents.append(arete & ~GRAPHE_PARENTS_MULTIPLES)
+                if arete & GRAPHE_PARENTS_MULTIPLES:
+                    break
+                i += 1
+        elif parent2 != GRAPHE_SANS_PARENT:
+            parents.append(parent2)
+
+        if self.generation_v2:
+            (ecart,) = struct.unpack_from(">I", donnees, chunks[b"GDA2"] + 4 * locale)
+            if ecart & 0x80000000:
+                (ecart,) = struct.unpack_from(
+                    ">Q", donnees, chunks[b"GDO2"] + 8 * (ecart & 0x7FFFFFFF)
+                )
+            generation = temps + ecart
+        else:
+            generation = haut >> 2
+        return parents, temps, generation
+
+
+class Mailmap:
+    """Correspondances d'identités d'un ou plusieurs fichiers mailmap"""
+
+    LIGNE = re.compile(r"^\s*([^<#]*?)\s*<([^>]*)>(?:\s*([^<#]*?)\s*<([^>]*)>)?")
+
+    def __init__(self):
+        self._par_email: Dict[str, Tuple[str, str]] = {}
+        self._par_identite: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def charger(self, chemin: str) -> None:
+        """
+        Ajoute les correspondances d'un fichier, prioritaires sur les précédentes
+
+        Comme git, les lignes sans nom de commit pour un même email se
+        complètent : chacune ne remplace que les champs qu'elle donne
+        ("Nom <c@x>" puis "<p@x> <c@x>" donnent Nom <p@x>). Une ligne avec nom
+        de commit remplace la correspondance de cette identité.
+        """
+        with open(chemin, encoding="utf-8", errors="replace") as fichier:
+            for ligne in fichier:
+                trouve = self.LIGNE.match(ligne)
+                if not trouve:
+                    continue
+                nom, email, nom_commit, email_commit = trouve.groups()
+                if email_commit is None:  # "Nom <email>" : corrige le nom
+                    email_commit, email = email, ""
+                if nom_commit:
+                    cle = (nom_commit.casefold(), email_commit.casefold())
+                    self._par_identite[cle] = (nom, email)
+                else:
+                    nom_actuel, email_actuel = self._par_email.get(
+                        email_commit.casefold(), ("", "")
+                    )
+                    self._par_email[email_commit.casefold()] = (
+                        nom or nom_actuel,
+                        email or email_actuel,
+                    )
+
+    def appliquer(self, nom: str, email: str) -> Tuple[str, str]:
+        """Nom et email canoniques d'une identité"""
+        correspondance = self._par_identite.get(
+            (nom.casefold(), email.casefold())
+        ) or self._par_email.get(email.casefold())
+        if correspondance is None:
+            return nom, email
+        return correspondance[0] or nom, correspondance[1] or email
+
+
+class DepotObjets:
+    """
+    Lecture directe de la base d'objets d'un dépôt git, sans lancer git :
+    références (fichiers et packed-refs), objets libres, packfiles et
+    commit-graph
+
+    Les dépôts SHA-256, reftable, avec grafts ou objets de remplacement
+    lèvent ErreurObjets : l'appelant utilise alors la commande git.
+    """
+
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+        self.git_dir = self._git_dir(repo_path)
+        commondir = os.path.join(self.git_dir, "commondir")
+        self.common_dir = self.git_dir
+        if os.path.exists(commondir):
+            with open(commondir, encoding="utf-8") as fichier:
+                self.common_dir = os.path.normpath(
+                    os.path.join(self.git_dir, fichier.read().strip())
+                )
+        self._verifier_format()
+
+        self.dossiers_objets = [os.path.join(self.common_dir, "objects")]
+        alternates = os.path.join(self.dossiers_objets[0], "info", "alternates")
+        if os.path.exists(alternates):
+            with open(alternates, encoding="utf-8") as fichier:
+                for ligne in fichier:
+                    ligne = ligne.strip()
+                    if ligne and not ligne.startswith("#"):
+                        self.dossiers_objets.append(
+                            os.path.normpath(
+                                os.path.join(self.dossiers_objets[0], ligne)
+                            )
+                        )
+        self.packs = [
+            Pack(os.path.join(dossier, "pack", nom))
+            for dossier in self.dossiers_objets
+            if os.path.isdir(os.path.join(dossier, "pack"))
+            for nom in sorted(os.listdir(os.path.join(dossier, "pack")))
+            if nom.endswith(".pack")
+            and os.path.exists(os.path.join(dossier, "pack", nom[:-5] + ".idx"))
+        ]
+        self.graphe = self._charger_graphe()
+
+        self.superficiel: Set[str] = set()
+        chemin_shallow = os.path.join(self.common_dir, "shallow")
+        if os.path.exists(chemin_shallow):
+            with open(chemin_shallow, encoding="ascii") as fichier:
+                self.superficiel = set(fichier.read().split())
+        self._commits: "OrderedDict[str, Commit]" = OrderedDict()
+        self._contenus: Optional[Dict[str, str]] = None
+
+    @staticmethod
+    def _git_dir(repo_path: str) -> str:
+        """Répertoire .git, ou celui désigné par un fichier .git (worktree, sous-module)"""
+        chemin = os.path.join(repo_path, ".git")
+        if os.path.isfile(chemin):
+            with open(chemin, encoding="utf-8") as fichier:
+                contenu = fichier.read().strip()
+            if not contenu.startswith("gitdir:"):
+                raise ErreurObjets(f"{chemin}: fichier .git invalide")
+            chemin = os.path.join(repo_path, contenu[len("gitdir:") :].strip())
+        if not os.path.isdir(chemin):
+            raise ErreurObjets(f"{repo_path}: répertoire .git introuvable")
+        return os.path.normpath(chemin)
+
+    def _verifier_format(self) -> None:
+        """Refuse les dépôts dont le format n'est pas lu directement"""
+        config = ""
+        chemin_config = os.path.join(self.common_dir, "config")
+        if os.path.exists(chemin_config):
+            with open(chemin_config, encoding="utf-8", errors="replace") as fichier:
+                config = fichier.read().lower()
+        if re.search(r"objectformat\s*=\s*(?!sha1)", config):
+            raise ErreurObjets("format d'objets autre que SHA-1")
+        if re.search(r"refstorage\s*=\s*(?!files)", config) or os.path.exists(
+            os.path.join(self.common_dir, "reftable")
+        ):
+            raise ErreurObjets("références reftable")
+        if os.path.exists(os.path.join(self.common_dir, "info", "grafts")):
+            raise ErreurObjets("grafts")
+        if os.path.isdir(os.path.join(self.common_dir, "refs", "replace")) and any(
+            fichiers
+            for _, _, fichiers in os.walk(
+                os.path.join(self.common_dir, "refs", "replace")
+            )
+        ):
+            raise ErreurObjets("objets de remplacement (refs/replace)")
+
+    def _charger_graphe(self) -> Optional[GrapheCommits]:
+        """commit-graph du dépôt (fichier unique ou chaîne), None s'il n'y en a pas"""
+        info = os.path.join(self.dossiers_objets[0], "info")
+        chaine = os.path.join(info, "commit-graphs", "commit-graph-chain")
+        try:
+            if os.path.exists(chaine):
+                with open(chaine, encoding="ascii") as fichier:
+                    return GrapheCommits(
+                        [
+                            os.path.join(info, "commit-graphs", f"graph-{nom}.graph")
+                            for nom in fichier.read().split()
+                        ]
+                    )
+            if os.path.exists(os.path.join(info, "commit-graph")):
+                return GrapheCommits([os.path.join(info, "commit-graph")])
+        except (OSError, ErreurObjets):
+            pass  # un commit-graph illisible ne sert qu'à accélérer : ignoré
+        return None
+
+    # ----- objets -----
+
+    def objet_pack(self, pack: Pack, position: int) -> Tuple[str, bytes]:
+        return pack.objet(position, self)
+
+    def objet(self, sha1: str) -> Tuple[str, bytes]:
+        """Type et contenu d'un objet, libre ou dans un pack"""
+        binaire = bytes.fromhex(sha1)
+        for pack in self.packs:
+            position = pack.position(binaire)
+            if position is not None:
+                return pack.objet(position, self)
+        for dossier in self.dossiers_objets:
+            chemin = os.path.join(dossier, sha1[:2], sha1[2:])
+            if os.path.exists(chemin):
+                with open(chemin, "rb") as fichier:
+                    donnees = zlib.decompress(fichier.read())
+                entete, _, contenu = donnees.partition(b"\x00")
+                return entete.split(b" ", 1)[0].decode("ascii"), contenu
+        raise ObjetAbsent(f"objet {sha1} introuvable")
+
+    def commit(self, sha1: str) -> Commit:
+        """Commit décodé (les TAILLE_MEMO_COMMITS derniers sont mémorisés)"""
+        commit = self._commits.get(sha1)
+        if commit is not None:
+            self._commits.move_to_end(sha1)
+            return commit
+        type_objet, contenu = self.objet(sha1)
+        if type_objet != "commit":
+            raise ErreurObjets(f"{sha1} n'est pas un commit ({type_objet})")
+        commit = parser_commit(sha1, contenu, self.superficiel)
+        self._commits[sha1] = commit
+        if len(self._commits) > TAILLE_MEMO_COMMITS:
+            self._commits.popitem(last=False)
+        return commit
+
+    def peler(self, sha1: str) -> str:
+        """Commit désigné par un SHA1, en déréférençant les tags annotés"""
+        while True:
+            type_objet, contenu = self.objet(sha1)
+            if type_objet == "commit":
+                return sha1
+            if type_objet != "tag":
+                raise ErreurObjets(f"{sha1} ne désigne pas un commit")
+            sha1 = contenu[7:47].decode("ascii")  # "object <sha1>"
+
+    # ----- références -----
+
+    def _contenus_references(self) -> Dict[str, str]:
+        """Contenu de chaque référence refs/... : SHA1 ou "ref: <cible>" """
+        if self._contenus is None:
+            contenus: Dict[str, str] = {}
+            packed = os.path.join(self.common_dir, "packed-refs")
+            if os.path.exists(packed):
+                with open(packed, encoding="utf-8") as fichier:
+                    for ligne in fichier:
+                        if ligne[:1] in ("#", "^") or not ligne.strip():
+                            continue
+                        sha1, nom = ligne.split()
+                        contenus[nom] = sha1
+            for racine in {self.common_dir, self.git_dir}:
+                for dossier, _, fichiers in os.walk(os.path.join(racine, "refs")):
+                    for nom_fichier in fichiers:
+                        chemin = os.path.join(dossier, nom_fichier)
+                        nom = os.path.relpath(chemin, racine).replace(os.sep, "/")
+                        with open(chemin, encoding="utf-8") as fichier:
+                            contenus[nom] = fichier.read().strip()
+            self._contenus = contenus
+        return self._contenus
+
+    def _contenu(self, nom: str) -> Optional[str]:
+        """Contenu d'une référence (HEAD, refs/...), None si elle n'existe pas"""
+        for racine in (self.git_dir, self.common_dir):
+            chemin = os.path.join(racine, nom)
+            if os.path.isfile(chemin):
+                with open(chemin, encoding="utf-8") as fichier:
+                    return fichier.read().strip()
+        return self._contenus_references().get(nom)
+
+    def _suivre(self, contenu: str, profondeur: int = 0) -> Optional[str]:
+        """SHA1 d'un contenu de référence, en suivant les références symboliques"""
+        if not contenu.startswith("ref: "):
+            return contenu or None
+        if profondeur > 5:
+            raise ErreurObjets(f"références symboliques en boucle: {contenu}")
+        cible = self._contenu(contenu[5:])
+        return self._suivre(cible, profondeur + 1) if cible else None
+
+    def references(self) -> Dict[str, str]:
+        """SHA1 de chaque référence refs/... (fichiers et packed-refs)"""
+        references = {}
+        for nom, contenu in self._contenus_references().items():
+            sha1 = self._suivre(contenu)
+            if sha1:
+                references[nom] = sha1
+        return references
+
+    def resoudre_nom(self, nom: str) -> Optional[str]:
+        """SHA1 désigné par un nom de référence ou un SHA1 complet, None si inconnu"""
+        if re.fullmatch(r"[0-9a-f]{40}", nom):
+            return nom
+        for prefixe in PREFIXES_REFERENCE:
+            contenu = self._contenu(prefixe + nom)
+            if contenu is not None:
+                return self._suivre(contenu)
+        return None
+
+    def resoudre(self, branches: List[str], peler: bool = True) -> List[str]:
+        """
+        Commits désignés par des branches ou options git log ("HEAD", "main",
+        "--all", "--branches=feat/*", "--tags", "--remotes"), triés et sans
+        doublon ; peler=False garde les tags annotés comme git rev-parse
+        """
+        sha1s = []
+        for branche in branches:
+            option, _, motif = branche.partition("=")
+            if branche == "--all":
+                sha1s += self.references().values()
+                sha1s.append(self.resoudre_nom("HEAD"))
+            elif option in OPTIONS_REFERENCES:
+                prefixe = OPTIONS_REFERENCES[option]
+                if motif and not any(c in motif for c in "*?["):
+                    motif += "/*"
+                sha1s += [
+                    sha1
+                    for nom, sha1 in self.references().items()
+                    if nom.startswith(prefixe)
+                    and fnmatch.fnmatchcase(nom[len(prefixe) :], motif or "*")
+                ]
+            elif (
+                branche.startswith("-")
+                or ".." in branche
+                or any(c in CARACTERES_REVISION for c in branche)
+            ):
+                raise ErreurObjets(f"révision non supportée: {branche}")
+            else:
+                sha1 = self.resoudre_nom(branche)
+                if sha1 is None:
+                    raise ErreurObjets(f"référence inconnue: {branche}")
+                sha1s.append(sha1)
+        if peler:
+            return sorted({self.peler(sha1) for sha1 in sha1s if sha1})
+        return sorted({sha1 for sha1 in sha1s if sha1})
+
+    # ----- parcours -----
+
+    def _noeud(self, sha1: str) -> Tuple[Tuple[str, ...], int, float]:
+        """
+        Parents, date du committer et génération (infinie hors commit-graph)
+
+        Un commit du commit-graph y est toujours lu, même déjà décodé : sa
+        génération ordonne le parcours par rapport à ses descendants.
+        """
+        if self.graphe is not None:
+            position = self.graphe.position(bytes.fromhex(sha1))
+            if position is not None and sha1 not in self.superficiel:
+                parents, temps, generation = self.graphe.noeud(position)
+                return (
+                    tuple(self.graphe.sha1(parent) for parent in parents),
+                    temps,
+                    generation,
+                )
+        commit = self.commit(sha1)
+        return commit.parents, commit.temps_commit, GENERATION_INFINIE
+
+    def parcourir(
+        self,
+        depart: List[str],
+        exclus: Optional[List[str]] = None,
+        depuis: Optional[int] = None,
+    ) -> Iterator[Tuple[str, int]]:
+        """
+        Produit (SHA1, date du committer) des commits accessibles depuis
+        depart mais pas depuis exclus, comme git log depart --not exclus
+
+        Les commits sont produits au fil du parcours, du plus récent au plus
+        ancien : par génération décroissante d'un commit-graph v2 (date
+        corrigée, jamais inférieure à celle d'un ancêtre), sinon par date du
+        committer. Le parcours s'arrête dès que seuls des commits exclus
+        restent à voir. Un commit antérieur à depuis (timestamp) n'est pas
+        produit et ses ancêtres ne sont pas visités, comme avec git log
+        --since : sa génération v2 sert de date si elle est connue. Sans
+        générations v2, un décalage d'horloge peut produire en trop un commit
+        exclu, jamais en oublier.
+        """
+        marques: Dict[str, bool] = {}  # SHA1 -> exclu
+        # SHA1 -> (parents, date comparée à depuis) des commits en file
+        en_file: Dict[str, Tuple[Tuple[str, ...], float]] = {}
+        file: List[Tuple[float, int, str]] = []
+        interessants_en_file = 0
+        generation_v2 = self.graphe is not None and self.graphe.generation_v2
+
+        def ajouter(sha1: str, exclu: bool) -> None:
+            nonlocal interessants_en_file
+            if sha1 in marques:
+                if exclu and not marques[sha1]:
+                    marques[sha1] = True
+                    if sha1 in en_file:
+                        interessants_en_file -= 1
+                return
+            marques[sha1] = exclu
+            try:
+                parents, temps, generation = self._noeud(sha1)
+            except ObjetAbsent:
+                if exclu:  # commit connu disparu : rien à exclure
+                    return
+                raise
+            if not generation_v2:
+                generation = GENERATION_INFINIE  # générations v1 : ordre des dates
+            date = generation if generation != GENERATION_INFINIE else temps
+            en_file[sha1] = (parents, date)
+            if not exclu:
+                interessants_en_file += 1
+            heapq.heappush(file, (-generation, -temps, sha1))
+
+        # les sommets peuvent être des tags annotés (cf. resoudre(peler=False))
+        for sha1 in exclus or []:
+            try:
+                ajouter(self.peler(sha1), True)
+            except ObjetAbsent:
+                continue
+        for sha1 in depart:
+            ajouter(self.peler(sha1), False)
+
+        while file and interessants_en_file:
+            _, temps, sha1 = heapq.heappop(file)
+            parents, date = en_file.pop(sha1)
+            exclu = marques[sha1]
+            if not exclu:
+                interessants_en_file -= 1
+                if depuis is not None and date < depuis:
+                    continue  # lui et ses ancêtres sont antérieurs à depuis
+                yield sha1, -temps
+            for parent in parents:
+                ajouter(parent, exclu)
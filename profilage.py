@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def pic_memoire_cumule_mo() -> Optional[float]:
+    """
+    Pic de mémoire résidente (RSS) du processus depuis son lancement, en Mo,
+    None si indisponible
+    """
+    if resource is None:
+        return None
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets sous Linux
+    return pic / (1024 * 1024) if sys.platform == "darwin" else pic / 1024
+
+
+def mesurer_source(nom: str, fonction: Callable, *args) -> Tuple[Any, Dict]:
+    """
+    Exécute fonction(*args) et mesure son temps réel et le temps CPU du
+    thread qui l'exécute (sources lues en parallèle, dans un thread ou un
+    processus de travail)
+
+    Returns:
+        tuple: (résultat, mesure)
+    """
+    debut_reel = time.perf_counter()
+    debut_cpu = time.thread_time()
+    resultat = fonction(*args)
+    mesure = {
+        "etape": nom,
+        "enregistrements": None,
+        "temps_reel_s": round(time.perf_counter() - debut_reel, 3),
+        "temps_cpu_s": round(time.thread_time() - debut_cpu, 3),
+    }
+    return resultat, mesure
+
+
+class Profileur:
+    """
+    Mesure chaque étape du traitement : temps réel, temps CPU du processus et
+    de ses processus fils (git, workers), mémoire et nombre d'enregistrements
+    produits
+
+    ru_maxrss ne donne que le pic depuis le lancement du processus :
+    "pic_memoire_cumule_mo" est ce pic à la fin de l'étape, toutes étapes
+    précédentes comprises, et "hausse_pic_memoire_mo" ce dont l'étape l'a
+    relevé (0 si elle est restée sous le pic des étapes précédentes).
+    """
+
+    def __init__(self):
+        self.etapes: List[Dict] = []
+        self._debut = time.perf_counter()
+
+    @contextmanager
+    def etape(self, nom: str) -> Iterator[Dict]:
+        """
+        Mesure le bloc de code comme une étape
+
+        Le dictionnaire produit peut recevoir le nombre d'enregistrements:
+            with profileur.etape("mails") as mesure:
+                mesure["enregistrements"] = len(mails)
+        """
+        mesure: Dict = {"etape": nom, "enregistrements": None}
+        debut_reel = time.perf_counter()
+        debut_cpu = os.times()
+        pic_avant = pic_memoire_cumule_mo()
+        try:
+            yield mesure
+        finally:
+            fin_cpu = os.times()
+            mesure["temps_reel_s"] = round(time.perf_counter() - debut_reel, 3)
+            mesure["temps_cpu_s"] = round(
+                fin_cpu.user + fin_cpu.system - debut_cpu.user - debut_cpu.system, 3
+            )
+            mesure["temps_cpu_fils_s"] = round(
+                fin_cpu.children_user
+                + fin_cpu.children_system
+                - debut_cpu.children_user
+                - debut_cpu.children_system,
+                3,
+            )
+            pic = pic_memoire_cumule_mo()
+            mesure["pic_memoire_cumule_mo"] = pic
+            mesure["hausse_pic_memoire_mo"] = (
+                None if pic is None else round(pic - pic_avant, 1)
+            )
+            self.etapes.append(mesure)
+
+    def ajouter(self, mesure: Dict) -> None:
+        """Ajoute une mesure prise ailleurs (ex: mesurer_source)"""
+        self.etapes.append(mesure)
+
+    def resume(self) -> Dict:
+        """Résumé de toutes les étapes mesurées"""
+        return {
+            "temps_total_s": round(time.perf_counter() - self._debut, 3),
+            "pic_memoire_cumule_mo": pic_memoire_cumule_mo(),
+            "etapes": self.etapes,
+        }
+
+    def ecrire(self, chemin: str) -> None:
+        """Écrit le résumé JSON dans un fichier, ou sur la sortie standard si "-" """
+        texte = json.dumps(self.resume(), ensure_ascii=False, indent=2)
+        if chemin == "-":
+            print(texte)
+        else:
+            with open(chemin, "w", encoding="utf-8") as fichier:
+                fichier.write(texte)
@@ -0,0 +1,132 @@
+"""
+Agrégation par jour : le moteur par colonnes (build_daily_report_pandas)
+comparé au moteur python (build_daily_report), à graine aléatoire égale
+"""
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+import constants
+import extract_activity as ea
+import git_stat as git
+from benchmark import generer_evenements
+from fuseau_horaire import PARIS, UTC
+
+
+def mail(envoi: datetime, sujet: str) -> dict:
+    """Mail envoyé à envoi"""
+    return {
+        "type": "mail",
+        "subject": sujet,
+        "sender": "Moi",
+        "date Redaction": envoi
+        - timedelta(minutes=constants.DUREE_REDACTION_MAIL_MINUTES),
+        "date Envoi": envoi,
+    }
+
+
+def commit(date_heure: datetime, message: str, fichiers=1) -> git.CommitInfo:
+    """Commit du même auteur"""
+    return git.CommitInfo(
+        sha1_complet=f"{abs(hash(message)):040x}"[:40],
+        auteur="Moi",
+        email="moi@exemple.fr",
+        date_heure=date_heure,
+        message=message,
+        depot="depot",
+        fichiers=fichiers,
+    )
+
+
+class TestMoteursAgregation(unittest.TestCase):
+    def comparer(self, *evenements) -> None:
+        """Les deux moteurs donnent le même rapport (valeurs et types)"""
+        random.seed(0)
+        attendu = ea.build_daily_report(*evenements)
+        random.seed(0)
+        obtenu = ea.build_daily_report_pandas(*evenements)
+        self.assertTrue(
+            attendu.equals(obtenu),
+            attendu.compare(obtenu) if attendu.shape == obtenu.shape else None,
+        )
+
+    def test_evenements_generes(self):
+        self.comparer(*generer_evenements(120))
+
+    def test_sans_evenement(self):
+        self.comparer([], [], [], [], [])
+        self.comparer([], [], [], [], None)
+
+    def test_cas_limites(self):
+        seuil = datetime.combine(
+            datetime(2022, 3, 7).date(), constants.SEUIL_MAIL, tzinfo=PARIS
+        )
+        mails = [
+            # juste avant, exactement et juste après le seuil, un jour chacun
+            mail(seuil - timedelta(microseconds=1), "avant"),
+            mail(seuil + timedelta(days=1), "seuil"),
+            mail(seuil + timedelta(days=2, microseconds=1), "après"),
+            # autre fuseau : heure et jour locaux du datetime
+            mail(datetime(2022, 3, 4, 23, 30, tzinfo=UTC), "utc"),
+            # hors période
+            mail(constants.START_DATE - timedelta(seconds=1), "avant période"),
+            mail(constants.END_DATE + timedelta(seconds=1), "après période"),
+            # jour férié, passage à l'heure d'été
+            mail(datetime(2022, 5, 1, 10, tzinfo=PARIS), "férié"),
+            mail(datetime(2022, 3, 27, 3, 30, tzinfo=PARIS), "heure d'été"),
+        ]
+        reunions = [
+            {
+                "start_time": datetime(2022, 3, 9, 22, tzinfo=PARIS),
+                "end_time": datetime(2022, 3, 10, tzinfo=PARIS),
+                "subject": "jusqu'à minuit",
+            },
+            {
+                "start_time": datetime(2022, 3, 10, tzinfo=PARIS),
+                "end_time": datetime(2022, 3, 10, tzinfo=PARIS),
+                "subject": "journée entière",
+            },
+            {
+                "start_time": datetime(2022, 3, 11, 6, tzinfo=PARIS),
+                "end_time": datetime(2022, 3, 11, 7, tzinfo=PARIS),
+                "subject": "avant le seuil",
+            },
+            {
+                "start_time": datetime(2022, 3, 23, 23, tzinfo=PARIS),
+                "end_time": datetime(2022, 3, 24, 8, tzinfo=PARIS),
+                "subject": "de nuit",
+            },
+        ]
+        commits = [
+            # commencé la veille, taille inconnue, même date
+            commit(datetime(2022, 3, 14, 0, 20, tzinfo=PARIS), "minuit\x01"),
+            commit(datetime(2022, 3, 15, 9, tzinfo=PARIS), "inconnu", None),
+            commit(datetime(2022, 3, 15, 9, tzinfo=PARIS), "même date"),
+        ]
+        jira = [
+            {
+                "type": "worklog",
+                "start_time": datetime(2022, 3, 16, 23, tzinfo=PARIS),
+                "end_time": datetime(2022, 3, 17, 1, tzinfo=PARIS),
+                "subject": "PRJ-1 passe minuit",
+            },
+            {
+                "type": "worklog",
+                "start_time": datetime(2022, 3, 21, 22, tzinfo=PARIS),
+                "end_time": datetime(2022, 3, 22, 7, tzinfo=PARIS),
+                "subject": "PRJ-3 nuit entière",
+            },
+        ]
+        issues = [
+            {
+                "Issue key": "PRJ-2",
+                "Summary": "nuit",
+                "date Creation": datetime(2022, 3, 18, 0, 10, tzinfo=PARIS),
+            }
+        ]
+        self.comparer(mails, reunions, issues, commits, jira)
+
+
+if __name__ == "__main__":
+    unittest.main()
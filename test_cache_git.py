@@ -0,0 +1,88 @@
+"""
+Synchronisation du cache des commits (synchroniser_cache_commits) quand
+START_DATE (depuis) change entre deux exécutions
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import extract_activity as ea
+import git_stat as git
+from cache_git import CacheCommits
+from fuseau_horaire import PARIS
+from test_objets_git import ENVIRONNEMENT_GIT, commiter, creer_depot
+
+FIN = datetime(2030, 1, 1, tzinfo=PARIS)
+
+
+class TestCacheDepuis(unittest.TestCase):
+    def setUp(self):
+        environnement = mock.patch.dict(os.environ, ENVIRONNEMENT_GIT)
+        environnement.start()
+        self.addCleanup(environnement.stop)
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.depot = os.path.join(dossier.name, "depot")
+        creer_depot(self.depot)
+        self.cache = CacheCommits(os.path.join(dossier.name, "cache.db"))
+        self.addCleanup(self.cache.close)
+
+    def synchroniser(self, depuis: datetime) -> int:
+        analyseur = git.GitCommitAnalyzer(self.depot, backend="objets")
+        return ea.synchroniser_cache_commits(
+            analyseur, self.depot, self.cache, ["--all"], depuis=depuis
+        )
+
+    def sha1s(self, depuis: datetime) -> list:
+        return [c.sha1_complet for c in self.cache.commits(self.depot, depuis, FIN)]
+
+    def attendus(self, depuis: datetime) -> list:
+        """Commits de la période lus sans cache"""
+        analyseur = git.GitCommitAnalyzer(self.depot, backend="git")
+        commits = analyseur.iter_commits_depuis(None, ["--all"], depuis=depuis)
+        return [
+            c.sha1_complet
+            for c in sorted(commits, key=lambda c: c.timestamp)
+            if c.date_heure >= depuis
+        ]
+
+    def test_depuis_posterieur(self):
+        janvier = datetime(2022, 1, 1, tzinfo=PARIS)
+        mars = datetime(2022, 3, 2, tzinfo=PARIS)
+        self.assertGreater(self.synchroniser(janvier), 0)
+        # date postérieure : pas de relecture, la période est filtrée en mémoire
+        self.assertEqual(self.synchroniser(mars), 0)
+        self.assertEqual(self.cache.get_depuis(self.depot), janvier)
+        self.assertEqual(self.sha1s(mars), self.attendus(mars))
+
+        # les nouveaux commits sont lus depuis la date du cache
+        commiter(
+            self.depot,
+            "Jean Dupont",
+            "jean@exemple.fr",
+            "2022-02-01T10:00:00+01:00",
+            "ancien",
+        )
+        self.assertEqual(self.synchroniser(mars), 1)
+        self.assertEqual(self.cache.get_depuis(self.depot), janvier)
+        self.assertEqual(self.sha1s(janvier), self.attendus(janvier))
+
+    def test_depuis_anterieur(self):
+        janvier = datetime(2022, 1, 1, tzinfo=PARIS)
+        self.synchroniser(janvier)
+        # date antérieure à celle du cache : relecture complète
+        ancien = datetime(2021, 1, 1, tzinfo=PARIS)
+        self.assertEqual(self.synchroniser(ancien), len(self.attendus(ancien)))
+        self.assertEqual(self.cache.get_depuis(self.depot), ancien)
+        self.assertEqual(self.sha1s(ancien), self.attendus(ancien))
+        # tout l'historique
+        self.assertGreater(self.synchroniser(None), 0)
+        self.assertIsNone(self.cache.get_depuis(self.depot))
+        self.assertEqual(self.synchroniser(janvier), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
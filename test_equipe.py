@@ -0,0 +1,96 @@
+"""
+Sélection de l'activité de chaque membre de l'équipe dans les sources
+partagées, par identité (lire_equipe, indexer_equipe)
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import extract_activity as ea
+import git_stat as git
+from equipe import lire_equipe
+from fuseau_horaire import PARIS
+
+EQUIPE = [
+    {
+        "nom": "dlerat",
+        "emails": ["Damien Lerat"],
+        "git": ["dlerat@exemple.fr"],
+        "proprietaire": True,
+    },
+    {"nom": "alima", "emails": ["Ana Lima", "ana@exemple.fr"]},
+]
+
+
+def commit(auteur: str, email: str, message: str) -> git.CommitInfo:
+    """Commit du 3 janvier 2022"""
+    return git.CommitInfo(
+        sha1_complet=f"{abs(hash(message)):040x}"[:40],
+        auteur=auteur,
+        email=email,
+        date_heure=datetime(2022, 1, 3, 10, tzinfo=PARIS),
+        message=message,
+        depot="depot",
+    )
+
+
+class TestEquipe(unittest.TestCase):
+    def setUp(self):
+        fichier = tempfile.NamedTemporaryFile(
+            "w", suffix=".json", encoding="utf-8", delete=False
+        )
+        with fichier:
+            json.dump(EQUIPE, fichier)
+        self.addCleanup(os.remove, fichier.name)
+        with self.assertLogs("equipe", "WARNING") as journal:
+            self.utilisateurs = {u.nom: u for u in lire_equipe(fichier.name)}
+        # une adresse dans "emails" ne reconnaît aucun mail
+        self.assertEqual(len(journal.output), 1)
+        self.assertIn("ana@exemple.fr", journal.output[0])
+
+    def test_identites(self):
+        dlerat = self.utilisateurs["dlerat"]
+        self.assertEqual(dlerat.emails, ("Damien Lerat",))
+        self.assertEqual(dlerat.git, ("dlerat@exemple.fr", "Damien Lerat"))
+        self.assertEqual(dlerat.jira, ("Damien Lerat",))
+        self.assertTrue(dlerat.proprietaire)
+        self.assertFalse(self.utilisateurs["alima"].proprietaire)
+
+    def test_selection_commits(self):
+        commits = [
+            commit("Damien Lerat", "dlerat@exemple.fr", "par email"),
+            commit("Damien Lerat", "damien@perso.fr", "par nom"),
+            commit("Ana Lima", "ana@exemple.fr", "ana"),
+            commit("Damien Leratier", "autre@exemple.fr", "autre"),
+        ]
+        index = ea.indexer_equipe(
+            {"emails": [], "commits": commits, "issues": [], "jira": []}
+        )
+        selection = index.selection("commits", self.utilisateurs["dlerat"].git)
+        self.assertEqual([c.message for c in selection], ["par email", "par nom"])
+        # la regex git reconnaît les mêmes identités que l'index
+        self.assertEqual(
+            git.regex_auteurs(list(self.utilisateurs["dlerat"].git)),
+            "<dlerat@exemple\\.fr>|^Damien Lerat <",
+        )
+        selection = index.selection("commits", self.utilisateurs["alima"].git)
+        self.assertEqual([c.message for c in selection], ["ana"])
+
+    def test_selection_mails(self):
+        mails = [
+            {"sender": "Damien Lerat", "subject": "nom"},
+            {"sender": "damien lerat ", "subject": "casse"},
+            {"sender": "Ana Lima", "subject": "ana"},
+        ]
+        index = ea.indexer_equipe(
+            {"emails": mails, "commits": [], "issues": [], "jira": []}
+        )
+        selection = index.selection("emails", self.utilisateurs["dlerat"].emails)
+        self.assertEqual([m["subject"] for m in selection], ["nom", "casse"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,376 @@
+"""
+Lecture directe de la base d'objets comparée à la commande git, sur des
+dépôts créés pour le test : objets libres, packfiles avec commit-graph,
+chaîne de commit-graph et worktree
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import git_stat as git
+from fuseau_horaire import PARIS
+from objets_git import DepotObjets
+
+# configuration de l'utilisateur ignorée (diff.renames, mailmap.file...)
+ENVIRONNEMENT_GIT = {
+    "GIT_CONFIG_NOSYSTEM": "1",
+    "GIT_CONFIG_GLOBAL": os.devnull,
+    "GIT_AUTHOR_NAME": "Intégration",
+    "GIT_AUTHOR_EMAIL": "ci@exemple.fr",
+    "GIT_COMMITTER_NAME": "Intégration",
+    "GIT_COMMITTER_EMAIL": "ci@exemple.fr",
+}
+# les deux dernières lignes se complètent : J. Dupontel <jdupontel@exemple.fr>
+MAILMAP = (
+    "Ana Lima <ana@exemple.fr> <ana@ancien.fr>\n"
+    "J. Dupontel <xjean@exemple.fr>\n"
+    "<jdupontel@exemple.fr> <xjean@exemple.fr>\n"
+)
+# commits avant et après COUPURE, fuseaux différents, noms proches
+COMMITS = [
+    ("Jean Dupont", "jean@exemple.fr", "2021-12-30T18:00:00+01:00"),
+    ("Jean Dupontel", "xjean@exemple.fr", "2021-12-31T09:00:00-05:00"),
+    ("ana", "ana@ancien.fr", "2022-01-03T08:30:00+05:30"),
+    ("Jean Dupont", "jean@exemple.fr", "2022-01-04T23:45:00+01:00"),
+    ("Ana Lima", "ana@exemple.fr", "2022-02-10T12:00:00+00:00"),
+]
+COUPURE = datetime(2022, 1, 1, tzinfo=PARIS)
+
+
+def executer_git(depot: str, *arguments: str, **env) -> str:
+    """Sortie d'une commande git dans le dépôt"""
+    return subprocess.run(
+        ["git", *arguments],
+        cwd=depot,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, **env},
+    ).stdout
+
+
+def commiter(depot: str, nom: str, email: str, date: str, message: str) -> None:
+    """Commit de tout l'index, dates d'auteur et de committer identiques"""
+    executer_git(depot, "add", "-A")
+    executer_git(
+        depot,
+        "commit",
+        "-q",
+        "--allow-empty",
+        "-m",
+        message,
+        GIT_AUTHOR_NAME=nom,
+        GIT_AUTHOR_EMAIL=email,
+        GIT_AUTHOR_DATE=date,
+        GIT_COMMITTER_DATE=date,
+    )
+
+
+def ecrire(depot: str, fichier: str, lignes: int, prefixe: str = "ligne") -> None:
+    with open(os.path.join(depot, fichier), "w", encoding="utf-8") as sortie:
+        sortie.writelines(f"{prefixe} {i}\n" for i in range(lignes))
+
+
+def creer_depot(depot: str) -> None:
+    """
+    Historique de test : commit racine, auteurs regroupés par le mailmap,
+    renommage avec modification, branche fusionnée, tag annoté, branche
+    "parallele" plus récente partant d'un ancien commit, jamais fusionnée
+    """
+    executer_git(os.path.dirname(depot), "init", "-q", "-b", "main", depot)
+    with open(os.path.join(depot, ".mailmap"), "w", encoding="utf-8") as sortie:
+        sortie.write(MAILMAP)
+    for i, (nom, email, date) in enumerate(COMMITS):
+        ecrire(depot, f"fichier{i}.txt", 10 * (i + 1))
+        commiter(depot, nom, email, date, f"commit {i}\n\ncorps du message")
+
+    executer_git(depot, "mv", "fichier0.txt", "renomme.txt")
+    ecrire(depot, "renomme.txt", 12)
+    commiter(
+        depot,
+        "Jean Dupont",
+        "jean@exemple.fr",
+        "2022-03-01T10:00:00+01:00",
+        "renommage",
+    )
+
+    executer_git(depot, "checkout", "-q", "-b", "fonction")
+    ecrire(depot, "fichier1.txt", 5, "modifiée")
+    commiter(depot, "ana", "ana@ancien.fr", "2022-03-02T10:00:00+01:00", "fonction")
+    executer_git(depot, "checkout", "-q", "main")
+    ecrire(depot, "fichier2.txt", 40)
+    commiter(
+        depot, "Jean Dupontel", "xjean@exemple.fr", "2022-03-03T10:00:00+01:00", "suite"
+    )
+    executer_git(
+        depot,
+        "merge",
+        "-q",
+        "--no-ff",
+        "-m",
+        "fusion",
+        "fonction",
+        GIT_AUTHOR_DATE="2022-03-04T10:00:00+01:00",
+        GIT_COMMITTER_DATE="2022-03-04T10:00:00+01:00",
+    )
+    executer_git(
+        depot,
+        "tag",
+        "-a",
+        "-m",
+        "version",
+        "v1",
+        GIT_COMMITTER_DATE="2022-03-04T11:00:00+01:00",
+    )
+    executer_git(depot, "checkout", "-q", "-b", "parallele", "HEAD~4")
+    ecrire(depot, "parallele.txt", 8)
+    commiter(depot, "ana", "ana@ancien.fr", "2022-06-01T10:00:00+02:00", "parallèle")
+    executer_git(depot, "checkout", "-q", "main")
+
+
+def empaqueter(depot: str) -> str:
+    """Objets dans un packfile, commit-graph (générations v2) écrit"""
+    executer_git(depot, "gc", "-q")
+    executer_git(depot, "commit-graph", "write", "--reachable")
+    return depot
+
+
+def chainer(depot: str) -> str:
+    """Commit-graph en chaîne de deux fichiers, le second sans les anciens"""
+    empaqueter(depot)
+    executer_git(depot, "commit-graph", "write", "--reachable", "--split")
+    ecrire(depot, "fichier3.txt", 7, "chaîne")
+    commiter(depot, "Ana Lima", "ana@exemple.fr", "2022-04-01T10:00:00+02:00", "chaîne")
+    executer_git(depot, "commit-graph", "write", "--reachable", "--split=no-merge")
+    return depot
+
+
+def ajouter_worktree(depot: str) -> str:
+    """Worktree d'une branche : .git y est un fichier gitdir"""
+    worktree = depot + "-worktree"
+    executer_git(depot, "worktree", "add", "-q", "-b", "travail", worktree)
+    ecrire(worktree, "fichier4.txt", 3, "worktree")
+    commiter(
+        worktree,
+        "Jean Dupont",
+        "jean@exemple.fr",
+        "2022-05-01T10:00:00+02:00",
+        "worktree",
+    )
+    return worktree
+
+
+def champs(commits) -> list:
+    """Champs comparés des commits, dans un ordre indépendant des égalités de date"""
+    return sorted(
+        (
+            commit.sha1_complet,
+            commit.auteur,
+            commit.email,
+            commit.date_heure,
+            commit.message,
+            commit.fichiers,
+            commit.insertions,
+            commit.suppressions,
+        )
+        for commit in commits
+    )
+
+
+@unittest.skipIf(shutil.which("git") is None, "git n'est pas installé")
+class ComparaisonObjetsGit:
+    """Tests communs, le dépôt étant préparé par la sous-classe (preparer)"""
+
+    preparer = staticmethod(lambda depot: depot)
+
+    @classmethod
+    def setUpClass(cls):
+        environnement = mock.patch.dict(os.environ, ENVIRONNEMENT_GIT)
+        environnement.start()
+        cls.addClassCleanup(environnement.stop)
+        dossier = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(dossier.cleanup)
+        depot = os.path.join(dossier.name, "depot")
+        creer_depot(depot)
+        cls.depot = cls.preparer(depot)
+
+    def analyseurs(self, diffstat: bool = False):
+        objets = git.GitCommitAnalyzer(self.depot, diffstat=diffstat, backend="objets")
+        commande = git.GitCommitAnalyzer(self.depot, diffstat=diffstat, backend="git")
+        self.assertIsNotNone(objets._objets, "lecture directe indisponible")
+        return objets, commande
+
+    def assertMemesCommits(self, objets, commande, lecture) -> None:
+        self.assertEqual(champs(lecture(objets)), champs(lecture(commande)))
+        # aucun repli silencieux sur la commande git
+        self.assertIsNotNone(objets._objets)
+
+    def test_objets_commit(self):
+        depot = DepotObjets(self.depot)
+        sortie = executer_git(
+            self.depot,
+            "log",
+            "--all",
+            "--format=%H%x00%P%x00%an%x00%ae%x00%aI%x00%ct%x00%s",
+        )
+        for ligne in sortie.splitlines():
+            sha1, parents, nom, email, date, temps, sujet = ligne.split("\x00")
+            commit = depot.commit(sha1)
+            self.assertEqual(commit.parents, tuple(parents.split()))
+            self.assertEqual((commit.auteur, commit.email), (nom, email))
+            self.assertEqual(commit.date_auteur, datetime.fromisoformat(date))
+            self.assertEqual(commit.temps_commit, int(temps))
+            self.assertEqual(commit.sujet, sujet)
+
+    def test_parcours(self):
+        depot = DepotObjets(self.depot)
+        tous = {sha1 for sha1, _ in depot.parcourir(depot.resoudre(["--all"]))}
+        self.assertEqual(
+            tous, set(executer_git(self.depot, "rev-list", "--all").split())
+        )
+
+        exclus = depot.resoudre(["fonction"])
+        nouveaux = {
+            sha1 for sha1, _ in depot.parcourir(depot.resoudre(["HEAD"]), exclus)
+        }
+        attendus = executer_git(self.depot, "rev-list", "HEAD", "--not", *exclus)
+        self.assertEqual(nouveaux, set(attendus.split()))
+
+    def test_parcours_depuis(self):
+        depot = DepotObjets(self.depot)
+        depuis = int(COUPURE.timestamp())
+        recents = {
+            sha1
+            for sha1, temps in depot.parcourir(depot.resoudre(["--all"]), depuis=depuis)
+            if temps >= depuis
+        }
+        attendus = executer_git(self.depot, "rev-list", "--all", f"--since={depuis}")
+        self.assertEqual(recents, set(attendus.split()))
+        self.assertTrue(recents)
+
+    def test_parcours_depuis_sans_historique_ancien(self):
+        # avec ou sans commit-graph, rien n'est décodé au-delà des parents
+        # des commits retenus
+        depot = DepotObjets(self.depot)
+        depuis = int(datetime(2022, 3, 1, tzinfo=PARIS).timestamp())
+        with mock.patch.object(depot, "commit", wraps=depot.commit) as decodage:
+            recents = [
+                sha1
+                for sha1, temps in depot.parcourir(
+                    depot.resoudre(["--all"]), depuis=depuis
+                )
+                if temps >= depuis
+            ]
+        limite = set(recents)
+        for sha1 in recents:
+            limite.update(DepotObjets(self.depot).commit(sha1).parents)
+        decodes = {appel.args[0] for appel in decodage.call_args_list}
+        self.assertLessEqual(decodes, limite)
+        self.assertTrue(recents)
+
+    def test_journal(self):
+        objets, commande = self.analyseurs()
+        self.assertMemesCommits(
+            objets, commande, lambda a: a.iter_commits_depuis(None, ["--all"])
+        )
+        self.assertMemesCommits(
+            objets,
+            commande,
+            lambda a: a.get_commits_par_date(
+                "2022-01-01", "2022-12-31", branche="--all"
+            ),
+        )
+        self.assertEqual(objets.get_tips(["--all"]), commande.get_tips(["--all"]))
+        self.assertEqual(objets.get_statistiques(), commande.get_statistiques())
+
+    def test_analyseur_reutilise(self):
+        # commits décodés par une première lecture, puis parcours avec exclusion
+        objets, commande = self.analyseurs()
+        exclus = objets.get_tips("parallele")
+        objets.get_commits_par_date("2020-01-01", "2030-12-31")
+        self.assertMemesCommits(
+            objets, commande, lambda a: a.iter_commits_depuis(exclus, "HEAD")
+        )
+
+    def test_journal_depuis(self):
+        objets, commande = self.analyseurs()
+        lecture = lambda a: a.iter_commits_depuis(None, ["--all"], depuis=COUPURE)
+        self.assertMemesCommits(objets, commande, lecture)
+        self.assertTrue(all(c.date_heure >= COUPURE for c in lecture(objets)))
+
+    def test_journal_diffstat(self):
+        objets, commande = self.analyseurs(diffstat=True)
+        self.assertMemesCommits(
+            objets, commande, lambda a: a.iter_commits_depuis(None, ["--all"])
+        )
+        self.assertMemesCommits(
+            objets,
+            commande,
+            lambda a: a.iter_commits_depuis(None, "HEAD", depuis=COUPURE),
+        )
+        self.assertTrue(any(c.lignes for c in objets.iter_commits_depuis(None, "HEAD")))
+
+    def test_diffstat_sans_git(self):
+        objets, commande = self.analyseurs(diffstat=True)
+        with tempfile.TemporaryDirectory() as vide, mock.patch.dict(
+            os.environ, {"PATH": vide}
+        ):
+            commits = list(objets.iter_commits_depuis(None, ["--all"]))
+        self.assertEqual(
+            sorted(c.sha1_complet for c in commits),
+            sorted(
+                c.sha1_complet for c in commande.iter_commits_depuis(None, ["--all"])
+            ),
+        )
+        # tailles non mesurées : durée par défaut des commits
+        self.assertTrue(all(c.fichiers is None for c in commits))
+        self.assertFalse(objets.diffstat)
+
+    def test_auteurs_ancres(self):
+        objets, commande = self.analyseurs()
+        for identites, attendus in (
+            (["jean@exemple.fr"], {"Jean Dupont"}),
+            (["jean dupont"], {"Jean Dupont"}),
+            (["Ana Lima"], {"Ana Lima"}),
+            (["jdupontel@exemple.fr"], {"J. Dupontel"}),
+            (["J. Dupontel"], {"J. Dupontel"}),
+            (["Jean"], set()),
+        ):
+            lecture = lambda a: a.iter_commits_depuis(
+                None, ["--all"], git.regex_auteurs(identites)
+            )
+            self.assertMemesCommits(objets, commande, lecture)
+            self.assertEqual({c.auteur for c in lecture(objets)}, attendus)
+
+
+class TestObjetsLibres(ComparaisonObjetsGit, unittest.TestCase):
+    pass
+
+
+class TestPackfiles(ComparaisonObjetsGit, unittest.TestCase):
+    preparer = staticmethod(empaqueter)
+
+
+class TestChaineCommitGraph(ComparaisonObjetsGit, unittest.TestCase):
+    preparer = staticmethod(chainer)
+
+    def test_chaine(self):
+        chaine = os.path.join(
+            self.depot, ".git", "objects", "info", "commit-graphs", "commit-graph-chain"
+        )
+        with open(chaine, encoding="ascii") as fichier:
+            self.assertGreaterEqual(len(fichier.read().split()), 2)
+        self.assertIsNotNone(DepotObjets(self.depot).graphe)
+
+
+class TestWorktree(ComparaisonObjetsGit, unittest.TestCase):
+    preparer = staticmethod(ajouter_worktree)
+
+
+if __name__ == "__main__":
+    unittest.main()